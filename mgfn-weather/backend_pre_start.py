@@ -1,6 +1,7 @@
 """
 Service pre start checks:
 - Check connection to Postres DB,
+- Check connection to Minio file storage (if it's used),
 - Check connection to Yandex weather API.
 """
 
@@ -13,7 +14,7 @@ from miniopy_async import Minio
 from sqlalchemy import text
 from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
 
-from src.core.config import settings
+from src.core.config import FilesStorageBackend, settings
 from src.db.storages.postgres import async_session
 
 
@@ -71,7 +72,8 @@ async def check_yandex_weather_connection() -> None:
 async def init() -> None:
     try:
         await check_postgres_connection()
-        await check_minio_connection()
+        if settings.FILES_STORAGE_BACKEND == FilesStorageBackend.MINIO:
+            await check_minio_connection()
         await check_yandex_weather_connection()
     except Exception as e:
         logger.error("Error initializing service: %s", str(e))
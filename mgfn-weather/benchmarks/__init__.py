@@ -0,0 +1,4 @@
+"""
+Performance benchmarks.
+Run them against a disposable database: they write (and clean up) test data.
+"""
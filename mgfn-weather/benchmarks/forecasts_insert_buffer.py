@@ -0,0 +1,138 @@
+"""
+Benchmark of forecast records' inserts under concurrency (`POST /forecasts` DB part):
+separate `INSERT` and commit per record vs. write-behind insert buffer.
+
+Run from the service's root:
+`PYTHONPATH=. python -m benchmarks.forecasts_insert_buffer --rows 5000 --concurrency 200`
+Records are spread over `--locations` locations, as requests are: concurrent
+transactions, inserting the same location's records, wait for each other's lock
+of it's daily stats row (pass `--locations 1` to measure the worst case).
+Test records are deleted at the end (they are committed, as the benchmark measures commits).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import settings
+from src.db.storages.postgres import Base
+from src.db.storages.postgres.insert_buffer import InsertBuffer
+from src.db.storages.postgres.repositories import ForecastSQLAlchemyRepository
+from src.models.db_entities.forecast_stats import ForecastDailyStats
+from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import Location
+
+
+class CountingForecastRepository(ForecastSQLAlchemyRepository):
+    """Forecasts' repository, counting committed transactions."""
+
+    commits = 0
+
+    async def save(self, *args, **kwargs) -> None:
+        await super().save(*args, **kwargs)
+        CountingForecastRepository.commits += 1
+
+
+async def insert_directly(
+    session_maker: async_sessionmaker[AsyncSession], attrs: dict
+) -> None:
+    """Inserts the record in it's own transaction, the way `ForecastService` does without buffer."""
+    async with session_maker() as session:
+        repo = CountingForecastRepository(session)
+        await repo.create(**attrs)
+        await repo.save()
+
+
+async def run(
+    insert, rows: int, concurrency: int, locations: list[str]
+) -> tuple[float, list[float]]:
+    """Inserts `rows` records by `concurrency` workers, returns elapsed time and latencies."""
+    latencies = []
+
+    async def worker(worker_number: int, count: int) -> None:
+        for i in range(count):
+            started = time.perf_counter()
+            await insert(
+                {
+                    "location": locations[(worker_number + i) % len(locations)],
+                    "lattitude": 55.75,
+                    "longitude": i / rows,
+                }
+            )
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(number, rows // concurrency) for number in range(concurrency))
+    )
+    return time.perf_counter() - started, latencies
+
+
+async def main(
+    rows: int,
+    concurrency: int,
+    locations_count: int,
+    max_size: int,
+    max_delay_ms: float,
+) -> None:
+    engine = create_async_engine(
+        settings.DATABASE_URL.unicode_string(), pool_size=20, max_overflow=0
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    benchmark_id = uuid.uuid4()
+    locations = [f"Бенчмарк {benchmark_id} {i}" for i in range(locations_count)]
+    insert_buffer = InsertBuffer(
+        session_maker, CountingForecastRepository, max_size, max_delay_ms / 1000
+    )
+    modes = (
+        ("INSERT per record", lambda attrs: insert_directly(session_maker, attrs)),
+        ("insert buffer", lambda attrs: insert_buffer.insert(**attrs)),
+    )
+    try:
+        for name, insert in modes:
+            CountingForecastRepository.commits = 0
+            elapsed, latencies = await run(insert, rows, concurrency, locations)
+            latencies.sort()
+            commits = CountingForecastRepository.commits
+            print(
+                f"{name:>17}: {len(latencies) / elapsed:>7.0f} rows/sec, "
+                f"{commits / elapsed:>7.0f} commits/sec, latency "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms"
+            )
+    finally:
+        async with session_maker() as session:
+            location_id = select(Location.id).where(Location.name.in_(locations))
+            for model in (Forecast, ForecastDailyStats):
+                await session.execute(
+                    delete(model).where(model.location_id.in_(location_id))
+                )
+            await session.execute(delete(Location).where(Location.name.in_(locations)))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--locations", type=int, default=100)
+    parser.add_argument("--max-size", type=int, default=100)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.rows,
+            args.concurrency,
+            args.locations,
+            args.max_size,
+            args.max_delay_ms,
+        )
+    )
@@ -0,0 +1,124 @@
+"""
+Benchmark of forecast records' list rendering (`GET /forecasts`):
+ORM + pydantic path vs. JSON rendered by DB.
+
+Run from the service's root:
+`PYTHONPATH=. python -m benchmarks.forecasts_list_rendering --rows 20000 --page-size 1000`
+Test rows are inserted in a transaction, that is rolled back at the end.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config import settings
+from src.db.storages.postgres import Base
+from src.db.storages.postgres.repositories import ForecastSQLAlchemyRepository
+from src.models.db_entities.files import File
+from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import Location, normalize_location_name
+from src.models.schemas.forecasts import (
+    ForecastRecordListQueryParams,
+    ForecastRecordOrdering,
+)
+from src.services.forecasts import ForecastService
+
+
+async def seed(session: AsyncSession, rows: int) -> None:
+    """Inserts `rows` forecast records, every second one has a file."""
+    now = datetime.datetime.now(datetime.UTC)
+    names = [f"Город {i}, Российская Федерация" for i in range(100)]
+    location_ids = (
+        await session.scalars(
+            insert(Location).returning(Location.id, sort_by_parameter_order=True),
+            [
+                {"name": name, "search_name": normalize_location_name(name)}
+                for name in names
+            ],
+        )
+    ).all()
+    files, forecasts = [], []
+    for i in range(rows):
+        file_id = None
+        if i % 2:
+            file_id = uuid.uuid4()
+            files.append({"id": file_id, "name": f"Прогноз_{i}.xlsx", "size": 6000 + i})
+        forecasts.append(
+            {
+                "id": uuid.uuid4(),
+                "location_id": location_ids[i % 100],
+                "lattitude": 55.75 + i / rows,
+                "longitude": 37.61 - i / rows,
+                "file_id": file_id,
+                "created_at": now - datetime.timedelta(seconds=i),
+            }
+        )
+    await session.execute(insert(File), files)
+    await session.execute(insert(Forecast), forecasts)
+    await session.flush()
+
+
+async def render(service: ForecastService, page_size: int, db_rendering: bool) -> bytes:
+    """Renders the first page of the list to JSON bytes, the same way the API does."""
+    settings.FORECASTS_LIST_DB_RENDERING = db_rendering
+    response = await service.api_read_forecast_records(
+        ForecastRecordListQueryParams(
+            # query params' defaults are FastAPI's `Query` objects, pass all of them
+            **dict.fromkeys(ForecastRecordListQueryParams.model_fields)
+            | {
+                "ordering": ForecastRecordOrdering.CREATED_AT_DESC,
+                "page_number": 1,
+                "page_size": page_size,
+            }
+        )
+    )
+    if db_rendering:
+        return response.body
+    return response.model_dump_json().encode()
+
+
+async def main(rows: int, page_size: int, repeat: int) -> None:
+    engine = create_async_engine(settings.DATABASE_URL.unicode_string())
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn, join_transaction_mode="create_savepoint", autoflush=False
+        )
+        await seed(session, rows)
+        service = ForecastService(ForecastSQLAlchemyRepository(session), *[None] * 3)
+
+        orm_payload = await render(service, page_size, db_rendering=False)
+        db_payload = await render(service, page_size, db_rendering=True)
+        assert json.loads(orm_payload)["total_items"] == rows
+        assert len(json.loads(db_payload)["content"]) == min(rows, page_size)
+
+        for name, db_rendering in (("ORM + pydantic", False), ("DB JSON", True)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await render(service, page_size, db_rendering)
+                session.expunge_all()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>15}: {repeat * page_size / elapsed:>10.0f} rows/sec "
+                f"({elapsed / repeat * 1000:.1f} ms per page of {page_size})"
+            )
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat))
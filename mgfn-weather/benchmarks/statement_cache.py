@@ -0,0 +1,89 @@
+"""
+Benchmark of SQL statements' preparation for forecast records' list (`GET /forecasts`):
+Python-side statement construction and compilation per request,
+with and without repositories' statements cache.
+DB is not required: statements are compiled for PostgreSQL (asyncpg) dialect,
+the same way they are compiled on execution.
+
+Run from the service's root:
+`PYTHONPATH=. python -m benchmarks.statement_cache --repeat 2000`
+"""
+
+import argparse
+import time
+
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.util import LRUCache
+
+from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
+from src.db.storages.postgres.repositories import ForecastSQLAlchemyRepository
+from src.db.storages.postgres.statements_cache import statements_cache
+from src.models.db_entities.files import File
+from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import Location
+from src.models.schemas.forecasts import ForecastRecordField, ForecastRecordOrdering
+from src.services.forecasts import ForecastService
+
+
+def get_essentials(request_number: int, cached: bool) -> SQLAlchemyQueryEssentials:
+    """Returns essentials of the list's request, as `ForecastService` builds them."""
+    fields = tuple(ForecastRecordField)
+    return SQLAlchemyQueryEssentials(
+        ordering=ForecastRecordOrdering.LOCATION_ASC,
+        order_expressions=ForecastService.records_order_expressions,
+        search=f"Город {request_number}",
+        search_attrs=[Location.search_name],
+        outer_joins=[
+            (Location, Forecast.location_id == Location.id),
+            (File, Forecast.file_id == File.id),
+        ],
+        page_number=request_number % 10 + 1,
+        page_size=100,
+        cache_key=("records_json", fields) if cached else None,
+    )
+
+
+dialect = asyncpg_dialect()
+
+
+def prepare(
+    repo: ForecastSQLAlchemyRepository,
+    essentials: SQLAlchemyQueryEssentials,
+    compiled_cache: LRUCache | None,
+) -> None:
+    """Builds the list's statement and compiles it, as it's done on execution."""
+    fields = tuple(ForecastRecordField)
+    statement = repo._get_cached_stmt(
+        "json_page",
+        essentials,
+        lambda: repo._get_paginated_list_json_stmt(
+            essentials, ForecastService._get_record_json(fields)
+        ),
+    )
+    statement._compile_w_cache(dialect, compiled_cache=compiled_cache, column_keys=[])
+    repo._get_params(essentials)
+
+
+def main(repeat: int) -> None:
+    repo = ForecastSQLAlchemyRepository(session=None)
+    cases = (
+        ("no caches", False, False),
+        ("SQLAlchemy compiled cache", False, True),
+        ("+ statements cache", True, True),
+    )
+    for name, cached, use_compiled_cache in cases:
+        statements_cache.clear()
+        compiled_cache = LRUCache(500) if use_compiled_cache else None
+        prepare(repo, get_essentials(0, cached), compiled_cache)
+        started = time.perf_counter()
+        for request_number in range(repeat):
+            prepare(repo, get_essentials(request_number, cached), compiled_cache)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>26}: {elapsed / repeat * 1_000_000:>8.1f} µs per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,126 @@
+"""
+Benchmark of Yandex weather responses' conversion to system's forecast schema:
+`yaweather` models + `ForecastInfoSchema.model_validate` (from attributes)
+vs. `ForecastInfoSchema.model_validate_json` of response's JSON (`native` client).
+Responses are generated with the provider's fields, with and without hourly forecasts.
+
+Run from the service's root (no DB and network required):
+`PYTHONPATH=. python -m benchmarks.weather_provider_conversion --days 7 --repeat 500`
+"""
+
+import argparse
+import datetime
+import json
+import time
+
+from yaweather import ResponseForecast
+
+from src.models.schemas.weather_providers import ForecastInfoSchema
+
+
+def make_weather(i: int) -> dict:
+    """Returns weather fields of forecast's day part or hour, as Yandex sends them."""
+    return {
+        "temp_min": -5 + i % 3,
+        "temp_max": 1 + i % 4,
+        "temp_avg": -2 + i % 5,
+        "temp": -2 + i % 5,
+        "feels_like": -7 + i % 5,
+        "icon": "ovc",
+        "condition": "overcast",
+        "daytime": "d",
+        "polar": False,
+        "wind_speed": 3.4,
+        "wind_gust": 7.1,
+        "wind_dir": "sw",
+        "pressure_mm": 745 + i % 7,
+        "pressure_pa": 993 + i % 7,
+        "humidity": 80 + i % 10,
+        "prec_mm": 0.1,
+        "prec_period": 360,
+        "prec_type": 0,
+        "prec_strength": 0,
+        "cloudness": 1,
+    }
+
+
+def make_response(days: int, hours: bool) -> bytes:
+    """Returns JSON of forecast response for `days` days, with hourly forecasts, if `hours`."""
+    today = datetime.date.today()
+    forecasts = []
+    for day in range(days):
+        date = today + datetime.timedelta(days=day)
+        forecast = {
+            "date": str(date),
+            "date_ts": 1_700_000_000 + day * 86400,
+            "week": date.isocalendar().week,
+            "sunrise": "08:31",
+            "sunset": "16:58",
+            "moon_code": day % 16,
+            "moon_text": "moon-code-0",
+            "parts": {
+                part: make_weather(day + i)
+                for i, part in enumerate(
+                    ("night", "morning", "day", "evening", "day_short", "night_short")
+                )
+            },
+        }
+        if hours:
+            forecast["hours"] = [
+                {"hour": str(hour), "hour_ts": 1_700_000_000 + hour * 3600}
+                | make_weather(hour)
+                for hour in range(24)
+            ]
+        forecasts.append(forecast)
+    return json.dumps(
+        {
+            "now": 1_700_000_000,
+            "now_dt": datetime.datetime.now(datetime.UTC).isoformat(),
+            "info": {
+                "lat": 55.75,
+                "lon": 37.61,
+                "url": "https://yandex.ru/pogoda/moscow",
+            },
+            "fact": make_weather(0)
+            | {"season": "autumn", "obs_time": 1_700_000_000, "source": "station"},
+            "forecasts": forecasts,
+        }
+    ).encode()
+
+
+def convert_yaweather(content: bytes) -> ForecastInfoSchema:
+    return ForecastInfoSchema.model_validate(
+        ResponseForecast.model_validate_json(content)
+    )
+
+
+def convert_native(content: bytes) -> ForecastInfoSchema:
+    return ForecastInfoSchema.model_validate_json(content)
+
+
+def main(days: int, repeat: int) -> None:
+    cases = (
+        ("yaweather, with hours", convert_yaweather, True),
+        ("yaweather, without hours", convert_yaweather, False),
+        ("native, with hours", convert_native, True),
+        ("native, without hours", convert_native, False),
+    )
+    for name, convert, hours in cases:
+        content = make_response(days, hours)
+        assert convert(content) == convert_yaweather(content)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            convert(content)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>25}: {elapsed / repeat * 1_000_000:>8.1f} µs per response "
+            f"({len(content) / 1024:.1f} KiB)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    main(args.days, args.repeat)
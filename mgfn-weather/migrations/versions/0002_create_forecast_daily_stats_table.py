@@ -0,0 +1,88 @@
+"""create forecast daily stats table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:12:41.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "forecast_daily_stats",
+        sa.Column("location", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("requests_count", sa.BigInteger(), nullable=False),
+        sa.Column("failed_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "location", "day", name=op.f("pk_forecast_daily_stats")
+        ),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE forecast_daily_stats
+                SET requests_count = requests_count - 1,
+                    failed_count = failed_count - (OLD.file_id IS NULL)::int
+                WHERE location = OLD.location
+                    AND day = (OLD.created_at AT TIME ZONE 'UTC')::date;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO forecast_daily_stats AS stats
+                    (location, day, requests_count, failed_count)
+                VALUES (
+                    NEW.location,
+                    (NEW.created_at AT TIME ZONE 'UTC')::date,
+                    1,
+                    (NEW.file_id IS NULL)::int
+                )
+                ON CONFLICT (location, day) DO UPDATE
+                SET requests_count = stats.requests_count + 1,
+                    failed_count = stats.failed_count + EXCLUDED.failed_count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # lock forecasts, so no rows are missed between the backfill and the trigger's creation
+    op.execute("LOCK TABLE forecasts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+        INSERT INTO forecast_daily_stats (location, day, requests_count, failed_count)
+        SELECT
+            location,
+            (created_at AT TIME ZONE 'UTC')::date,
+            count(*),
+            count(*) FILTER (WHERE file_id IS NULL)
+        FROM forecasts
+        GROUP BY 1, 2
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER forecasts_daily_stats
+        AFTER INSERT OR DELETE OR UPDATE OF location, created_at, file_id ON forecasts
+        FOR EACH ROW EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER forecasts_daily_stats ON forecasts")
+    op.execute("DROP FUNCTION forecast_daily_stats_update()")
+    op.drop_table("forecast_daily_stats")
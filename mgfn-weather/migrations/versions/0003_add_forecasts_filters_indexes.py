@@ -0,0 +1,49 @@
+"""add forecasts filters indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:03:27.104935
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # indexes are built concurrently to not lock forecasts table for writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_forecasts_created_at",
+            "forecasts",
+            ["created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forecasts_failed_created_at",
+            "forecasts",
+            ["created_at"],
+            postgresql_where=sa.text("file_id IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forecasts_lattitude_longitude",
+            "forecasts",
+            ["lattitude", "longitude"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecasts_lattitude_longitude", table_name="forecasts")
+    op.drop_index("ix_forecasts_failed_created_at", table_name="forecasts")
+    op.drop_index("ix_forecasts_created_at", table_name="forecasts")
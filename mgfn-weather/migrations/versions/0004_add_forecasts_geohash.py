@@ -0,0 +1,64 @@
+"""add forecasts geohash
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 14:26:09.611382
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.geohash import MAX_PRECISION, encode
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column(
+        "forecasts", sa.Column("geohash", sa.String(MAX_PRECISION), nullable=True)
+    )
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, lattitude, longitude FROM forecasts "
+                "WHERE CAST(:last_id AS uuid) IS NULL OR id > :last_id "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        conn.execute(
+            sa.text("UPDATE forecasts SET geohash = :geohash WHERE id = :id"),
+            [
+                {"id": row.id, "geohash": encode(row.lattitude, row.longitude)}
+                for row in rows
+            ],
+        )
+    op.alter_column("forecasts", "geohash", nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_forecasts_geohash",
+            "forecasts",
+            ["geohash"],
+            postgresql_ops={"geohash": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecasts_geohash", table_name="forecasts")
+    op.drop_column("forecasts", "geohash")
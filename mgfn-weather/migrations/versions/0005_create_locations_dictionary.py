@@ -0,0 +1,231 @@
+"""create locations dictionary
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 16:48:55.092317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def _normalize_location_name(name: str) -> str:
+    """
+    Frozen copy of `normalize_location_name` at this revision (migrations must not
+    import models), so replaying the migration always gives the same search names.
+    """
+    return name.lower().replace("ё", "е")
+
+
+def _create_stats_trigger(location_column: str) -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE forecast_daily_stats
+                SET requests_count = requests_count - 1,
+                    failed_count = failed_count - (OLD.file_id IS NULL)::int
+                WHERE {location_column} = OLD.{location_column}
+                    AND day = (OLD.created_at AT TIME ZONE 'UTC')::date;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO forecast_daily_stats AS stats
+                    ({location_column}, day, requests_count, failed_count)
+                VALUES (
+                    NEW.{location_column},
+                    (NEW.created_at AT TIME ZONE 'UTC')::date,
+                    1,
+                    (NEW.file_id IS NULL)::int
+                )
+                ON CONFLICT ({location_column}, day) DO UPDATE
+                SET requests_count = stats.requests_count + 1,
+                    failed_count = stats.failed_count + EXCLUDED.failed_count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER forecasts_daily_stats
+        AFTER INSERT OR DELETE OR UPDATE OF {location_column}, created_at, file_id
+        ON forecasts
+        FOR EACH ROW EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+
+
+def _backfill_location_ids() -> None:
+    """
+    Fills forecasts' `location_id` by batches of `BATCH_SIZE` records in IDs' order,
+    adding batches' names to the dictionary. Run it in autocommit mode, so each
+    statement is committed at once and rows aren't locked till the end.
+    """
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, location FROM forecasts "
+                "WHERE location_id IS NULL "
+                "AND (CAST(:last_id AS uuid) IS NULL OR id > :last_id) "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text(
+                "INSERT INTO locations (name, search_name) "
+                "VALUES (:name, :search_name) ON CONFLICT (name) DO NOTHING"
+            ),
+            [
+                {"name": name, "search_name": _normalize_location_name(name)}
+                for name in {row.location for row in rows}
+            ],
+        )
+        conn.execute(
+            sa.text(
+                "UPDATE forecasts SET location_id = locations.id FROM locations "
+                "WHERE (CAST(:last_id AS uuid) IS NULL OR forecasts.id > :last_id) "
+                "AND forecasts.id <= :batch_last_id "
+                "AND forecasts.location_id IS NULL "
+                "AND locations.name = forecasts.location"
+            ),
+            {"last_id": last_id, "batch_last_id": rows[-1].id},
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.create_table(
+        "locations",
+        sa.Column("id", sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("search_name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_locations")),
+        sa.UniqueConstraint("name", name=op.f("uq_locations_name")),
+    )
+    # nullable column without default is added instantly, without table rewriting
+    op.add_column("forecasts", sa.Column("location_id", sa.Integer(), nullable=True))
+    with op.get_context().autocommit_block():
+        _backfill_location_ids()
+        # not valid constraints are added without scanning and hold for new forecasts,
+        # so the second pass fills the last ones, added during the first one
+        op.create_check_constraint(
+            op.f("ck_forecasts_location_id_not_null"),
+            "forecasts",
+            "location_id IS NOT NULL",
+            postgresql_not_valid=True,
+        )
+        op.create_foreign_key(
+            op.f("fk_forecasts_location_id_locations"),
+            "forecasts",
+            "locations",
+            ["location_id"],
+            ["id"],
+            postgresql_not_valid=True,
+        )
+        _backfill_location_ids()
+        # validation scans the table without blocking writes
+        op.execute(
+            "ALTER TABLE forecasts VALIDATE CONSTRAINT ck_forecasts_location_id_not_null"
+        )
+        op.execute(
+            "ALTER TABLE forecasts "
+            "VALIDATE CONSTRAINT fk_forecasts_location_id_locations"
+        )
+        op.create_index(
+            op.f("ix_forecasts_location_id"),
+            "forecasts",
+            ["location_id"],
+            postgresql_concurrently=True,
+        )
+    # valid check constraint proves there are no NULLs, so the table isn't scanned
+    op.alter_column("forecasts", "location_id", nullable=False)
+    op.drop_constraint(
+        op.f("ck_forecasts_location_id_not_null"), "forecasts", type_="check"
+    )
+    # stats are updated by the trigger, it's recreated for the new column
+    op.execute("DROP TRIGGER forecasts_daily_stats ON forecasts")
+    op.drop_column("forecasts", "location")
+
+    op.add_column(
+        "forecast_daily_stats", sa.Column("location_id", sa.Integer(), nullable=True)
+    )
+    op.execute(
+        "UPDATE forecast_daily_stats SET location_id = locations.id "
+        "FROM locations WHERE locations.name = forecast_daily_stats.location"
+    )
+    # stats of deleted forecasts' locations, that are not in the dictionary
+    op.execute("DELETE FROM forecast_daily_stats WHERE location_id IS NULL")
+    op.drop_constraint(
+        op.f("pk_forecast_daily_stats"), "forecast_daily_stats", type_="primary"
+    )
+    op.drop_column("forecast_daily_stats", "location")
+    op.create_primary_key(
+        op.f("pk_forecast_daily_stats"), "forecast_daily_stats", ["location_id", "day"]
+    )
+    op.create_foreign_key(
+        op.f("fk_forecast_daily_stats_location_id_locations"),
+        "forecast_daily_stats",
+        "locations",
+        ["location_id"],
+        ["id"],
+    )
+    _create_stats_trigger("location_id")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER forecasts_daily_stats ON forecasts")
+
+    op.add_column(
+        "forecast_daily_stats", sa.Column("location", sa.String(), nullable=True)
+    )
+    op.execute(
+        "UPDATE forecast_daily_stats SET location = locations.name "
+        "FROM locations WHERE locations.id = forecast_daily_stats.location_id"
+    )
+    op.drop_constraint(
+        op.f("fk_forecast_daily_stats_location_id_locations"),
+        "forecast_daily_stats",
+        type_="foreignkey",
+    )
+    op.drop_constraint(
+        op.f("pk_forecast_daily_stats"), "forecast_daily_stats", type_="primary"
+    )
+    op.drop_column("forecast_daily_stats", "location_id")
+    op.alter_column("forecast_daily_stats", "location", nullable=False)
+    op.create_primary_key(
+        op.f("pk_forecast_daily_stats"), "forecast_daily_stats", ["location", "day"]
+    )
+
+    op.add_column("forecasts", sa.Column("location", sa.String(), nullable=True))
+    op.execute(
+        "UPDATE forecasts SET location = locations.name "
+        "FROM locations WHERE locations.id = forecasts.location_id"
+    )
+    op.alter_column("forecasts", "location", nullable=False)
+    op.drop_index(op.f("ix_forecasts_location_id"), table_name="forecasts")
+    op.drop_constraint(
+        op.f("fk_forecasts_location_id_locations"), "forecasts", type_="foreignkey"
+    )
+    op.drop_column("forecasts", "location_id")
+    _create_stats_trigger("location")
+
+    op.drop_table("locations")
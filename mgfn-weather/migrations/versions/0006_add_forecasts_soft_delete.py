@@ -0,0 +1,134 @@
+"""add forecasts soft delete
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 18:12:40.518724
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_stats_trigger(soft_delete: bool) -> None:
+    """Recreates stats trigger, which skips soft deleted forecasts if `soft_delete`."""
+    old_is_live = "OLD.deleted_at IS NULL" if soft_delete else "TRUE"
+    new_is_live = "NEW.deleted_at IS NULL" if soft_delete else "TRUE"
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF {old_is_live} THEN
+                    UPDATE forecast_daily_stats
+                    SET requests_count = requests_count - 1,
+                        failed_count = failed_count - (OLD.file_id IS NULL)::int
+                    WHERE location_id = OLD.location_id
+                        AND day = (OLD.created_at AT TIME ZONE 'UTC')::date;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF {new_is_live} THEN
+                    INSERT INTO forecast_daily_stats AS stats
+                        (location_id, day, requests_count, failed_count)
+                    VALUES (
+                        NEW.location_id,
+                        (NEW.created_at AT TIME ZONE 'UTC')::date,
+                        1,
+                        (NEW.file_id IS NULL)::int
+                    )
+                    ON CONFLICT (location_id, day) DO UPDATE
+                    SET requests_count = stats.requests_count + 1,
+                        failed_count = stats.failed_count + EXCLUDED.failed_count;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    columns = "location_id, created_at, file_id"
+    if soft_delete:
+        columns += ", deleted_at"
+    op.execute("DROP TRIGGER forecasts_daily_stats ON forecasts")
+    op.execute(
+        f"""
+        CREATE TRIGGER forecasts_daily_stats
+        AFTER INSERT OR DELETE OR UPDATE OF {columns}
+        ON forecasts
+        FOR EACH ROW EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+
+
+def upgrade() -> None:
+    # nullable column without default is added instantly, without table rewriting
+    op.add_column(
+        "forecasts",
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    _create_stats_trigger(soft_delete=True)
+    # indexes are built concurrently to not lock forecasts table for writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_forecasts_live_created_at",
+            "forecasts",
+            ["created_at"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_forecasts_created_at",
+            table_name="forecasts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_forecasts_failed_created_at",
+            table_name="forecasts",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forecasts_failed_created_at",
+            "forecasts",
+            ["created_at"],
+            postgresql_where=sa.text("file_id IS NULL AND deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forecasts_deleted_at",
+            "forecasts",
+            ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecasts_deleted_at", table_name="forecasts")
+    op.drop_index("ix_forecasts_failed_created_at", table_name="forecasts")
+    op.create_index(
+        "ix_forecasts_failed_created_at",
+        "forecasts",
+        ["created_at"],
+        postgresql_where=sa.text("file_id IS NULL"),
+    )
+    op.create_index("ix_forecasts_created_at", "forecasts", ["created_at"])
+    op.drop_index("ix_forecasts_live_created_at", table_name="forecasts")
+    # deleted records would become live again, so they are dropped (they aren't in stats).
+    # Their files' objects are left in file storage.
+    op.execute(
+        "DELETE FROM files WHERE id IN "
+        "(SELECT file_id FROM forecasts WHERE deleted_at IS NOT NULL)"
+    )
+    op.execute("DELETE FROM forecasts WHERE deleted_at IS NOT NULL")
+    _create_stats_trigger(soft_delete=False)
+    op.drop_column("forecasts", "deleted_at")
@@ -0,0 +1,97 @@
+"""create forecast archives table
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 20:03:51.274106
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_stats_function(skip_archived: bool) -> None:
+    """Recreates stats trigger's function, which keeps archived forecasts if `skip_archived`."""
+    archived_check = ""
+    if skip_archived:
+        archived_check = """
+            IF TG_OP = 'DELETE' AND current_setting('forecasts.archiving', true) = 'on' THEN
+                RETURN NULL;
+            END IF;"""
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        BEGIN{archived_check}
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.deleted_at IS NULL THEN
+                    UPDATE forecast_daily_stats
+                    SET requests_count = requests_count - 1,
+                        failed_count = failed_count - (OLD.file_id IS NULL)::int
+                    WHERE location_id = OLD.location_id
+                        AND day = (OLD.created_at AT TIME ZONE 'UTC')::date;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.deleted_at IS NULL THEN
+                    INSERT INTO forecast_daily_stats AS stats
+                        (location_id, day, requests_count, failed_count)
+                    VALUES (
+                        NEW.location_id,
+                        (NEW.created_at AT TIME ZONE 'UTC')::date,
+                        1,
+                        (NEW.file_id IS NULL)::int
+                    )
+                    ON CONFLICT (location_id, day) DO UPDATE
+                    SET requests_count = stats.requests_count + 1,
+                        failed_count = stats.failed_count + EXCLUDED.failed_count;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "forecast_archives",
+        sa.Column("created_from", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_to", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("records_count", sa.Integer(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_forecast_archives")),
+    )
+    op.create_index(
+        op.f("ix_forecast_archives_id"), "forecast_archives", ["id"], unique=True
+    )
+    op.create_index(
+        "ix_forecast_archives_records_period",
+        "forecast_archives",
+        ["created_from", "created_to"],
+        unique=False,
+    )
+    _create_stats_function(skip_archived=True)
+
+
+def downgrade() -> None:
+    _create_stats_function(skip_archived=False)
+    op.drop_index("ix_forecast_archives_records_period", table_name="forecast_archives")
+    op.drop_index(op.f("ix_forecast_archives_id"), table_name="forecast_archives")
+    op.drop_table("forecast_archives")
@@ -0,0 +1,44 @@
+"""add forecasts data
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 21:04:17.302846
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nullable column without default is added instantly, without table rewriting.
+    # Existing records have no stored data, their reports can't be re-rendered.
+    op.add_column(
+        "forecasts",
+        sa.Column("data", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    # the index is built concurrently to not lock forecasts table for writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_forecasts_data",
+            "forecasts",
+            ["data"],
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecasts_data", table_name="forecasts")
+    op.drop_column("forecasts", "data")
@@ -0,0 +1,28 @@
+"""add files etag
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 22:11:38.604215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # existing files are served without ETag: their content isn't read from storage here
+    op.add_column("files", sa.Column("etag", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("files", "etag")
@@ -0,0 +1,138 @@
+"""aggregate forecast stats by statements
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 23:40:12.518377
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # statement's rows are aggregated by transition tables: one upsert per location's day
+    # instead of one per row, so concurrent inserts hold stats rows' locks much less
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        DECLARE
+            changes text;
+        BEGIN
+            IF TG_OP = 'DELETE' AND current_setting('forecasts.archiving', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            changes := CASE TG_OP
+                WHEN 'INSERT' THEN
+                    'SELECT location_id, created_at, file_id, deleted_at, 1 AS sign FROM new_rows'
+                WHEN 'DELETE' THEN
+                    'SELECT location_id, created_at, file_id, deleted_at, -1 AS sign FROM old_rows'
+                ELSE
+                    'SELECT location_id, created_at, file_id, deleted_at, 1 AS sign FROM new_rows '
+                    || 'UNION ALL '
+                    || 'SELECT location_id, created_at, file_id, deleted_at, -1 FROM old_rows'
+            END;
+            EXECUTE $sql$
+                INSERT INTO forecast_daily_stats AS stats
+                    (location_id, day, requests_count, failed_count)
+                SELECT
+                    location_id,
+                    (created_at AT TIME ZONE 'UTC')::date,
+                    sum(sign),
+                    sum(sign * (file_id IS NULL)::int)
+                FROM ($sql$ || changes || $sql$) AS changes
+                WHERE deleted_at IS NULL
+                GROUP BY 1, 2
+                HAVING sum(sign) <> 0 OR sum(sign * (file_id IS NULL)::int) <> 0
+                ORDER BY 1, 2
+                ON CONFLICT (location_id, day) DO UPDATE
+                SET requests_count = stats.requests_count + EXCLUDED.requests_count,
+                    failed_count = stats.failed_count + EXCLUDED.failed_count
+                $sql$;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER forecasts_daily_stats ON forecasts")
+    op.execute(
+        """
+        CREATE TRIGGER forecasts_daily_stats_insert
+        AFTER INSERT ON forecasts
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER forecasts_daily_stats_update
+        AFTER UPDATE ON forecasts
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER forecasts_daily_stats_delete
+        AFTER DELETE ON forecasts
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
+
+
+def downgrade() -> None:
+    for operation in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER forecasts_daily_stats_{operation} ON forecasts")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' AND current_setting('forecasts.archiving', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.deleted_at IS NULL THEN
+                    UPDATE forecast_daily_stats
+                    SET requests_count = requests_count - 1,
+                        failed_count = failed_count - (OLD.file_id IS NULL)::int
+                    WHERE location_id = OLD.location_id
+                        AND day = (OLD.created_at AT TIME ZONE 'UTC')::date;
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.deleted_at IS NULL THEN
+                    INSERT INTO forecast_daily_stats AS stats
+                        (location_id, day, requests_count, failed_count)
+                    VALUES (
+                        NEW.location_id,
+                        (NEW.created_at AT TIME ZONE 'UTC')::date,
+                        1,
+                        (NEW.file_id IS NULL)::int
+                    )
+                    ON CONFLICT (location_id, day) DO UPDATE
+                    SET requests_count = stats.requests_count + 1,
+                        failed_count = stats.failed_count + EXCLUDED.failed_count;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER forecasts_daily_stats
+        AFTER INSERT OR DELETE OR UPDATE OF location_id, created_at, file_id, deleted_at
+        ON forecasts
+        FOR EACH ROW EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    )
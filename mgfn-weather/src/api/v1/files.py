@@ -2,11 +2,12 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, status
+from fastapi.responses import Response, StreamingResponse
 
 from src.deps.services import get_file_service
-from src.models.schemas.api_responses import file_responses
+from src.models.schemas.api_responses import file_responses, files_archive_responses
+from src.models.schemas.files import FilesArchiveParams
 
 from src.services.files import FileService
 
@@ -22,7 +23,36 @@ files_router = APIRouter(prefix="/files", tags=["Files"])
 )
 async def download_file(
     file_id: UUID,
+    range_header: str | None = Header(
+        None, alias="Range", description="Byte range to download (`bytes=0-1023`)"
+    ),
+    if_none_match: str | None = Header(
+        None, alias="If-None-Match", description="ETag of the cached file"
+    ),
     file_service: FileService = Depends(get_file_service),
 ):
-    """Download the file."""
-    return await file_service.api_download_file(file_id)
+    """
+    Download the file. Downloads can be resumed by `Range` header.
+    Depending on the service's settings, the file can be served by redirect to file storage.
+    Files never change, use `ETag` of downloaded file in `If-None-Match` header
+    to check the cached copy.
+    """
+    return await file_service.api_download_file(file_id, range_header, if_none_match)
+
+
+@files_router.post(
+    "/archive",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses=files_archive_responses,
+)
+async def download_files_archive(
+    params: FilesArchiveParams,
+    file_service: FileService = Depends(get_file_service),
+):
+    """
+    Download several files as one ZIP archive.
+    The archive is built on the fly and streamed, entries are stored without compression
+    (reports are compressed already).
+    """
+    return await file_service.api_download_archive(params)
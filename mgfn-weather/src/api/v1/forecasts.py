@@ -2,19 +2,33 @@
 
 import uuid
 
-from fastapi import Depends, APIRouter, status
+from fastapi import Depends, APIRouter, Response, status
+from fastapi.responses import StreamingResponse
 
-from src.deps.services import get_forecast_service
+from src.deps.services import get_forecast_service, get_forecast_stats_service
 
 from src.models.schemas.forecasts import (
     ForecastRecordSchema,
     PaginatedForecastRecordsList,
     ForecastRecordListQueryParams,
+    ForecastRecordExportQueryParams,
+    ForecastHistoryQueryParams,
+    ForecastHorizonQueryParams,
+    ForecastReportQueryParams,
+    PaginatedForecastHistoryList,
+    NearbyForecastRecordSchema,
+    NearbyForecastRecordsQueryParams,
     GenerateForecastParams,
     generate_forecast_responses,
 )
+from src.models.schemas.forecast_stats import (
+    ForecastStatsQueryParams,
+    PaginatedForecastDailyStatsList,
+)
+from src.models.schemas.api_responses import file_responses
 from src.models.schemas.geo.cities import CityEnum
 from src.services.forecasts import ForecastService
+from src.services.forecast_stats import ForecastStatsService
 
 
 forecasts_router = APIRouter(prefix="/forecasts", tags=["Forecasts"])
@@ -33,6 +47,70 @@ async def read_forecast_records(
     return await forecast_service.api_read_forecast_records(query_params)
 
 
+@forecasts_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+            "description": "Forecast records' file",
+        }
+    },
+)
+async def export_forecast_records(
+    query_params: ForecastRecordExportQueryParams = Depends(),
+    forecast_service: ForecastService = Depends(get_forecast_service),
+):
+    """
+    Export all forecast records, matching search, as CSV or NDJSON file.
+    Records are streamed, use it instead of paging through the list.
+    """
+
+    return await forecast_service.api_export_forecast_records(query_params)
+
+
+@forecasts_router.get(
+    "/nearby",
+    response_model=list[NearbyForecastRecordSchema],
+)
+async def read_nearby_forecast_records(
+    query_params: NearbyForecastRecordsQueryParams = Depends(),
+    forecast_service: ForecastService = Depends(get_forecast_service),
+):
+    """Read forecast records, requested within the radius from the point, nearest first."""
+
+    return await forecast_service.api_read_nearby_forecast_records(query_params)
+
+
+@forecasts_router.get(
+    "/history",
+    response_model=PaginatedForecastHistoryList,
+)
+async def read_forecasts_history(
+    query_params: ForecastHistoryQueryParams = Depends(),
+    forecast_service: ForecastService = Depends(get_forecast_service),
+):
+    """
+    Read forecasts for the date, stored with the location's forecast records
+    (and archived ones, if `include_archived` is passed).
+    """
+
+    return await forecast_service.api_read_forecast_history(query_params)
+
+
+@forecasts_router.get(
+    "/stats",
+    response_model=PaginatedForecastDailyStatsList,
+)
+async def read_forecast_stats(
+    query_params: ForecastStatsQueryParams = Depends(),
+    forecast_stats_service: ForecastStatsService = Depends(get_forecast_stats_service),
+):
+    """Read forecast requests' statistics per location per day (UTC) with failure rate."""
+
+    return await forecast_stats_service.api_read_forecast_stats(query_params)
+
+
 @forecasts_router.post(
     "",
     response_model=ForecastRecordSchema,
@@ -57,6 +135,25 @@ async def generate_forecast(
     return await forecast_service.api_generate_forecast(params)
 
 
+@forecasts_router.get(
+    "/{forecast_id}/report",
+    response_class=Response,
+    responses=file_responses,
+)
+async def render_forecast_report(
+    forecast_id: uuid.UUID,
+    query_params: ForecastReportQueryParams = Depends(),
+    forecast_service: ForecastService = Depends(get_forecast_service),
+):
+    """
+    Render forecast record's report in the requested format from stored forecast data,
+    without requesting weather provider. Only live records' reports are rendered,
+    archived records aren't found.
+    """
+
+    return await forecast_service.api_render_forecast_report(forecast_id, query_params)
+
+
 @forecasts_router.delete("/{forecast_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_forecast_record(
     forecast_id: uuid.UUID,
@@ -82,10 +179,11 @@ async def delete_forecast_record(
 )
 async def generate_forecast_by_city(
     city: CityEnum,
+    query_params: ForecastHorizonQueryParams = Depends(),
     forecast_service: ForecastService = Depends(get_forecast_service),
 ):
     """
     Generate a new weather forecast for given city.
     Request data will be saved in DB as a new record.
     """
-    return await forecast_service.api_generate_forecast_by_city(city)
+    return await forecast_service.api_generate_forecast_by_city(city, query_params)
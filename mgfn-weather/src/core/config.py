@@ -1,15 +1,38 @@
 """Configuration file with settings."""
 
+from enum import StrEnum
 from functools import lru_cache
 from pathlib import Path
 
-from pydantic import computed_field, PostgresDsn, Field
+from pydantic import computed_field, model_validator, PostgresDsn, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 SERVICE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
+class FilesStorageBackend(StrEnum):
+    """Possible storages of files' content."""
+
+    MINIO = "minio"
+    LOCAL = "local"  # directory in local file system (single-node deployments)
+
+
+class FilesDownloadMode(StrEnum):
+    """Possible ways of serving files' downloads."""
+
+    PROXY = "proxy"  # the app streams file from storage
+    PRESIGNED = "presigned"  # client is redirected to storage's short-lived URL
+    X_ACCEL = "x-accel"  # nginx serves file from storage by `X-Accel-Redirect`
+
+
+class WeatherProviderClient(StrEnum):
+    """Possible clients of Yandex weather API."""
+
+    NATIVE = "native"  # shared httpx client, responses are parsed to system's schema
+    YAWEATHER = "yaweather"  # `yaweather` library's client and models
+
+
 class Settings(BaseSettings):
     """Contains env variables and other app's settings.
     env searching order:
@@ -38,17 +61,241 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    POSTGRES_REPLICA_SERVERS: list[str] = Field(
+        default=[],
+        description="Read replicas' addresses (host:port). Read-only queries are routed to them.",
+    )
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = Field(
+        default=5.0,
+        description="Replica is ejected from reading while it's replication lag exceeds this value",
+    )
+    POSTGRES_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+
+    @computed_field
+    @property
+    def REPLICA_DATABASE_URLS(self) -> list[PostgresDsn]:
+        return [
+            PostgresDsn.build(
+                scheme="postgresql+asyncpg",
+                username=self.POSTGRES_USER,
+                password=self.POSTGRES_PASSWORD,
+                host=replica_server,
+                path=self.POSTGRES_DB,
+            )
+            for replica_server in self.POSTGRES_REPLICA_SERVERS
+        ]
+
+    DB_SLOW_QUERY_THRESHOLD_SECONDS: float = Field(
+        default=0.5,
+        description="SQL statements executing longer are logged as slow ones",
+    )
+    DB_EXPLAIN_SLOW_QUERIES: bool = Field(
+        default=True, description="Log EXPLAIN plans of slow SELECT statements"
+    )
+    REQUEST_DB_STATEMENTS_WARNING_THRESHOLD: int = Field(
+        default=20,
+        description="Warn if HTTP request executes more SQL statements (possible N+1 queries)",
+    )
+    DB_STATEMENTS_CACHE_SIZE: int = Field(
+        default=500,
+        description="Max number of repositories' built SQL statements' shapes to keep in cache",
+    )
+
     WEATHER_PROVIDER_API_KEY: str = Field(
         description="API Key to get access to the weather provider",
     )
+    WEATHER_PROVIDER_CLIENT: WeatherProviderClient = Field(
+        default=WeatherProviderClient.YAWEATHER,
+        description="Client of Yandex weather API (`native` one is opt-in)",
+    )
+    WEATHER_PROVIDER_FORECAST_DAYS: int = Field(
+        default=7,
+        ge=1,
+        le=11,
+        description=(
+            "Number of days in requested forecasts, including the current day "
+            "(`native` client)"
+        ),
+    )
+    WEATHER_PROVIDER_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        description="Timeout of weather provider's requests (`native` client)",
+    )
 
-    MINIO_ADDRESS: str
-    MINIO_ACCESS_KEY: str
-    MINIO_SECRET_KEY: str
+    FILES_STORAGE_BACKEND: FilesStorageBackend = Field(
+        default=FilesStorageBackend.MINIO,
+        description="Storage of files' content: Minio or local directory",
+    )
+    FILES_STORAGE_DIR: str = Field(
+        default=f"{SERVICE_DIR}/files",
+        description="Directory of files' storage (`local` backend)",
+    )
+
+    MINIO_ADDRESS: str | None = None
+    MINIO_ACCESS_KEY: str | None = None
+    MINIO_SECRET_KEY: str | None = None
     MINIO_BUCKET: str = "weather"
+    MINIO_PUBLIC_URL: str | None = Field(
+        default=None,
+        description="Minio storage's URL, available for clients (presigned URLs are made for it)",
+    )
+
+    FILES_DOWNLOAD_CHUNK_SIZE: int = Field(
+        default=64 * 1024,
+        gt=0,
+        description="Files are streamed to clients from file storage by chunks of this size (bytes)",
+    )
+    FILES_DOWNLOAD_MODE: FilesDownloadMode = Field(
+        default=FilesDownloadMode.PROXY,
+        description="How files' downloads are served: streamed by the app, "
+        "by redirect to presigned storage's URL or by nginx (`X-Accel-Redirect`)",
+    )
+    FILES_PRESIGNED_URL_EXPIRES_SECONDS: int = Field(
+        default=300,
+        ge=1,
+        le=7 * 24 * 3600,
+        description="Lifetime of presigned storage's URLs for files' downloads",
+    )
+    FILES_X_ACCEL_LOCATION: str = Field(
+        default="/internal/files/",
+        description="nginx internal location, proxying file storage, for `X-Accel-Redirect`",
+    )
+    FILES_ARCHIVE_MAX_FILES: int = Field(
+        default=1000,
+        gt=0,
+        description="Max number of files in one ZIP archive (`POST /files/archive`)",
+    )
+    FILES_ARCHIVE_PREFETCH_FILES: int = Field(
+        default=8,
+        gt=0,
+        description="Number of archive's next files, fetched from file storage concurrently",
+    )
+    FILES_ARCHIVE_PREFETCH_MAX_FILE_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Archive's files larger than this aren't prefetched, they are streamed in turn",
+    )
+    FILES_CACHE_MEMORY_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Max total size of files, cached in memory for downloads (0 turns memory tier off)",
+    )
+    FILES_CACHE_DIR: str | None = Field(
+        default=None,
+        description="Local directory for files' disk cache (disk tier is off, if it's not set), "
+        "each process locks it's own numbered subdirectory",
+    )
+    FILES_CACHE_DISK_MAX_BYTES: int = Field(
+        default=1024 * 1024 * 1024,
+        ge=0,
+        description="Max total size of files in each process' disk cache",
+    )
+    FILES_CACHE_MAX_FILE_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Files larger than this aren't cached",
+    )
+    FILES_CACHE_METADATA_MAX_ITEMS: int = Field(
+        default=10000,
+        ge=0,
+        description="Max number of files' DB records, cached in memory (0 turns caching off)",
+    )
+    FILES_CACHE_METADATA_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Cached files' DB records are re-read after this time (deleted files stop being served)",
+    )
+
+    FORECASTS_LIST_DB_RENDERING: bool = Field(
+        default=True,
+        description="Render forecast records' list to JSON directly by DB, skipping ORM and pydantic",
+    )
+    FORECASTS_EXPORT_BATCH_SIZE: int = Field(
+        default=1000,
+        description="Forecast records are exported by batches of this size, fetched from DB cursor",
+    )
+    FORECASTS_INSERT_BUFFER_ENABLED: bool = Field(
+        default=False,
+        description="Insert forecast records through write-behind buffer: "
+        "records of concurrent requests are inserted by batches in one transaction",
+    )
+    FORECASTS_INSERT_BUFFER_MAX_SIZE: int = Field(
+        default=100,
+        description="Buffered forecast records are flushed when there are this many of them",
+    )
+    FORECASTS_INSERT_BUFFER_MAX_DELAY_MS: float = Field(
+        default=5.0,
+        description="Buffered forecast records are flushed at most this time after the first one",
+    )
+    FORECASTS_PURGE_RETENTION_HOURS: float = Field(
+        default=24.0,
+        description="Deleted forecast records are kept in DB at least this time before purging",
+    )
+    FORECASTS_PURGE_BATCH_SIZE: int = Field(
+        default=500,
+        description="Deleted forecast records and their files are purged by batches of this size",
+    )
+    FORECASTS_PURGE_INTERVAL_SECONDS: float = Field(
+        default=600.0,
+        description="Interval between purging job's runs",
+    )
+    FORECASTS_ARCHIVE_AGE_DAYS: int = Field(
+        default=90,
+        gt=0,
+        description="Forecast records older than this are moved to archive in file storage",
+    )
+    FORECASTS_ARCHIVE_BATCH_SIZE: int = Field(
+        default=10000,
+        le=30000,
+        description="Number of forecast records in one archive's batch file",
+    )
+    FORECASTS_ARCHIVE_INTERVAL_SECONDS: float = Field(
+        default=3600.0,
+        description="Interval between archiving job's runs",
+    )
+    FORECASTS_ARCHIVE_MAX_READ_BATCHES: int = Field(
+        default=10,
+        description="Max number of archive's batch files to read for one forecast records' list request",
+    )
+    FILES_RECONCILE_GRACE_SECONDS: float = Field(
+        default=3600.0,
+        ge=0,
+        description="Files' objects and DB rows younger than this are skipped by storage's "
+        "reconciliation (they can belong to requests in progress)",
+    )
+    FILES_RECONCILE_BATCH_SIZE: int = Field(
+        default=1000,
+        gt=0,
+        description="DB rows are read and orphans are deleted by storage's reconciliation "
+        "by batches of this size",
+    )
+    JOBS_OFF_PEAK_START_HOUR: int = Field(
+        default=1,
+        ge=0,
+        le=23,
+        description="Off-peak hours (UTC) start: background jobs run from this hour",
+    )
+    JOBS_OFF_PEAK_END_HOUR: int = Field(
+        default=5,
+        ge=0,
+        le=23,
+        description="Off-peak hours (UTC) end: background jobs run until this hour (exclusive), "
+        "set it equal to the start to run at any hour",
+    )
 
     DEBUG: bool = False
 
+    @model_validator(mode="after")
+    def check_minio_settings(self) -> "Settings":
+        """Minio's address and credentials are required for `minio` files' backend."""
+        if self.FILES_STORAGE_BACKEND == FilesStorageBackend.MINIO and not (
+            self.MINIO_ADDRESS and self.MINIO_ACCESS_KEY and self.MINIO_SECRET_KEY
+        ):
+            raise ValueError(
+                "MINIO_ADDRESS, MINIO_ACCESS_KEY and MINIO_SECRET_KEY "
+                "are required for `minio` files' storage backend"
+            )
+        return self
+
 
 @lru_cache
 def get_settings():
@@ -0,0 +1,156 @@
+"""
+Application's metrics.
+Metrics are collected in process memory and exposed
+in Prometheus text format (see `GET /metrics`).
+"""
+
+import bisect
+import threading
+import typing as t
+
+
+def _escape_label_value(value: t.Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labels: dict[str, t.Any]) -> str:
+    if not labels:
+        return ""
+    formatted_labels = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()
+    )
+    return f"{{{formatted_labels}}}"
+
+
+class Metric:
+    """Base metric. Values are stored separately for each labels' values combination."""
+
+    metric_type: str
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _get_key(self, labels: dict[str, t.Any]) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} requires labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Renders metric in Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self._render_samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    metric_type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._get_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._get_key(labels), 0)
+
+    def _render_samples(self):
+        return [
+            f"{self.name}{_format_labels(dict(zip(self.label_names, key)))} {value}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value, that can go up and down."""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._get_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values by buckets."""
+
+    metric_type = "histogram"
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, *args, buckets: tuple[float, ...] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+        self._bucket_counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+        self._counts: dict[tuple, int] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._get_key(labels)
+        with self._lock:
+            bucket_counts = self._bucket_counts.setdefault(key, [0] * len(self.buckets))
+            bucket_index = bisect.bisect_left(self.buckets, value)
+            if bucket_index < len(self.buckets):
+                bucket_counts[bucket_index] += 1
+            self._sums[key] = self._sums.get(key, 0) + value
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get_count(self, **labels) -> int:
+        return self._counts.get(self._get_key(labels), 0)
+
+    def get_sum(self, **labels) -> float:
+        return self._sums.get(self._get_key(labels), 0)
+
+    def _render_samples(self):
+        samples = []
+        for key, bucket_counts in self._bucket_counts.items():
+            labels = dict(zip(self.label_names, key))
+            cumulative_count = 0
+            for bucket, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative_count += bucket_count
+                bucket_labels = _format_labels({**labels, "le": bucket})
+                samples.append(f"{self.name}_bucket{bucket_labels} {cumulative_count}")
+            inf_labels = _format_labels({**labels, "le": "+Inf"})
+            samples.append(f"{self.name}_bucket{inf_labels} {self._counts[key]}")
+            samples.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[key]}")
+            samples.append(
+                f"{self.name}_count{_format_labels(labels)} {self._counts[key]}"
+            )
+        return samples
+
+
+class MetricsRegistry:
+    """Registry of all application's metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register[MetricType: Metric](self, metric: MetricType) -> MetricType:
+        """Registers the metric and returns it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Renders all metrics in Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,383 @@
+"""
+Tiered read-through cache of files.
+Files are immutable, so their cached copies never go stale, they are only evicted
+by tiers' size bounds or dropped on file's deletion:
+- memory tier - LRU of hot files' content, bounded by total size;
+- disk tier - LRU of files in local directory, bounded by total size,
+served by `sendfile` (see `AbstractFileStorageRepository.get_local_path`).
+Files' DB metadata is cached separately (`files_metadata_cache`) with short TTL,
+so deleted files stop being served soon in all the app's processes.
+Content cache is opened by the app's start (`open_files_cache`), not on import.
+"""
+
+import asyncio
+import datetime
+import fcntl
+import itertools
+import time
+import typing as t
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from uuid import UUID
+
+from src.core.config import settings
+from src.core.metrics import Counter, Gauge, registry
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    parse_file_id,
+)
+from src.models.db_entities.files import File
+from src.utils.files import iter_file_chunks, write_file_atomically
+
+
+files_cache_lookups = registry.register(
+    Counter(
+        "files_cache_lookups_total",
+        "Lookups of files' content and metadata in cache's tiers",
+        ("tier", "result"),
+    )
+)
+files_cache_hit_ratio = registry.register(
+    Gauge(
+        "files_cache_hit_ratio",
+        "Share of cache tier's lookups, served from it",
+        ("tier",),
+    )
+)
+files_cache_evictions = registry.register(
+    Counter(
+        "files_cache_evictions_total",
+        "Entries, evicted from cache's tiers by size bounds",
+        ("tier",),
+    )
+)
+files_cache_size = registry.register(
+    Gauge(
+        "files_cache_size",
+        "Total size of cache tier's entries (bytes for content, items for metadata)",
+        ("tier",),
+    )
+)
+
+
+class LRUCache[Key, Value]:
+    """
+    LRU cache, bounded by total size of entries (pass each entry's size on `put`).
+    Entries older than `ttl` seconds (if it's passed) are considered missing.
+    `on_evict` is called for entries, evicted by the size bound or popped.
+    """
+
+    def __init__(
+        self,
+        tier: str,
+        max_size: int,
+        ttl: float | None = None,
+        on_evict: t.Callable[[Key, Value], None] | None = None,
+    ):
+        self.tier = tier
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.size = 0
+        self._entries: OrderedDict[Key, tuple[Value, int, float]] = OrderedDict()
+
+    def get(self, key: Key) -> Value | None:
+        """Returns entry's value or `None`, counts the lookup in metrics."""
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and entry[2] < time.monotonic():
+            self.pop(key)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        self._count_lookup(hit=entry is not None)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: Key, value: Value, size: int = 1) -> None:
+        """Adds the entry (entries larger than the whole cache are skipped)."""
+        if size > self.max_size:
+            return
+        replaced = self._entries.pop(key, None)
+        if replaced is not None:
+            self.size -= replaced[1]
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0
+        self._entries[key] = (value, size, expires_at)
+        self.size += size
+        while self.size > self.max_size:
+            evicted_key, (evicted_value, evicted_size, _) = self._entries.popitem(
+                last=False
+            )
+            self.size -= evicted_size
+            files_cache_evictions.inc(tier=self.tier)
+            if self.on_evict:
+                self.on_evict(evicted_key, evicted_value)
+        files_cache_size.set(self.size, tier=self.tier)
+
+    def pop(self, key: Key) -> Value | None:
+        """Removes the entry, returns it's value or `None`, if there was no such one."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry[1]
+        files_cache_size.set(self.size, tier=self.tier)
+        if self.on_evict:
+            self.on_evict(key, entry[0])
+        return entry[0]
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries
+
+    def _count_lookup(self, hit: bool) -> None:
+        files_cache_lookups.inc(tier=self.tier, result="hit" if hit else "miss")
+        hits = files_cache_lookups.get(tier=self.tier, result="hit")
+        misses = files_cache_lookups.get(tier=self.tier, result="miss")
+        files_cache_hit_ratio.set(hits / (hits + misses), tier=self.tier)
+
+
+class DiskFilesCache:
+    """
+    Files' copies in local `directory`, named by files' IDs.
+    Files are written atomically (temp file + rename), so readers never see partial ones.
+    The LRU index is process' own, so each process takes the first free numbered
+    slot's subdirectory of `directory` and locks it till `close` (the lock is released
+    by OS, if the process dies): processes never evict or clean up each other's files,
+    `max_size` bounds each process' slot (the directory holds `max_size` per process).
+    The index of files is restored from the slot on start (oldest first),
+    other files there are skipped, temp files are left by crashed writers and removed.
+    """
+
+    lock_filename = ".lock"
+
+    def __init__(self, directory: Path, max_size: int):
+        self._index: LRUCache[UUID, Path] = LRUCache(
+            "disk", max_size, on_evict=lambda _, path: path.unlink(missing_ok=True)
+        )
+        self.directory, self._lock_file = self._lock_slot(directory)
+        paths = []
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+            elif (file_id := parse_file_id(path.name)) and path.is_file():
+                stat = path.stat()
+                paths.append((stat.st_mtime, file_id, path, stat.st_size))
+        for _, file_id, path, size in sorted(paths):
+            self._index.put(file_id, path, size)
+
+    @classmethod
+    def _lock_slot(cls, directory: Path) -> tuple[Path, t.BinaryIO]:
+        """Returns the first slot's subdirectory, not locked by other processes, with it's lock."""
+        for slot in itertools.count():
+            slot_directory = directory / str(slot)
+            slot_directory.mkdir(parents=True, exist_ok=True)
+            lock_file = open(slot_directory / cls.lock_filename, "wb")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            return slot_directory, lock_file
+
+    def close(self) -> None:
+        """Releases the slot (it's files are kept for the next process)."""
+        self._lock_file.close()
+
+    def get_path(self, file_id: UUID) -> Path | None:
+        """Returns path of file's copy or `None`, if it isn't cached."""
+        path = self._index.get(file_id)
+        if path is not None and not path.exists():
+            self._index.pop(file_id)
+            return
+        return path
+
+    async def put(self, file_id: UUID, content: bytes) -> None:
+        path = self.directory / file_id.hex
+        await asyncio.to_thread(write_file_atomically, path, content)
+        self._index.put(file_id, path, len(content))
+
+    def pop(self, file_id: UUID) -> None:
+        self._index.pop(file_id)
+
+    def __contains__(self, file_id: UUID) -> bool:
+        return file_id in self._index
+
+
+class FilesCache:
+    """
+    Files' content cache with memory and (optional) disk tiers.
+    Files larger than `max_file_size` aren't cached.
+    """
+
+    def __init__(
+        self,
+        memory_max_size: int,
+        max_file_size: int,
+        disk_directory: Path | None = None,
+        disk_max_size: int = 0,
+    ):
+        self.max_file_size = max_file_size
+        self.memory: LRUCache[UUID, bytes] = LRUCache("memory", memory_max_size)
+        self.disk = None
+        if disk_directory is not None:
+            self.disk = DiskFilesCache(disk_directory, disk_max_size)
+
+    async def get(self, file_id: UUID) -> bytes | None:
+        """Returns file's content from memory or disk (it's promoted to memory then)."""
+        content = self.memory.get(file_id)
+        if content is not None or self.disk is None:
+            return content
+        path = self.disk.get_path(file_id)
+        if path is None:
+            return
+        content = await asyncio.to_thread(path.read_bytes)
+        self.memory.put(file_id, content, len(content))
+        return content
+
+    def get_path(self, file_id: UUID) -> Path | None:
+        """Returns path of file's copy on disk, if the file isn't in memory."""
+        if file_id in self.memory or self.disk is None:
+            return
+        return self.disk.get_path(file_id)
+
+    async def put(self, file_id: UUID, content: bytes) -> None:
+        if len(content) > self.max_file_size:
+            return
+        self.memory.put(file_id, content, len(content))
+        if self.disk is not None:
+            await self.disk.put(file_id, content)
+
+    def pop(self, file_id: UUID) -> None:
+        self.memory.pop(file_id)
+        if self.disk is not None:
+            self.disk.pop(file_id)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+class CachedFileStorageRepository(AbstractFileStorageRepository):
+    """
+    File storage repository, reading files through the `cache`:
+    missing files are read from wrapped `repo` and cached,
+    ranges of missing files are read from `repo` directly.
+    """
+
+    def __init__(self, repo: AbstractFileStorageRepository, cache: FilesCache):
+        self.repo = repo
+        self.cache = cache
+
+    async def upload(self, *args, **kwargs) -> None | t.NoReturn:
+        await self.repo.upload(*args, **kwargs)
+
+    async def get(self, file_id: UUID) -> bytes | t.NoReturn:
+        content = await self.cache.get(file_id)
+        if content is None:
+            content = await self.repo.get(file_id)
+            await self.cache.put(file_id, content)
+        return content
+
+    async def stream(
+        self, file_id: UUID, offset: int = 0, length: int = 0
+    ) -> t.AsyncIterator[bytes] | t.NoReturn:
+        """
+        Streams the file (or it's range) from memory or disk tier
+        or wrapped `repo` (complete files are cached then).
+        Whole files in disk tier are served by `sendfile` through `get_local_path`.
+        """
+        content = self.cache.memory.get(file_id)
+        if content is not None:
+            end = offset + length if length else len(content)
+            return self._iter_content(content, offset, end)
+        path = self.cache.get_path(file_id)
+        if path is not None:
+            with suppress(FileNotFoundError):
+                file_obj = await asyncio.to_thread(open, path, "rb")
+                return iter_file_chunks(
+                    file_obj, settings.FILES_DOWNLOAD_CHUNK_SIZE, offset, length
+                )
+        chunks = await self.repo.stream(file_id, offset, length)
+        if offset or length:
+            return chunks
+        return self._stream_through(file_id, chunks)
+
+    async def get_local_path(self, file_id: UUID) -> Path | None:
+        # misses aren't counted: the file is streamed then, `stream` looks it up again
+        if self.cache.disk is None or file_id not in self.cache.disk:
+            return
+        return self.cache.get_path(file_id)
+
+    async def get_download_url(self, *args, **kwargs) -> str | t.NoReturn:
+        return await self.repo.get_download_url(*args, **kwargs)
+
+    def get_path(self, file_id: UUID) -> str:
+        return self.repo.get_path(file_id)
+
+    async def delete(self, file_id: UUID) -> None | t.NoReturn:
+        self.cache.pop(file_id)
+        await self.repo.delete(file_id)
+
+    async def delete_many(self, file_ids: list[UUID]) -> None | t.NoReturn:
+        for file_id in file_ids:
+            self.cache.pop(file_id)
+        await self.repo.delete_many(file_ids)
+
+    def iter_stored(self) -> t.AsyncIterator[tuple[UUID, datetime.datetime]]:
+        return self.repo.iter_stored()
+
+    @staticmethod
+    async def _iter_content(
+        content: bytes, start: int, end: int
+    ) -> t.AsyncIterator[bytes]:
+        """Yields cached content's chunks from `start` to `end` (exclusive)."""
+        for chunk_start in range(start, end, settings.FILES_DOWNLOAD_CHUNK_SIZE):
+            yield content[
+                chunk_start : min(chunk_start + settings.FILES_DOWNLOAD_CHUNK_SIZE, end)
+            ]
+
+    async def _stream_through(
+        self, file_id: UUID, chunks: t.AsyncIterator[bytes]
+    ) -> t.AsyncIterator[bytes]:
+        """Yields file's chunks, caches the file, once it's streamed completely."""
+        parts: list[bytes] | None = []
+        size = 0
+        async for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                parts.append(chunk)
+                if size > self.cache.max_file_size:
+                    parts = None
+            yield chunk
+        if parts is not None:
+            await self.cache.put(file_id, b"".join(parts))
+
+
+# files' content cache, it's opened on first use (disk tier scans it's directory)
+_files_cache: FilesCache | None = None
+
+
+def open_files_cache() -> FilesCache:
+    """Returns files' content cache of the process, opens it on first call."""
+    global _files_cache
+    if _files_cache is None:
+        _files_cache = FilesCache(
+            settings.FILES_CACHE_MEMORY_MAX_BYTES,
+            settings.FILES_CACHE_MAX_FILE_BYTES,
+            Path(settings.FILES_CACHE_DIR) if settings.FILES_CACHE_DIR else None,
+            settings.FILES_CACHE_DISK_MAX_BYTES,
+        )
+    return _files_cache
+
+
+def close_files_cache() -> None:
+    """Closes files' content cache, if it's opened (call it on app's shutdown)."""
+    global _files_cache
+    if _files_cache is not None:
+        _files_cache.close()
+        _files_cache = None
+
+
+files_metadata_cache: LRUCache[UUID, File] = LRUCache(
+    "metadata",
+    settings.FILES_CACHE_METADATA_MAX_ITEMS,
+    ttl=settings.FILES_CACHE_METADATA_TTL_SECONDS,
+)
@@ -14,12 +14,14 @@ async def init_minio(
     access_key: str,
     secret_key: str,
     bucket: str,
+    public_url: str | None = None,
 ) -> Minio:
     """
     Initializes Minio client:
     - Make connection to Minio;
     - Create required bucket if such one doesn't exist;
     - Set bucket policy.
+    Presigned URLs are made for `public_url`, if it's passed.
     """
     logger.info("Start initializing file storage %s...", address)
     client = Minio(
@@ -27,6 +29,7 @@ async def init_minio(
         secure=False,
         access_key=access_key,
         secret_key=secret_key,
+        server_url=public_url,
     )
     bucket_found = await client.bucket_exists(bucket)
     if not bucket_found:
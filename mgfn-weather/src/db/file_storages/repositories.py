@@ -1,18 +1,35 @@
 """Repositories for handling file stoages' operations."""
 
 import abc
+import asyncio
+import datetime
 import io
 import logging
+import os
 import typing as t
+from contextlib import asynccontextmanager
+from pathlib import Path
 from uuid import UUID
 
 from aiohttp import ClientResponse, ClientSession
 from aiohttp.client_exceptions import ClientConnectorError
 from fastapi import status, HTTPException
 from miniopy_async import Minio
+from miniopy_async.deleteobjects import DeleteObject
 from miniopy_async.error import S3Error
 
-from src.core.config import settings
+from src.core.config import FilesStorageBackend, settings
+from src.db.file_storages import minio
+from src.utils.files import iter_file_chunks, write_file_atomically
+
+
+def parse_file_id(name: str) -> UUID | None:
+    """Returns file's ID by it's name in storage (ID's hex) or `None` for other names."""
+    try:
+        file_id = UUID(hex=name)
+    except ValueError:
+        return
+    return file_id if file_id.hex == name else None
 
 
 class AbstractFileStorageRepository(abc.ABC):
@@ -20,7 +37,7 @@ class AbstractFileStorageRepository(abc.ABC):
 
     @abc.abstractmethod
     async def upload(self, *args, **kwargs) -> None | t.NoReturn:
-        """Upload file to storage."""
+        """Upload file's content to storage (without copying it)."""
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -28,11 +45,55 @@ class AbstractFileStorageRepository(abc.ABC):
         """Get file from storage."""
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def stream(self, *args, **kwargs) -> t.AsyncIterator[bytes] | t.NoReturn:
+        """
+        Open file's bytes (or their range) in storage for reading,
+        return iterator over their chunks.
+        """
+        raise NotImplementedError
+
+    async def get_local_path(self, file_id: UUID) -> Path | None:
+        """
+        Get path of file's copy on local disk (it can be served by `sendfile`)
+        or `None`, if the storage doesn't keep such one.
+        """
+        return
+
+    @abc.abstractmethod
+    async def get_download_url(self, *args, **kwargs) -> str | None | t.NoReturn:
+        """
+        Get temporary URL for downloading file directly from storage
+        or `None`, if the storage can't serve files by itself.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_path(self, *args, **kwargs) -> str:
+        """
+        Get file's path in storage, relative to it's root (bucket, directory),
+        e.g. for serving it by proxy.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def delete(self, *args, **kwargs) -> None | t.NoReturn:
         """Delete file from storage."""
         raise NotImplementedError
 
+    async def delete_many(self, file_ids: list[UUID]) -> None | t.NoReturn:
+        """Delete files from storage (override it by storage's bulk deletion)."""
+        for file_id in file_ids:
+            await self.delete(file_id)
+
+    @abc.abstractmethod
+    def iter_stored(self) -> t.AsyncIterator[tuple[UUID, datetime.datetime]]:
+        """
+        Iterate over files in storage: their IDs and modification times
+        in ascending order of IDs. The listing is read by parts, not loaded at once.
+        """
+        raise NotImplementedError
+
 
 class MinioRepository(AbstractFileStorageRepository):
     """Interface for handling Minio file storage's operations."""
@@ -42,34 +103,133 @@ class MinioRepository(AbstractFileStorageRepository):
         self.bucket_name = settings.MINIO_BUCKET
         self.client_session = client_session
 
-    async def upload(self, file_io_obj: io.BytesIO, file_id: UUID) -> None | t.NoReturn:
+    async def upload(self, content: bytes, file_id: UUID) -> None | t.NoReturn:
+        """
+        Uploads file's object. `BytesIO` shares `content` with the client
+        and gives it back by whole read, so the object's body isn't copied.
+        """
         try:
-            file_io_obj.__sizeof__()
             await self.client.put_object(
                 self.bucket_name,
-                file_id.hex,
-                file_io_obj,
-                file_io_obj.getbuffer().nbytes,
+                self.get_path(file_id),
+                io.BytesIO(content),
+                len(content),
             )
         except (ConnectionError, S3Error, ClientConnectorError) as e:
             self._handle_error(e)
 
     async def get(self, file_id: UUID) -> bytes | t.NoReturn:
+        response = await self._get_object(file_id)
+        try:
+            return await response.read()
+        finally:
+            response.release()
+
+    async def stream(
+        self, file_id: UUID, offset: int = 0, length: int = 0
+    ) -> t.AsyncIterator[bytes] | t.NoReturn:
+        """
+        Requests file's object (or it's `length` bytes from `offset`, passed to storage
+        as `Range` header), returns iterator over it's chunks of `FILES_DOWNLOAD_CHUNK_SIZE`.
+        Object's request is made right away, so missing files are reported before streaming.
+        """
+        response = await self._get_object(file_id, offset, length)
+        return self._iter_chunks(response)
+
+    async def get_download_url(
+        self,
+        file_id: UUID,
+        content_disposition: str,
+        expires: datetime.timedelta,
+    ) -> str | t.NoReturn:
+        """
+        Returns presigned URL for downloading file's object, valid for `expires`,
+        storage responds with given `Content-Disposition` header.
+        Signing is local, storage is requested only once for bucket's region.
+        """
+        try:
+            return await self.client.get_presigned_url(
+                "GET",
+                self.bucket_name,
+                self.get_path(file_id),
+                expires=expires,
+                response_headers={
+                    "response-content-disposition": content_disposition,
+                    "response-content-type": "application/octet-stream",
+                },
+            )
+        except (ConnectionError, S3Error, ClientConnectorError) as e:
+            self._handle_error(e)
+
+    def get_path(self, file_id: UUID) -> str:
+        """Returns file's object name in the bucket."""
+        return file_id.hex
+
+    async def _get_object(
+        self, file_id: UUID, offset: int = 0, length: int = 0
+    ) -> ClientResponse | t.NoReturn:
+        """Requests file's object, raises 404 if there is no such one."""
         try:
             response: ClientResponse = await self.client.get_object(
-                self.bucket_name, file_id.hex, self.client_session
+                self.bucket_name, self.get_path(file_id), offset=offset, length=length
             )
-            if not response.status == status.HTTP_200_OK:
-                raise HTTPException(
-                    status.HTTP_404_NOT_FOUND, "Файл в хранилище не найден"
-                )
-            return await response.read()
         except (ConnectionError, S3Error, ClientConnectorError) as e:
             self._handle_error(e)
+        if response.status not in (status.HTTP_200_OK, status.HTTP_206_PARTIAL_CONTENT):
+            response.release()
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Файл в хранилище не найден")
+        return response
+
+    @staticmethod
+    async def _iter_chunks(response: ClientResponse) -> t.AsyncIterator[bytes]:
+        """Yields response body's chunks, releases the connection at the end."""
+        try:
+            async for chunk in response.content.iter_chunked(
+                settings.FILES_DOWNLOAD_CHUNK_SIZE
+            ):
+                yield chunk
+        finally:
+            response.release()
 
     async def delete(self, file_id: UUID) -> None | t.NoReturn:
         try:
-            await self.client.remove_object(self.bucket_name, file_id.hex)
+            await self.client.remove_object(self.bucket_name, self.get_path(file_id))
+        except (ConnectionError, S3Error, ClientConnectorError) as e:
+            self._handle_error(e)
+
+    async def delete_many(self, file_ids: list[UUID]) -> None | t.NoReturn:
+        """Removes files' objects by bulk requests (up to 1000 objects each)."""
+        try:
+            errors = [
+                error
+                async for error in self.client.remove_objects(
+                    self.bucket_name,
+                    [DeleteObject(self.get_path(file_id)) for file_id in file_ids],
+                )
+            ]
+        except (ConnectionError, S3Error, ClientConnectorError) as e:
+            self._handle_error(e)
+        if errors:
+            for error in errors:
+                logging.error(
+                    f"ERROR removing Minio object {error.name}: {error.message}"
+                )
+            raise HTTPException(
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "Ошибка работы с файловым хранилищем.",
+            )
+
+    async def iter_stored(self) -> t.AsyncIterator[tuple[UUID, datetime.datetime]]:
+        """
+        Yields IDs and modification times of files' objects in the bucket.
+        The bucket is listed by pages in keys' order, which is IDs' order
+        (keys are IDs' hex), objects with other names are skipped.
+        """
+        try:
+            async for obj in self.client.list_objects(self.bucket_name, recursive=True):
+                file_id = parse_file_id(obj.object_name)
+                if file_id is not None:
+                    yield file_id, obj.last_modified
         except (ConnectionError, S3Error, ClientConnectorError) as e:
             self._handle_error(e)
 
@@ -88,3 +248,152 @@ class MinioRepository(AbstractFileStorageRepository):
             response_detail = "Ошибка работы с файловым хранилищем."
         logging.error(log_msg)
         raise HTTPException(status_code, response_detail)
+
+
+class LocalFSRepository(AbstractFileStorageRepository):
+    """
+    Interface for handling file storage in local directory.
+    Files are sharded into `ab/cd/` subdirectories by their IDs' first bytes,
+    so directories stay small. Files are written atomically (temp file + rename)
+    and can be served by `sendfile` (see `get_local_path`).
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    async def upload(self, content: bytes, file_id: UUID) -> None | t.NoReturn:
+        path = self.root / self.get_path(file_id)
+        try:
+            await asyncio.to_thread(self._write, path, content)
+        except OSError as e:
+            self._handle_error(e)
+
+    async def get(self, file_id: UUID) -> bytes | t.NoReturn:
+        try:
+            return await asyncio.to_thread(
+                (self.root / self.get_path(file_id)).read_bytes
+            )
+        except FileNotFoundError:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Файл в хранилище не найден")
+        except OSError as e:
+            self._handle_error(e)
+
+    async def stream(
+        self, file_id: UUID, offset: int = 0, length: int = 0
+    ) -> t.AsyncIterator[bytes] | t.NoReturn:
+        """
+        Opens the file, returns iterator over it's chunks of `FILES_DOWNLOAD_CHUNK_SIZE`
+        (or over it's `length` bytes from `offset`).
+        The file is opened right away, so missing files are reported before streaming.
+        """
+        try:
+            file_obj = await asyncio.to_thread(
+                open, self.root / self.get_path(file_id), "rb"
+            )
+        except FileNotFoundError:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Файл в хранилище не найден")
+        except OSError as e:
+            self._handle_error(e)
+        return iter_file_chunks(
+            file_obj, settings.FILES_DOWNLOAD_CHUNK_SIZE, offset, length
+        )
+
+    async def get_local_path(self, file_id: UUID) -> Path | None:
+        path = self.root / self.get_path(file_id)
+        return path if path.is_file() else None
+
+    async def get_download_url(self, *args, **kwargs) -> None:
+        """Local files are served by the app or nginx, there are no storage's URLs."""
+        return
+
+    def get_path(self, file_id: UUID) -> str:
+        """Returns file's path in the storage's directory."""
+        return f"{file_id.hex[:2]}/{file_id.hex[2:4]}/{file_id.hex}"
+
+    async def delete(self, file_id: UUID) -> None | t.NoReturn:
+        try:
+            await asyncio.to_thread(
+                (self.root / self.get_path(file_id)).unlink, missing_ok=True
+            )
+        except OSError as e:
+            self._handle_error(e)
+
+    async def iter_stored(self) -> t.AsyncIterator[tuple[UUID, datetime.datetime]]:
+        """
+        Yields IDs and modification times of stored files. Shards' directories
+        are named by IDs' prefixes, so walking them in names' order gives IDs' order.
+        Only one directory's listing is kept in memory at a time.
+        """
+        try:
+            for first_shard, _ in await self._list_dir(self.root, directories=True):
+                for second_shard, _ in await self._list_dir(
+                    first_shard, directories=True
+                ):
+                    for path, modified_at in await self._list_dir(second_shard):
+                        file_id = parse_file_id(path.name)
+                        if file_id is not None:
+                            yield file_id, modified_at
+        except OSError as e:
+            self._handle_error(e)
+
+    @staticmethod
+    async def _list_dir(
+        directory: Path, directories: bool = False
+    ) -> list[tuple[Path, datetime.datetime]]:
+        """Returns directory's subdirectories or files with modification times, sorted by names."""
+
+        def list_dir() -> list[tuple[Path, datetime.datetime]]:
+            with os.scandir(directory) as entries:
+                return sorted(
+                    (
+                        Path(entry.path),
+                        datetime.datetime.fromtimestamp(
+                            entry.stat().st_mtime, datetime.UTC
+                        ),
+                    )
+                    for entry in entries
+                    if (entry.is_dir() if directories else entry.is_file())
+                )
+
+        return await asyncio.to_thread(list_dir)
+
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_file_atomically(path, content, fsync=True)
+
+    def _handle_error(self, error: OSError):
+        """
+        Handles errors:
+        - logs the error,
+        - raises HTTPException.
+        """
+        logging.error(f"ERROR handling local file storage: {error}")
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "Ошибка работы с файловым хранилищем.",
+        )
+
+
+async def init_fs() -> None:
+    """Initializes file storage, selected by `FILES_STORAGE_BACKEND`."""
+    if settings.FILES_STORAGE_BACKEND == FilesStorageBackend.LOCAL:
+        Path(settings.FILES_STORAGE_DIR).mkdir(parents=True, exist_ok=True)
+        return
+    minio.minio_client = await minio.init_minio(
+        settings.MINIO_ADDRESS,
+        settings.MINIO_ACCESS_KEY,
+        settings.MINIO_SECRET_KEY,
+        settings.MINIO_BUCKET,
+        settings.MINIO_PUBLIC_URL,
+    )
+
+
+@asynccontextmanager
+async def open_fs_repo() -> t.AsyncIterator[AbstractFileStorageRepository]:
+    """Opens repository of file storage, selected by `FILES_STORAGE_BACKEND`."""
+    if settings.FILES_STORAGE_BACKEND == FilesStorageBackend.LOCAL:
+        yield LocalFSRepository(Path(settings.FILES_STORAGE_DIR))
+        return
+    async with ClientSession() as client_session:
+        yield MinioRepository(minio.minio_client, client_session)
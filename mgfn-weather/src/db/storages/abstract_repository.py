@@ -46,3 +46,8 @@ class AbstractRepository(abc.ABC):
     async def save(self, *args, **kwargs) -> None:
         """Save all changes to storage."""
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def rollback(self) -> None:
+        """Discard all unsaved changes."""
+        raise NotImplementedError
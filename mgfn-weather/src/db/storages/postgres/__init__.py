@@ -5,9 +5,12 @@ from sqlalchemy.orm import declarative_base, DeclarativeBase
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from src.core.config import settings
+from src.db.storages.postgres.instrumentation import instrument_engine
+from src.db.storages.postgres.replicas import Replica, ReplicaSet
 
 
 engine = create_async_engine(settings.DATABASE_URL.unicode_string())
+instrument_engine(engine)
 # engine.echo = True
 async_session = async_sessionmaker(
     engine,
@@ -16,6 +19,15 @@ async_session = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+replicas = ReplicaSet(
+    [
+        Replica(replica_url.unicode_string(), replica_server)
+        for replica_server, replica_url in zip(
+            settings.POSTGRES_REPLICA_SERVERS, settings.REPLICA_DATABASE_URLS
+        )
+    ],
+    max_lag=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+)
 
 
 naming_convention = {
@@ -0,0 +1,124 @@
+"""
+Write-behind buffer of inserts.
+Instead of a separate `INSERT` and commit per request, rows of concurrent requests
+are collected for a few milliseconds and inserted by one multi-row `INSERT ... RETURNING`
+in one transaction, so at peak the DB handles a few large transactions instead of
+thousands of tiny ones. Every caller still awaits it's own row's result.
+"""
+
+import asyncio
+import time
+import typing as t
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.metrics import Histogram, registry
+from src.db.storages.postgres import async_session
+from src.db.storages.postgres.repositories import (
+    ForecastSQLAlchemyRepository,
+    SQLAlchemyRepository,
+)
+
+
+insert_buffer_flush_rows = registry.register(
+    Histogram(
+        "db_insert_buffer_flush_rows",
+        "Number of rows inserted by one insert buffer's flush",
+        ("table",),
+        buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    )
+)
+insert_buffer_flush_seconds = registry.register(
+    Histogram(
+        "db_insert_buffer_flush_seconds",
+        "Duration of insert buffer's flush (inserting and committing)",
+        ("table",),
+    )
+)
+
+
+class InsertBuffer[Instance]:
+    """
+    Collects rows to insert for `max_delay` seconds since the first one
+    or up to `max_size` rows, then inserts them by repository's `create_many`
+    in a new session (`session_maker`) and commits.
+    If the flush fails, it's error is raised to all the batch's callers.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        repo_class: type[SQLAlchemyRepository],
+        max_size: int,
+        max_delay: float,
+    ):
+        self.session_maker = session_maker
+        self.repo_class = repo_class
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._rows: list[dict[str, t.Any]] = []
+        self._waiters: list[asyncio.Future[Instance]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def insert(self, **attrs) -> Instance:
+        """Adds the row to the buffer and returns it's instance, once it's committed."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._rows.append(attrs)
+        self._waiters.append(waiter)
+        if len(self._rows) >= self.max_size:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.max_delay, self._start_flush)
+        return await waiter
+
+    def _start_flush(self) -> None:
+        """Takes all the buffered rows and starts their flush in background."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._rows:
+            return
+        rows, waiters = self._rows, self._waiters
+        self._rows, self._waiters = [], []
+        flush = asyncio.create_task(self._flush(rows, waiters))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(
+        self,
+        rows: list[dict[str, t.Any]],
+        waiters: list[asyncio.Future[Instance]],
+    ) -> None:
+        table = self.repo_class.DBModel.__tablename__
+        insert_buffer_flush_rows.observe(len(rows), table=table)
+        started = time.perf_counter()
+        try:
+            async with self.session_maker() as session:
+                repo = self.repo_class(session)
+                instances = await repo.create_many(rows)
+                await repo.save()
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        insert_buffer_flush_seconds.observe(time.perf_counter() - started, table=table)
+        for waiter, instance in zip(waiters, instances):
+            if not waiter.done():
+                waiter.set_result(instance)
+
+    async def close(self) -> None:
+        """Flushes buffered rows and waits for all the flushes to finish."""
+        self._start_flush()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+forecasts_insert_buffer: InsertBuffer = InsertBuffer(
+    async_session,
+    ForecastSQLAlchemyRepository,
+    settings.FORECASTS_INSERT_BUFFER_MAX_SIZE,
+    settings.FORECASTS_INSERT_BUFFER_MAX_DELAY_MS / 1000,
+)
@@ -0,0 +1,241 @@
+"""
+SQL queries' instrumentation:
+- statements' latency, returned rows and connection pool wait time,
+tagged by repository class and method;
+- slow queries' log with their EXPLAIN plans;
+- per request statements' counter.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+import typing as t
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.metrics import Counter, Histogram, registry
+
+
+logger = logging.getLogger(__name__)
+
+
+statement_duration = registry.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "SQL statements' execution time",
+        ("repository", "method", "operation"),
+    )
+)
+statement_rows = registry.register(
+    Counter(
+        "db_statement_rows_total",
+        "Rows returned or affected by SQL statements",
+        ("repository", "method", "operation"),
+    )
+)
+pool_wait = registry.register(
+    Histogram(
+        "db_pool_wait_seconds",
+        "Time from repository method's call to DB connection's checkout from pool",
+        ("repository", "method"),
+    )
+)
+slow_statements = registry.register(
+    Counter(
+        "db_slow_statements_total",
+        "SQL statements, that exceeded slow query threshold",
+        ("repository", "method", "operation"),
+    )
+)
+request_statements = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "SQL statements executed per HTTP request",
+        ("path",),
+        buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+    )
+)
+request_statements_exceeded = registry.register(
+    Counter(
+        "http_request_db_statements_exceeded_total",
+        "HTTP requests, that executed more SQL statements than allowed",
+        ("path",),
+    )
+)
+
+
+@dataclass
+class RepositoryCall:
+    """Repository method's call, during which SQL statements are executed."""
+
+    repository: str
+    method: str
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class RequestStatements:
+    """Counter of SQL statements, executed during HTTP request."""
+
+    count: int = 0
+
+
+_repository_call: ContextVar[RepositoryCall | None] = ContextVar(
+    "repository_call", default=None
+)
+_request_statements: ContextVar[RequestStatements | None] = ContextVar(
+    "request_statements", default=None
+)
+
+_UNKNOWN = "unknown"
+_SKIP_OPTION = "skip_instrumentation"
+_explained_at: dict[str, float] = {}
+_explain_tasks: set[asyncio.Task] = set()
+_explain_interval_seconds = 600
+
+
+def instrumented[**P, R](
+    method: t.Callable[P, t.Awaitable[R]],
+) -> t.Callable[P, t.Awaitable[R]]:
+    """
+    Repository method's decorator:
+    tags SQL statements, executed inside the method, by repository's class and method name.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        token = _repository_call.set(
+            RepositoryCall(type(self).__name__, method.__name__)
+        )
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _repository_call.reset(token)
+
+    return wrapper
+
+
+def _get_call_labels() -> dict[str, str]:
+    call = _repository_call.get()
+    if call is None:
+        return {"repository": _UNKNOWN, "method": _UNKNOWN}
+    return {"repository": call.repository, "method": call.method}
+
+
+def _get_operation(statement: str) -> str:
+    words = statement.lstrip(" (\n").split(maxsplit=1)
+    return words[0].upper() if words else _UNKNOWN
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters: t.Any) -> None:
+    """Logs EXPLAIN plan of the slow statement."""
+    try:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(**{_SKIP_OPTION: True})
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in result)
+        logger.warning("Slow query plan:\n%s\n%s", statement, plan)
+    except Exception as e:
+        logger.error("Can't explain slow query: %s", e)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Sets engine's event hooks to collect SQL statements' metrics."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        cursor,
+        statement: str,
+        parameters,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor,
+        statement: str,
+        parameters,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ):
+        duration = time.perf_counter() - conn.info["query_started_at"].pop()
+        if context is not None and context.execution_options.get(_SKIP_OPTION):
+            return
+        labels = {**_get_call_labels(), "operation": _get_operation(statement)}
+        statement_duration.observe(duration, **labels)
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            statement_rows.inc(cursor.rowcount, **labels)
+        counter = _request_statements.get()
+        if counter is not None:
+            counter.count += 1
+        if duration < settings.DB_SLOW_QUERY_THRESHOLD_SECONDS:
+            return
+        slow_statements.inc(**labels)
+        logger.warning(
+            "Slow query (%.3fs) in %s.%s: %s; parameters: %s",
+            duration,
+            labels["repository"],
+            labels["method"],
+            statement,
+            parameters,
+        )
+        if not settings.DB_EXPLAIN_SLOW_QUERIES or labels["operation"] not in (
+            "SELECT",
+            "WITH",
+        ):
+            return
+        now = time.monotonic()
+        if now - _explained_at.get(statement, -_explain_interval_seconds) < (
+            _explain_interval_seconds
+        ):
+            return
+        if len(_explained_at) > 1000:
+            _explained_at.clear()
+        _explained_at[statement] = now
+        explain_task = asyncio.get_running_loop().create_task(
+            _explain(engine, statement, parameters)
+        )
+        _explain_tasks.add(explain_task)
+        explain_task.add_done_callback(_explain_tasks.discard)
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        call = _repository_call.get()
+        if call is None:
+            return
+        pool_wait.observe(
+            time.perf_counter() - call.started_at,
+            repository=call.repository,
+            method=call.method,
+        )
+
+
+def start_request_statements_count() -> RequestStatements:
+    """Starts counting SQL statements, executed in current HTTP request's context."""
+    counter = RequestStatements()
+    _request_statements.set(counter)
+    return counter
+
+
+def finish_request_statements_count(counter: RequestStatements, path: str) -> None:
+    """Records the number of HTTP request's statements, warns if there are too many of them."""
+    request_statements.observe(counter.count, path=path)
+    if counter.count > settings.REQUEST_DB_STATEMENTS_WARNING_THRESHOLD:
+        request_statements_exceeded.inc(path=path)
+        logger.warning(
+            "Request %s executed %s SQL statements (threshold is %s), "
+            "check it for N+1 queries",
+            path,
+            counter.count,
+            settings.REQUEST_DB_STATEMENTS_WARNING_THRESHOLD,
+        )
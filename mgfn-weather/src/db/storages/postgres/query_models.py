@@ -28,6 +28,9 @@ class SQLAlchemyQueryEssentials:
             InstanceModel.number.label("instance_number"),
             func.count(InstanceModel.id).label("instances_count")
         ]`;
+    - `outer_joins` - list of (target, onclause) pairs to outer join to the instance model,
+    use it when `columns` or filters refer to other models' attributes, for example:
+        `outer_joins=[(InstanceModel2, InstanceModel.instance2_id == InstanceModel2.id)]`;
     - `load_options` - list of load options to load related entities, for example:
         `load_options = [
             selectinload(InstanceModel.instance2).selectinload(InstanceModel2.fields),
@@ -37,15 +40,27 @@ class SQLAlchemyQueryEssentials:
     - `search_attrs` - list of InstanceModel's attributes for searching in list query;
     - `custom_filters` - pass here list of any filters, that are possible to use in .filter() method. Specific filters for some common cases are described below;
     - `page_number`, `page_size` - use these atributes in case you need paginated list;
+    - `params` - values of bound parameters (`bindparam("name")`), used in `custom_filters` or `columns`;
+    - `cache_key` - hashable key of the query's shape: everything, that defines the statement
+    (columns, joins, load options, search attrs, filters' expressions), except `ordering`,
+    search words' count and `params` values. If it's passed, the built statement is cached
+    by repositories and reused by the queries of the same shape, so all the values, that change
+    from query to query, must be passed as bound parameters in `params`, for example:
+        `custom_filters=[InstanceModel.number > bindparam("number_from")],
+        params={"number_from": 10},
+        cache_key=("number_from",)`;
     """
 
     ordering: Enum | None = None
     order_expressions: dict[Enum, list[UnaryExpression]] | None = None
     orderings: list[UnaryExpression] | None = None
     columns: list[InstrumentedAttribute | t.Any] | None = None
+    outer_joins: list[tuple[t.Any, t.Any]] | None = None
     load_options: list[_AbstractLoad] | None = None
     search: str | None = None
     search_attrs: list[InstrumentedAttribute] | None = None
     custom_filters: list[bool | t.Any] | None = None
     page_number: int | None = None
     page_size: int | None = None
+    params: dict[str, t.Any] | None = None
+    cache_key: t.Hashable | None = None
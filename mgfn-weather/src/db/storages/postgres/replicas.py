@@ -0,0 +1,132 @@
+"""PostgreSQL read replicas: their sessions, health checks and routing."""
+
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, InterfaceError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.db.storages.postgres.instrumentation import instrument_engine
+
+
+logger = logging.getLogger(__name__)
+
+
+replication_lag_query = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class Replica:
+    """Read replica with it's engine, session maker and health state."""
+
+    def __init__(self, url: str, name: str):
+        self.name = name
+        self.engine: AsyncEngine = create_async_engine(url, pool_pre_ping=True)
+        instrument_engine(self.engine)
+        self.session_maker = async_sessionmaker(
+            self.engine,
+            autocommit=False,
+            autoflush=False,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self.is_healthy: bool = False
+        self.lag: float | None = None
+
+    async def get_lag(self) -> float:
+        """Returns replication lag in seconds."""
+        async with self.engine.connect() as conn:
+            lag = await conn.scalar(replication_lag_query)
+        return float(lag)
+
+
+class ReplicaSet:
+    """
+    Set of read replicas.
+    Gives out session makers of healthy replicas in round-robin order.
+    Replica is considered healthy if it's available and it's replication lag
+    doesn't exceed `max_lag` seconds. Health is updated by `check_health`,
+    so call it (or run `run_health_checks`) before using replicas.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag: float,
+        check_timeout: float = 3.0,
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_timeout = check_timeout
+        self._counter = itertools.count()
+
+    def get_session_maker(self) -> async_sessionmaker[AsyncSession] | None:
+        """Returns healthy replica's session maker or `None` if there is no such one."""
+        healthy_replicas = [replica for replica in self.replicas if replica.is_healthy]
+        if not healthy_replicas:
+            return
+        replica = healthy_replicas[next(self._counter) % len(healthy_replicas)]
+        return replica.session_maker
+
+    async def _check_replica_health(self, replica: Replica) -> None:
+        """Updates replica's health state, logs it's changes."""
+        was_healthy = replica.is_healthy
+        try:
+            replica.lag = await asyncio.wait_for(
+                replica.get_lag(), timeout=self.check_timeout
+            )
+            replica.is_healthy = replica.lag <= self.max_lag
+        except (
+            ConnectionError,
+            OSError,
+            InterfaceError,
+            DBAPIError,
+            asyncio.TimeoutError,
+        ) as e:
+            replica.lag = None
+            replica.is_healthy = False
+            if was_healthy:
+                logger.error("Replica %s is unavailable: %s", replica.name, e)
+            return
+        if was_healthy and not replica.is_healthy:
+            logger.warning(
+                "Replica %s is ejected from reading: replication lag %.2fs exceeds %.2fs",
+                replica.name,
+                replica.lag,
+                self.max_lag,
+            )
+        elif not was_healthy and replica.is_healthy:
+            logger.info("Replica %s is available for reading", replica.name)
+
+    async def check_health(self) -> None:
+        """Checks all replicas' availability and replication lag."""
+        await asyncio.gather(
+            *(self._check_replica_health(replica) for replica in self.replicas)
+        )
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Checks replicas' health every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_health()
+
+    async def dispose(self) -> None:
+        """Closes all replicas' connections."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
@@ -2,49 +2,114 @@
 
 import logging
 import typing as tp
-from enum import Enum
+from datetime import datetime
 from math import ceil
 from uuid import UUID
 
 import asyncpg
 from fastapi import status
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select, delete, Select, func, or_
+from sqlalchemy import (
+    select,
+    delete,
+    update,
+    Select,
+    func,
+    or_,
+    cast,
+    Integer,
+    Text,
+    literal_column,
+    bindparam,
+    String,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.engine.result import ChunkedIteratorResult
 from sqlalchemy.exc import InterfaceError, IntegrityError, InternalError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import (
     DeclarativeBase,
     InstrumentedAttribute,
+    joinedload,
+    undefer,
 )
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.strategy_options import _AbstractLoad
-from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
 
 from src.db.storages.abstract_repository import AbstractRepository
+from src.db.storages.postgres.instrumentation import instrumented
 from src.db.storages.postgres.query_models import (
     SQLAlchemyQueryEssentials,
 )
+from src.db.storages.postgres.statements_cache import statements_cache
 
 from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.forecast_archives import ForecastArchive
+from src.models.db_entities.forecast_stats import ForecastDailyStats
 from src.models.db_entities.files import File
+from src.models.db_entities.locations import Location, normalize_location_name
 
 
 logger = logging.getLogger(__name__)
 
+WRITES_FLAG = "has_writes"
+
 
 class SQLAlchemyRepository(AbstractRepository):
-    """Interface for working with PostgreSQL DB via SQLAlchemy."""
+    """
+    Interface for working with PostgreSQL DB via SQLAlchemy.
+    Set `soft_deletable` for models with `deleted_at` column (`SoftDeleteMixin`):
+    deleted records are filtered out of all the reads, `delete` only marks them
+    as deleted and `purge_deleted` removes them for good.
+    """
 
     DBModel: tp.Type[DeclarativeBase]
     pk_attr: str = "id"
     soft_deletable: bool = False
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
+        """
+        - `session` - primary DB session, used for writing and reading,
+        - `read_session` - read replica's session (optional), used for read-only queries.
+        """
         self.session = session
+        self.read_session = read_session
+
+    @property
+    def _read_session(self) -> AsyncSession:
+        """
+        Returns session for read-only queries:
+        the replica's one if it's available and nothing has been written
+        through the primary session yet (read-your-writes),
+        otherwise the primary one.
+        """
+        if self.read_session is None or self._has_writes():
+            return self.session
+        return self.read_session
+
+    def _has_writes(self) -> bool:
+        """Checks, whether anything has been written through the primary session."""
+        return bool(
+            self.session.info.get(WRITES_FLAG)
+            or self.session.new
+            or self.session.dirty
+            or self.session.deleted
+        )
+
+    def _mark_writes(self) -> None:
+        """
+        Marks the primary session as the one with writes.
+        The flag is shared by all repositories using this session.
+        """
+        self.session.info[WRITES_FLAG] = True
 
+    @instrumented
     async def create(self, **attrs):
         try:
             instance: DeclarativeBase = self.DBModel(**attrs)
+            self._mark_writes()
             self.session.add(instance)
             await self.session.flush()
             return instance
@@ -56,6 +121,30 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    @instrumented
+    async def create_many(self, rows: list[dict[str, tp.Any]]) -> list[DeclarativeBase]:
+        """
+        Creates instances by one multi-row `INSERT ... RETURNING`,
+        returns them in `rows` order. Doesn't commit transaction.
+        """
+        try:
+            self._mark_writes()
+            instances = await self.session.scalars(
+                insert(self.DBModel).returning(
+                    self.DBModel, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            return instances.all()
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            IntegrityError,
+        ) as e:
+            await self._handle_error(e)
+
+    @instrumented
     async def get(
         self,
         instance_id: UUID | str | None = None,
@@ -73,9 +162,13 @@ class SQLAlchemyRepository(AbstractRepository):
                     f"No attributes was passed to get an instance of {self.DBModel}"
                 )
             if essentials:
-                instance_query_stmt = self._get_list_query_stmt(essentials)
-                instance_query: ChunkedIteratorResult = await self.session.execute(
-                    instance_query_stmt
+                instance_query_stmt = self._get_cached_stmt(
+                    "list", essentials, lambda: self._get_list_query_stmt(essentials)
+                )
+                instance_query: ChunkedIteratorResult = (
+                    await self._read_session.execute(
+                        instance_query_stmt, self._get_params(essentials)
+                    )
                 )
                 if essentials.columns:
                     instance = instance_query.fetchone()
@@ -85,12 +178,10 @@ class SQLAlchemyRepository(AbstractRepository):
                 return instance_query.scalars().first()
             if instance_id is not None:
                 attrs[self.pk_attr] = instance_id
-            instance_query_stmt = select(self.DBModel).filter_by(**attrs)
-            if load_options:
-                for load_option in load_options:
-                    instance_query_stmt = instance_query_stmt.options(load_option)
-            instance_query: ChunkedIteratorResult = await self.session.execute(
-                instance_query_stmt
+            instance_query_stmt = self._get_instance_query_stmt(attrs, load_options)
+            instance_query: ChunkedIteratorResult = await self._read_session.execute(
+                instance_query_stmt,
+                {f"get_{name}": value for name, value in attrs.items()},
             )
             return instance_query.scalars().first()
         except (
@@ -101,13 +192,62 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    def _get_instance_query_stmt(
+        self,
+        attrs: dict[str, tp.Any],
+        load_options: list[_AbstractLoad] | None = None,
+    ) -> Select:
+        """
+        Returns cached stmt for getting an instance by `attrs`.
+        Attributes' values are bound as `get_<attr>` parameters (`None` ones as `IS NULL`).
+        """
+        filters = tuple(sorted((name, value is None) for name, value in attrs.items()))
+        load_options_key = tuple(
+            load_option._generate_cache_key().key for load_option in load_options or []
+        )
+
+        def build() -> Select:
+            instance_query_stmt = self._filter_deleted(
+                select(self.DBModel).filter_by(
+                    **{
+                        name: None if is_null else bindparam(f"get_{name}")
+                        for name, is_null in filters
+                    }
+                )
+            )
+            for load_option in load_options or []:
+                instance_query_stmt = instance_query_stmt.options(load_option)
+            return instance_query_stmt
+
+        return statements_cache.get_or_build(
+            (type(self), "get", filters, load_options_key), build
+        )
+
+    def _filter_deleted[Statement: Executable](self, stmt: Statement) -> Statement:
+        """Filters soft deleted records out, if the model is `soft_deletable`."""
+        if not self.soft_deletable:
+            return stmt
+        return stmt.filter(self.DBModel.deleted_at.is_(None))
+
+    @instrumented
     async def delete(
         self,
         instance_id: UUID | str | None = None,
         filters: list[bool | tp.Any] | None = None,
-    ):
+        hard: bool = False,
+    ) -> int:
+        """
+        Deletes instance by it's ID or all the instances matching `filters`,
+        returns the number of deleted ones.
+        Instances of `soft_deletable` models are only marked as deleted, unless `hard` is passed.
+        """
         try:
-            delete_query_stmt = delete(self.DBModel)
+            if self.soft_deletable and not hard:
+                delete_query_stmt = self._filter_deleted(
+                    update(self.DBModel).values(deleted_at=func.now())
+                )
+            else:
+                delete_query_stmt = delete(self.DBModel)
             if filters:
                 for query_filter in filters:
                     delete_query_stmt = delete_query_stmt.filter(query_filter)
@@ -118,7 +258,9 @@ class SQLAlchemyRepository(AbstractRepository):
                 raise ValueError(
                     f"No query filters was passed to delete an instance/instances of {self.DBModel}"
                 )
-            await self.session.execute(delete_query_stmt)
+            self._mark_writes()
+            deleted = await self.session.execute(delete_query_stmt)
+            return deleted.rowcount
         except (
             ConnectionError,
             InterfaceError,
@@ -127,16 +269,65 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
-    def _order_list(
+    @instrumented
+    async def purge_deleted(
         self,
-        list_query_stmt: Select,
-        ordering: Enum,
-        order_expressions: dict[Enum, list[UnaryExpression]],
-    ) -> Select:
-        """Orders storage instances' list."""
-        for order_expression in order_expressions[ordering]:
-            list_query_stmt = list_query_stmt.order_by(order_expression)
-        return list_query_stmt
+        deleted_before: datetime,
+        batch_size: int,
+        returning: list[InstrumentedAttribute] | None = None,
+    ) -> list[dict[str, tp.Any]]:
+        """
+        Hard deletes up to `batch_size` records, soft deleted before `deleted_before`
+        (the oldest ones first), and returns their primary keys and `returning` attributes.
+        Records locked by concurrent transactions are skipped. Doesn't commit transaction.
+        """
+        if not self.soft_deletable:
+            raise ValueError(f"{self.DBModel} records are not soft deletable")
+        returning = returning or []
+
+        def build() -> Executable:
+            pk = getattr(self.DBModel, self.pk_attr)
+            batch = (
+                select(pk)
+                .filter(self.DBModel.deleted_at < bindparam("deleted_before"))
+                .order_by(self.DBModel.deleted_at)
+                .limit(bindparam("batch_size", type_=Integer))
+                .with_for_update(skip_locked=True)
+            )
+            return (
+                delete(self.DBModel)
+                .filter(pk.in_(batch))
+                .returning(pk, *returning)
+                .execution_options(synchronize_session=False)
+            )
+
+        try:
+            purge_query_stmt = statements_cache.get_or_build(
+                (type(self), "purge", tuple(attr.key for attr in returning)), build
+            )
+            self._mark_writes()
+            purged = await self.session.execute(
+                purge_query_stmt,
+                {"deleted_before": deleted_before, "batch_size": batch_size},
+            )
+            return [row._asdict() for row in purged.fetchall()]
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            InternalError,
+        ) as e:
+            await self._handle_error(e)
+
+    def _get_orderings(
+        self, essentials: SQLAlchemyQueryEssentials
+    ) -> list[UnaryExpression]:
+        """Returns order expressions for the list according to `essentials`."""
+        if essentials.orderings:
+            return essentials.orderings
+        if essentials.ordering and essentials.order_expressions:
+            return essentials.order_expressions[essentials.ordering]
+        return []
 
     def _filter(
         self,
@@ -151,28 +342,83 @@ class SQLAlchemyRepository(AbstractRepository):
     def _search(
         self,
         list_query_stmt: Select,
-        search_str: str,
+        search_words_count: int,
         search_attrs: list[InstrumentedAttribute],
     ) -> Select:
-        """Search filtration by matching `search_str` to instance's `search_attrs`."""
+        """
+        Search filtration by matching search words to instance's `search_attrs`.
+        Words are bound as `search_word_<index>` parameters (see `_get_search_params`).
+        """
         tmp_subquery = []
-        replaceable_chars = ["%", "_"]
-        for word in search_str.split():
-            for replaceable_char in replaceable_chars:
-                word = word.lower().replace(replaceable_char, f"\{replaceable_char}")
+        for index in range(search_words_count):
+            word = bindparam(f"search_word_{index}", type_=String)
             for attr in search_attrs:
-                tmp_subquery.append(func.lower(attr).contains(f"{word.lower()}"))
+                tmp_subquery.append(func.lower(attr).contains(word))
         return list_query_stmt.filter(or_(*tmp_subquery))
 
+    @staticmethod
+    def _get_search_params(search_str: str) -> dict[str, str]:
+        """Returns search words' bound parameters' values for `_search` filtration."""
+        params = {}
+        replaceable_chars = ["%", "_"]
+        for index, word in enumerate(search_str.split()):
+            for replaceable_char in replaceable_chars:
+                word = word.lower().replace(replaceable_char, f"\\{replaceable_char}")
+            params[f"search_word_{index}"] = word
+        return params
+
+    @staticmethod
+    def _get_search_words_count(essentials: SQLAlchemyQueryEssentials) -> int:
+        if not (essentials.search and essentials.search_attrs):
+            return 0
+        return len(essentials.search.split())
+
+    def _get_params(self, essentials: SQLAlchemyQueryEssentials) -> dict[str, tp.Any]:
+        """Returns values of all bound parameters of the list query built by `essentials`."""
+        params = dict(essentials.params or {})
+        if self._get_search_words_count(essentials):
+            params.update(self._get_search_params(essentials.search))
+        if essentials.page_size:
+            params["offset"] = (essentials.page_number - 1) * essentials.page_size
+            params["limit"] = essentials.page_size
+        return params
+
+    def _get_cached_stmt[Statement: Executable](
+        self,
+        purpose: str,
+        essentials: SQLAlchemyQueryEssentials,
+        build: tp.Callable[[], Statement],
+    ) -> Statement:
+        """
+        Returns the statement, built by `build` for `essentials`, from the cache
+        by the query's shape, if `essentials.cache_key` is passed, otherwise builds a new one.
+        - `purpose` - distinguishes statements built from the same essentials (list, count, etc.).
+        """
+        if essentials.cache_key is None:
+            return build()
+        key = (
+            type(self),
+            purpose,
+            essentials.cache_key,
+            essentials.ordering,
+            self._get_search_words_count(essentials),
+        )
+        return statements_cache.get_or_build(key, build)
+
     def _get_base_list_query_stmt(
         self, essentials: SQLAlchemyQueryEssentials
     ) -> Select:
         """Returns base list query statement for further filtration, searching, grouping by etc."""
         if essentials.columns:
-            query_stmt = select(*essentials.columns)
+            # columns can be just subqueries, correlated to the model
+            query_stmt = select(*essentials.columns).select_from(self.DBModel)
         else:
             query_stmt = select(self.DBModel)
-        return query_stmt
+        if essentials.outer_joins:
+            query_stmt = query_stmt.select_from(self.DBModel)
+            for target, onclause in essentials.outer_joins:
+                query_stmt = query_stmt.outerjoin(target, onclause)
+        return self._filter_deleted(query_stmt)
 
     def _get_list_query_stmt(
         self,
@@ -186,16 +432,11 @@ class SQLAlchemyRepository(AbstractRepository):
         if essentials.load_options:
             for load_option in essentials.load_options:
                 list_query_stmt = list_query_stmt.options(load_option)
-        if essentials.orderings:
-            for order_expression in essentials.orderings:
-                list_query_stmt = list_query_stmt.order_by(order_expression)
-        elif essentials.ordering and essentials.order_expressions:
-            list_query_stmt = self._order_list(
-                list_query_stmt, essentials.ordering, essentials.order_expressions
-            )
-        if essentials.search and essentials.search_attrs:
+        for order_expression in self._get_orderings(essentials):
+            list_query_stmt = list_query_stmt.order_by(order_expression)
+        if search_words_count := self._get_search_words_count(essentials):
             list_query_stmt = self._search(
-                list_query_stmt, essentials.search, essentials.search_attrs
+                list_query_stmt, search_words_count, essentials.search_attrs
             )
         if essentials.custom_filters:
             list_query_stmt = self._filter(list_query_stmt, essentials.custom_filters)
@@ -211,14 +452,25 @@ class SQLAlchemyRepository(AbstractRepository):
             return [item._asdict() for item in query.fetchall()]
         return query.scalars().all()
 
+    @instrumented
     async def get_list(
         self,
         essentials: SQLAlchemyQueryEssentials,
     ) -> list[DeclarativeBase] | list[dict[str, tp.Any]]:
+        """Returns the list or only it's page, if `page_number` and `page_size` are passed."""
         try:
-            list_query_stmt: Select = self._get_list_query_stmt(essentials)
-            list_query: ChunkedIteratorResult = await self.session.execute(
-                list_query_stmt
+            if essentials.page_size:
+                list_query_stmt: Select = self._get_cached_stmt(
+                    "page",
+                    essentials,
+                    lambda: self._paginate(self._get_list_query_stmt(essentials)),
+                )
+            else:
+                list_query_stmt: Select = self._get_cached_stmt(
+                    "list", essentials, lambda: self._get_list_query_stmt(essentials)
+                )
+            list_query: ChunkedIteratorResult = await self._read_session.execute(
+                list_query_stmt, self._get_params(essentials)
             )
             return self._extract_list_records(list_query, bool(essentials.columns))
         except (
@@ -229,14 +481,52 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    @instrumented
+    async def stream_list(
+        self,
+        essentials: SQLAlchemyQueryEssentials,
+        batch_size: int,
+    ) -> AsyncResult:
+        """
+        Executes list query with server-side cursor and returns it's result
+        to be read by `batch_size` rows (`result.partitions()`),
+        so only one batch is kept in memory at a time.
+        The result is bound to the session's connection: read it before closing the session.
+        """
+        try:
+            list_query_stmt: Select = self._get_cached_stmt(
+                "list", essentials, lambda: self._get_list_query_stmt(essentials)
+            )
+            return await self._read_session.stream(
+                list_query_stmt,
+                self._get_params(essentials),
+                execution_options={"yield_per": batch_size},
+            )
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            InternalError,
+        ) as e:
+            await self._handle_error(e)
+
+    @instrumented
     async def count(
         self,
         essentials: SQLAlchemyQueryEssentials,
     ) -> int:
         try:
-            all_items_query_stmt: Select = self._get_list_query_stmt(essentials)
-            all_items_query_result: ChunkedIteratorResult = await self.session.execute(
-                select(func.count(1)).select_from(all_items_query_stmt)
+            count_query_stmt: Select = self._get_cached_stmt(
+                "count",
+                essentials,
+                lambda: select(func.count(1)).select_from(
+                    self._get_list_query_stmt(essentials)
+                ),
+            )
+            all_items_query_result: ChunkedIteratorResult = (
+                await self._read_session.execute(
+                    count_query_stmt, self._get_params(essentials)
+                )
             )
             return all_items_query_result.scalar_one()
         except (
@@ -247,18 +537,22 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    @instrumented
     async def get_paginated_list(
         self,
         essentials: SQLAlchemyQueryEssentials,
     ) -> tuple[list[DeclarativeBase] | list[dict[str, tp.Any]], int, int]:
         try:
-            list_query_stmt: Select = self._get_list_query_stmt(essentials)
             total_items = await self.count(essentials)
             total_pages: int = ceil(total_items / essentials.page_size)
-            list_query_stmt = list_query_stmt.offset(
-                (essentials.page_number - 1) * essentials.page_size
-            ).limit(essentials.page_size)
-            list_query = await self.session.execute(list_query_stmt)
+            list_query_stmt: Select = self._get_cached_stmt(
+                "page",
+                essentials,
+                lambda: self._paginate(self._get_list_query_stmt(essentials)),
+            )
+            list_query = await self._read_session.execute(
+                list_query_stmt, self._get_params(essentials)
+            )
             list_content = self._extract_list_records(
                 list_query, bool(essentials.columns)
             )
@@ -271,6 +565,89 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    @instrumented
+    async def get_paginated_list_json(
+        self,
+        essentials: SQLAlchemyQueryEssentials,
+        record_json: ColumnElement,
+    ) -> bytes:
+        """
+        Returns paginated list rendered to JSON by DB in `PaginatedList` schema's format:
+        `{"content": [...], "total_items": ..., "total_pages": ...}`.
+        `content` items are `record_json` values - DB JSON expression, built from
+        the list query's columns by `json_build_object` (pass joins it requires as
+        `essentials.outer_joins`).
+        Use it to send the list to client as is, skipping ORM and pydantic processing.
+        """
+        try:
+            payload_query_stmt: Select = self._get_cached_stmt(
+                "json_page",
+                essentials,
+                lambda: self._get_paginated_list_json_stmt(essentials, record_json),
+            )
+            payload = await self._read_session.scalar(
+                payload_query_stmt, self._get_params(essentials)
+            )
+            return payload.encode()
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            InternalError,
+        ) as e:
+            await self._handle_error(e)
+
+    def _paginate(self, list_query_stmt: Select) -> Select:
+        """Limits list query to the page, bound by `offset` and `limit` parameters."""
+        return list_query_stmt.offset(bindparam("offset", type_=Integer)).limit(
+            bindparam("limit", type_=Integer)
+        )
+
+    def _get_paginated_list_json_stmt(
+        self,
+        essentials: SQLAlchemyQueryEssentials,
+        record_json: ColumnElement,
+    ) -> Select:
+        """Returns stmt for `get_paginated_list_json`."""
+        list_query_stmt: Select = self._get_list_query_stmt(essentials)
+        total_items = (
+            select(func.count(1).label("total_items"))
+            .select_from(list_query_stmt.subquery())
+            .cte("total")
+        )
+        page = list_query_stmt.with_only_columns(
+            record_json.label("record"),
+            func.row_number()
+            .over(order_by=self._get_orderings(essentials))
+            .label("record_number"),
+            maintain_column_froms=True,
+        )
+        page = self._paginate(page).subquery("page")
+        content = select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(page.c.record, page.c.record_number)),
+                literal_column("'[]'::json"),
+            )
+        ).scalar_subquery()
+        total_pages = cast(
+            func.ceil(total_items.c.total_items / bindparam("limit", type_=Integer)),
+            Integer,
+        )
+        payload_query_stmt = select(
+            cast(
+                func.json_build_object(
+                    literal_column("'content'"),
+                    content,
+                    literal_column("'total_items'"),
+                    total_items.c.total_items,
+                    literal_column("'total_pages'"),
+                    total_pages,
+                ),
+                Text,
+            )
+        ).select_from(total_items)
+        return payload_query_stmt
+
     async def _handle_error(
         self,
         error: (
@@ -304,9 +681,12 @@ class SQLAlchemyRepository(AbstractRepository):
             response_detail = "Ошибка сохранения записи в БД. Попробуйте снова"
 
         await self.session.rollback()
+        if self.read_session is not None:
+            await self.read_session.rollback()
         logger.error(log_msg)
         raise HTTPException(status_code, response_detail)
 
+    @instrumented
     async def save(
         self, instance_to_refresh: DeclarativeBase | None = None, flush: bool = False
     ) -> None:
@@ -330,11 +710,200 @@ class SQLAlchemyRepository(AbstractRepository):
         ) as e:
             await self._handle_error(e)
 
+    async def rollback(self) -> None:
+        """Discards changes: rolls back the primary session's transaction."""
+        await self.session.rollback()
+
+
+class _LocationSearchMixin:
+    """
+    Mixin for repositories of models with `location_id`:
+    searches records by their locations' names in locations' dictionary.
+    """
+
+    def _search(
+        self,
+        list_query_stmt: Select,
+        search_words_count: int,
+        search_attrs: list[InstrumentedAttribute],
+    ) -> Select:
+        """
+        Search filtration by locations' dictionary: matching locations are found
+        in the small dictionary first, then records are filtered by their IDs.
+        - `search_attrs` - `Location`'s attributes with normalized names (`Location.search_name`).
+        """
+        tmp_subquery = []
+        for index in range(search_words_count):
+            word = bindparam(f"search_word_{index}", type_=String)
+            for attr in search_attrs:
+                tmp_subquery.append(attr.contains(word))
+        matching_locations = select(Location.id).where(or_(*tmp_subquery))
+        return list_query_stmt.filter(self.DBModel.location_id.in_(matching_locations))
+
+    @staticmethod
+    def _get_search_params(search_str: str) -> dict[str, str]:
+        params = SQLAlchemyRepository._get_search_params(search_str)
+        return {name: normalize_location_name(word) for name, word in params.items()}
+
 
-class ForecastSQLAlchemyRepository(SQLAlchemyRepository):
+class ForecastSQLAlchemyRepository(_LocationSearchMixin, SQLAlchemyRepository):
     """Interface for handling DB operations with forecasts."""
 
     DBModel = Forecast
+    soft_deletable = True
+
+    @instrumented
+    async def create(self, **attrs) -> Forecast:
+        """
+        Creates forecast. Pass it's `location` name instead of `location_id`:
+        it's replaced by the ID from locations' dictionary (new names are added there).
+        """
+        location = attrs.pop("location", None)
+        if location is not None:
+            attrs["location_id"] = await self._get_location_id(location)
+        forecast = await super().create(**attrs)
+        if location is not None:
+            set_committed_value(forecast, "location", location)
+        return forecast
+
+    @instrumented
+    async def create_many(self, rows: list[dict[str, tp.Any]]) -> list[Forecast]:
+        """Creates forecasts, pass their `location` names instead of `location_id` (see `create`)."""
+        location_ids = {}
+        locations = []
+        forecasts_attrs = []
+        for row in rows:
+            attrs = dict(row)
+            location = attrs.pop("location", None)
+            if location is not None and location not in location_ids:
+                location_ids[location] = await self._get_location_id(location)
+            if location is not None:
+                attrs["location_id"] = location_ids[location]
+            locations.append(location)
+            forecasts_attrs.append(attrs)
+        forecasts = await super().create_many(forecasts_attrs)
+        for forecast, location in zip(forecasts, locations):
+            if location is not None:
+                set_committed_value(forecast, "location", location)
+        return forecasts
+
+    @instrumented
+    async def get_archive_batch(
+        self, created_before: datetime, batch_size: int
+    ) -> list[Forecast]:
+        """
+        Returns up to `batch_size` oldest live forecasts, created before `created_before`,
+        with their files and forecast data, to be moved to archive. The forecasts are locked till
+        the transaction's end, ones locked by concurrent transactions are skipped,
+        so concurrent archiving runs never take the same records.
+        """
+
+        def build() -> Executable:
+            return self._filter_deleted(
+                select(Forecast)
+                .options(joinedload(Forecast.file), undefer(Forecast.data))
+                .filter(Forecast.created_at < bindparam("created_before"))
+                .order_by(Forecast.created_at, Forecast.id)
+                .limit(bindparam("batch_size", type_=Integer))
+                .with_for_update(of=Forecast, skip_locked=True)
+            )
+
+        try:
+            batch_query_stmt = statements_cache.get_or_build(
+                (type(self), "archive_batch"), build
+            )
+            self._mark_writes()
+            batch = await self.session.execute(
+                batch_query_stmt,
+                {"created_before": created_before, "batch_size": batch_size},
+            )
+            return batch.scalars().all()
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            InternalError,
+        ) as e:
+            await self._handle_error(e)
+
+    @instrumented
+    async def delete_archived(self, forecast_ids: list[UUID]) -> int:
+        """
+        Hard deletes forecasts, moved to archive, returns the number of deleted ones.
+        Unlike other deletions, it keeps forecasts' statistics (see `ForecastDailyStats`).
+        Doesn't commit transaction.
+        """
+        try:
+            # the setting is read by statistics' triggers, it's reset on transaction's end
+            await self.session.execute(
+                select(func.set_config("forecasts.archiving", "on", True))
+            )
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            InternalError,
+        ) as e:
+            await self._handle_error(e)
+        return await self.delete(filters=[Forecast.id.in_(forecast_ids)], hard=True)
+
+    async def _get_location_id(self, name: str) -> int:
+        """Returns location's ID by it's name, adds the location to the dictionary if it's new."""
+        try:
+            params = {"name": name}
+            location_id = await self.session.scalar(
+                statements_cache.get_or_build(
+                    (Location, "get_id"),
+                    lambda: select(Location.id).where(
+                        Location.name == bindparam("name")
+                    ),
+                ),
+                params,
+            )
+            if location_id is not None:
+                return location_id
+            params["search_name"] = normalize_location_name(name)
+            location_id = await self.session.scalar(
+                statements_cache.get_or_build(
+                    (Location, "insert"),
+                    lambda: (
+                        insert(Location)
+                        .values(
+                            name=bindparam("name"), search_name=bindparam("search_name")
+                        )
+                        .on_conflict_do_nothing(index_elements=[Location.name])
+                        .returning(Location.id)
+                    ),
+                ),
+                params,
+            )
+            if location_id is not None:
+                return location_id
+            # the location has been just added by the concurrent transaction
+            return await self.session.scalar(
+                select(Location.id).where(Location.name == name)
+            )
+        except (
+            ConnectionError,
+            InterfaceError,
+            asyncpg.PostgresError,
+            IntegrityError,
+        ) as e:
+            await self._handle_error(e)
+
+
+class ForecastDailyStatsSQLAlchemyRepository(
+    _LocationSearchMixin, SQLAlchemyRepository
+):
+    """Interface for reading forecasts' daily statistics."""
+
+    DBModel = ForecastDailyStats
+
+
+class ForecastArchiveSQLAlchemyRepository(SQLAlchemyRepository):
+    """Interface for handling DB operations with forecasts' archive manifest."""
+
+    DBModel = ForecastArchive
 
 
 class FileSQLAlchemyRepository(SQLAlchemyRepository):
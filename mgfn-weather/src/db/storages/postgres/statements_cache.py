@@ -0,0 +1,63 @@
+"""
+Cache of built SQL statements.
+Repositories build statements of the same shape (projection, joins, filters, ordering)
+with bound parameters instead of values, so the built statement can be reused
+by every request of this shape: Python-side construction is skipped and
+SQLAlchemy's compiled cache key, memoized on the statement, isn't recalculated.
+"""
+
+import threading
+import typing as t
+from collections import OrderedDict
+
+from sqlalchemy.sql import Executable
+
+from src.core.config import settings
+from src.core.metrics import Counter, registry
+
+
+statements_cache_lookups = registry.register(
+    Counter(
+        "db_statements_cache_lookups_total",
+        "Lookups of built SQL statements in repositories' cache",
+        ("result",),
+    )
+)
+
+
+class StatementsCache:
+    """LRU cache of built SQL statements by their shape keys."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._statements: OrderedDict[t.Hashable, Executable] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build[Statement: Executable](
+        self, key: t.Hashable, build: t.Callable[[], Statement]
+    ) -> Statement:
+        """Returns cached statement by it's shape `key` or builds and caches a new one."""
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+        if statement is not None:
+            statements_cache_lookups.inc(result="hit")
+            return statement
+        statements_cache_lookups.inc(result="miss")
+        statement = build()
+        with self._lock:
+            self._statements[key] = statement
+            if len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+        return statement
+
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+statements_cache = StatementsCache(settings.DB_STATEMENTS_CACHE_SIZE)
@@ -2,17 +2,22 @@
 
 import typing as t
 
-from aiohttp import ClientSession
-from fastapi import Depends
-from miniopy_async import Minio
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.file_storages import minio
+from src.db.file_storages.cache import (
+    CachedFileStorageRepository,
+    FilesCache,
+    LRUCache,
+    files_metadata_cache,
+    open_files_cache,
+)
 from src.db.file_storages.repositories import (
     AbstractFileStorageRepository,
-    MinioRepository,
+    open_fs_repo,
 )
-from src.db.storages.postgres import async_session
+from src.core.config import FilesStorageBackend, settings
+from src.db.storages.postgres import async_session, replicas
+from src.db.storages.postgres.insert_buffer import InsertBuffer, forecasts_insert_buffer
 
 
 async def get_db() -> t.AsyncGenerator[AsyncSession, None]:
@@ -21,20 +26,48 @@ async def get_db() -> t.AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-def get_fs() -> Minio:
-    """Returns File storage client."""
-    return minio.minio_client
+async def get_replica_db() -> t.AsyncGenerator[AsyncSession | None, None]:
+    """
+    Returns read replica's DB storage connection
+    or `None` if there are no healthy replicas.
+    """
+    session_maker = replicas.get_session_maker()
+    if session_maker is None:
+        yield None
+        return
+    async with session_maker() as session:
+        yield session
+
 
+def get_forecasts_insert_buffer() -> InsertBuffer | None:
+    """Returns forecast records' insert buffer or `None` if it's disabled."""
+    if not settings.FORECASTS_INSERT_BUFFER_ENABLED:
+        return
+    return forecasts_insert_buffer
 
-async def get_fs_conn() -> t.AsyncGenerator[ClientSession, None]:
-    """Returns file storage connection."""
-    async with ClientSession() as session:
-        yield session
+
+def get_files_cache() -> FilesCache | None:
+    """
+    Returns files' content cache or `None` if all it's tiers are off
+    or files are stored locally (they are served by `sendfile` anyway).
+    """
+    if settings.FILES_STORAGE_BACKEND == FilesStorageBackend.LOCAL or not (
+        settings.FILES_CACHE_MEMORY_MAX_BYTES or settings.FILES_CACHE_DIR
+    ):
+        return
+    return open_files_cache()
+
+
+async def get_fs_repo() -> t.AsyncGenerator[AbstractFileStorageRepository, None]:
+    """Returns file storage repository, reading files through files' cache, if it's on."""
+    async with open_fs_repo() as repo:
+        if files_cache := get_files_cache():
+            repo = CachedFileStorageRepository(repo, files_cache)
+        yield repo
 
 
-async def get_fs_repo(
-    fs: Minio = Depends(get_fs),
-    session: ClientSession = Depends(get_fs_conn),
-) -> AbstractFileStorageRepository:
-    """Returns file storage repository."""
-    return MinioRepository(fs, session)
+def get_files_metadata_cache() -> LRUCache | None:
+    """Returns cache of files' DB records or `None` if it's disabled."""
+    if not settings.FILES_CACHE_METADATA_MAX_ITEMS:
+        return
+    return files_metadata_cache
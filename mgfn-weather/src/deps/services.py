@@ -3,38 +3,80 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.file_storages.cache import LRUCache
 from src.db.file_storages.repositories import AbstractFileStorageRepository
 from src.db.storages.postgres.repositories import (
     ForecastSQLAlchemyRepository,
+    ForecastArchiveSQLAlchemyRepository,
+    ForecastDailyStatsSQLAlchemyRepository,
     FileSQLAlchemyRepository,
 )
-from src.deps.db import get_db, get_fs_repo
+from src.db.storages.postgres.insert_buffer import InsertBuffer
+from src.deps.db import (
+    get_db,
+    get_files_metadata_cache,
+    get_forecasts_insert_buffer,
+    get_fs_repo,
+    get_replica_db,
+)
 from src.deps.weather_providers import get_weather_provider
 from src.deps.http import get_geodecoder_http_communicator
 from src.http.communicators.geodecoders import GeoDecoderHTTPCommunicator
 from src.services.files import FileService
 from src.services.forecasts import ForecastService
+from src.services.forecast_archives import ForecastArchiveService
+from src.services.forecast_stats import ForecastStatsService
 from src.utils.weather_providers import AbstractWeatherProvider
 
 
 async def get_file_service(
     db: AsyncSession = Depends(get_db),
+    replica_db: AsyncSession | None = Depends(get_replica_db),
     fs_repo: AbstractFileStorageRepository = Depends(get_fs_repo),
+    metadata_cache: LRUCache | None = Depends(get_files_metadata_cache),
 ) -> FileService:
     """Returns file service."""
-    return FileService(FileSQLAlchemyRepository(db), fs_repo)
+    return FileService(
+        FileSQLAlchemyRepository(db, replica_db), fs_repo, metadata_cache
+    )
+
+
+async def get_forecast_archive_service(
+    db: AsyncSession = Depends(get_db),
+    replica_db: AsyncSession | None = Depends(get_replica_db),
+    fs_repo: AbstractFileStorageRepository = Depends(get_fs_repo),
+) -> ForecastArchiveService:
+    """Returns forecasts' archive service."""
+    return ForecastArchiveService(
+        ForecastArchiveSQLAlchemyRepository(db, replica_db),
+        ForecastSQLAlchemyRepository(db, replica_db),
+        fs_repo,
+    )
 
 
 async def get_forecast_service(
     db: AsyncSession = Depends(get_db),
+    replica_db: AsyncSession | None = Depends(get_replica_db),
     weather_provider: AbstractWeatherProvider = Depends(get_weather_provider),
     geodecoder: GeoDecoderHTTPCommunicator = Depends(get_geodecoder_http_communicator),
     file_service: FileService = Depends(get_file_service),
+    archive_service: ForecastArchiveService = Depends(get_forecast_archive_service),
+    insert_buffer: InsertBuffer | None = Depends(get_forecasts_insert_buffer),
 ) -> ForecastService:
     """Returns forecast service."""
     return ForecastService(
-        ForecastSQLAlchemyRepository(db),
+        ForecastSQLAlchemyRepository(db, replica_db),
         weather_provider,
         geodecoder,
         file_service,
+        archive_service,
+        insert_buffer,
     )
+
+
+async def get_forecast_stats_service(
+    db: AsyncSession = Depends(get_db),
+    replica_db: AsyncSession | None = Depends(get_replica_db),
+) -> ForecastStatsService:
+    """Returns forecasts' statistics service."""
+    return ForecastStatsService(ForecastDailyStatsSQLAlchemyRepository(db, replica_db))
@@ -3,29 +3,60 @@
 import typing as t
 
 from fastapi import Depends
+from httpx import AsyncClient, Timeout
 from yaweather import YaWeatherAsync
 
-from src.core.config import settings
+from src.core.config import WeatherProviderClient, settings
 from src.utils.weather_providers import AbstractWeatherProvider
-from src.utils.weather_providers.yandex import YandexWeatherProvider
+from src.utils.weather_providers.yandex import (
+    YandexNativeWeatherProvider,
+    YandexWeatherProvider,
+)
 
 
-async def _get_ya_weather_client() -> t.AsyncGenerator[YaWeatherAsync, None]:
+# HTTP client, shared by weather provider's requests to reuse connections to it
+_http_client: AsyncClient | None = None
+
+
+async def _get_ya_weather_client() -> t.AsyncGenerator[YaWeatherAsync | None, None]:
     """
-    Returns client for making requests to yandex weather API.
+    Returns client for making requests to yandex weather API
+    (`None` for `native` client, it's requests go through shared HTTP client).
     Do not use it directly, use `get_weather_provider` dependency instead.
     """
-
+    if settings.WEATHER_PROVIDER_CLIENT == WeatherProviderClient.NATIVE:
+        yield None
+        return
     async with YaWeatherAsync(api_key=settings.WEATHER_PROVIDER_API_KEY) as client:
         yield client
 
 
+def get_weather_provider_http_client() -> AsyncClient:
+    """Returns HTTP client, shared by weather provider's requests (it's opened on first use)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = AsyncClient(
+            timeout=Timeout(settings.WEATHER_PROVIDER_TIMEOUT_SECONDS)
+        )
+    return _http_client
+
+
+async def close_weather_provider_http_client() -> None:
+    """Closes shared HTTP client of weather provider (call it on app's shutdown)."""
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
 async def get_weather_provider(
-    client: YaWeatherAsync = Depends(_get_ya_weather_client),
+    client: YaWeatherAsync | None = Depends(_get_ya_weather_client),
 ) -> AbstractWeatherProvider:
     """
     Returns weather provider.
     If the weather provider is gonna be changed return
     here another suitable impolementation of `AbstractWeatherProvider`.
     """
+    if client is None:
+        return YandexNativeWeatherProvider(
+            get_weather_provider_http_client(), settings.WEATHER_PROVIDER_API_KEY
+        )
     return YandexWeatherProvider(client)
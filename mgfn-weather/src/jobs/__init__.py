@@ -0,0 +1,4 @@
+"""
+Background jobs. They are run periodically alongside the app (see `src.main` lifespan)
+and can be run once from CLI: `python -m src.jobs.<job>`.
+"""
@@ -0,0 +1,78 @@
+"""
+Archiving of old forecast records: records older than `FORECASTS_ARCHIVE_AGE_DAYS`
+are moved from `forecasts` table to gzipped NDJSON batch files in file storage
+(see `ForecastArchiveService`). Run it once from CLI: `python -m src.jobs.archive`.
+"""
+
+import asyncio
+import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.logging import configure_logging
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    init_fs,
+    open_fs_repo,
+)
+from src.db.storages.postgres import async_session
+from src.db.storages.postgres.repositories import (
+    ForecastArchiveSQLAlchemyRepository,
+    ForecastSQLAlchemyRepository,
+)
+from src.services.forecast_archives import ForecastArchiveService
+
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_forecasts(
+    session_maker: async_sessionmaker[AsyncSession],
+    fs_repo: AbstractFileStorageRepository,
+    created_before: datetime.datetime,
+    batch_size: int,
+) -> int:
+    """
+    Archives forecast records, created before `created_before`, by batches
+    of `batch_size` (each one in a separate transaction), returns the number of archived records.
+    """
+    archived_count = 0
+    while True:
+        async with session_maker() as session:
+            archive_service = ForecastArchiveService(
+                ForecastArchiveSQLAlchemyRepository(session),
+                ForecastSQLAlchemyRepository(session),
+                fs_repo,
+            )
+            archived = await archive_service.archive_batch(created_before, batch_size)
+        archived_count += archived
+        if archived < batch_size:
+            return archived_count
+
+
+async def archive() -> int:
+    """Archives forecast records, older than `FORECASTS_ARCHIVE_AGE_DAYS`."""
+    created_before = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        days=settings.FORECASTS_ARCHIVE_AGE_DAYS
+    )
+    async with open_fs_repo() as fs_repo:
+        archived_count = await archive_forecasts(
+            async_session,
+            fs_repo,
+            created_before,
+            settings.FORECASTS_ARCHIVE_BATCH_SIZE,
+        )
+    logger.info("%s forecast records were archived", archived_count)
+    return archived_count
+
+
+async def main():
+    configure_logging()
+    await init_fs()
+    await archive()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
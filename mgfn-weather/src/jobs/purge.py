@@ -0,0 +1,93 @@
+"""
+Purging of soft deleted forecast records: they are hard deleted from DB
+by batches with their reports' files (DB records and file storage's objects).
+Run it once from CLI: `python -m src.jobs.purge`.
+"""
+
+import asyncio
+import datetime
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.logging import configure_logging
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    init_fs,
+    open_fs_repo,
+)
+from src.db.storages.postgres import async_session
+from src.db.storages.postgres.repositories import (
+    FileSQLAlchemyRepository,
+    ForecastSQLAlchemyRepository,
+)
+from src.models.db_entities.files import File
+from src.models.db_entities.forecasts import Forecast
+
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_deleted_forecasts(
+    session_maker: async_sessionmaker[AsyncSession],
+    fs_repo: AbstractFileStorageRepository,
+    deleted_before: datetime.datetime,
+    batch_size: int,
+) -> int:
+    """
+    Purges forecast records, soft deleted before `deleted_before`, by batches
+    of `batch_size`, returns the number of purged records.
+    Each batch is deleted with it's files' records in a separate short transaction,
+    files' objects are removed from file storage after it's committed:
+    objects, that failed to be removed, are only logged (they are orphans now).
+    """
+    purged_count = 0
+    while True:
+        async with session_maker() as session:
+            forecast_repo = ForecastSQLAlchemyRepository(session)
+            file_repo = FileSQLAlchemyRepository(session)
+            purged = await forecast_repo.purge_deleted(
+                deleted_before, batch_size, returning=[Forecast.file_id]
+            )
+            file_ids = [row["file_id"] for row in purged if row["file_id"]]
+            if file_ids:
+                await file_repo.delete(filters=[File.id.in_(file_ids)])
+            await forecast_repo.save()
+        for file_id in file_ids:
+            try:
+                await fs_repo.delete(file_id)
+            except HTTPException:
+                logger.warning(
+                    "Purged file %s wasn't removed from file storage", file_id
+                )
+        purged_count += len(purged)
+        if len(purged) < batch_size:
+            return purged_count
+
+
+async def purge() -> int:
+    """Purges forecast records, deleted earlier than the retention period."""
+    deleted_before = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        hours=settings.FORECASTS_PURGE_RETENTION_HOURS
+    )
+    async with open_fs_repo() as fs_repo:
+        purged_count = await purge_deleted_forecasts(
+            async_session,
+            fs_repo,
+            deleted_before,
+            settings.FORECASTS_PURGE_BATCH_SIZE,
+        )
+    logger.info("%s deleted forecast records were purged", purged_count)
+    return purged_count
+
+
+async def main():
+    configure_logging()
+    await init_fs()
+    await purge()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
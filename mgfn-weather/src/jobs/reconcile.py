@@ -0,0 +1,208 @@
+"""
+Reconciliation of file storage with DB. Adding and removing files isn't atomic
+with DB transactions (see `FileService.add_to_system`, `FileService.drop_from_system`,
+purging job), so failures between the steps leave:
+- orphaned objects: storage's files without `files` or `forecast_archives` rows;
+- dangling files: `files` rows without storage's files (their reports are lost).
+Storage's listing and DB tables are streamed in IDs' order and merge-joined,
+so memory is bounded by batches whatever their sizes.
+Objects and rows younger than `FILES_RECONCILE_GRACE_SECONDS` are skipped:
+they can belong to requests in progress.
+Run it from CLI: `python -m src.jobs.reconcile` to report orphans,
+`python -m src.jobs.reconcile --delete` to delete them.
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import typing as t
+from dataclasses import dataclass
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.logging import configure_logging
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    init_fs,
+    open_fs_repo,
+)
+from src.db.storages.postgres import async_session
+from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
+from src.db.storages.postgres.repositories import (
+    FileSQLAlchemyRepository,
+    ForecastArchiveSQLAlchemyRepository,
+    SQLAlchemyRepository,
+)
+from src.models.db_entities.files import File
+
+
+logger = logging.getLogger(__name__)
+
+# sources of IDs, merge-joined by reconciliation
+STORAGE = "storage"
+FILES = "files"
+ARCHIVES = "forecast_archives"
+
+
+@dataclass
+class ReconciliationReport:
+    """Numbers of orphans, found by reconciliation."""
+
+    orphaned_objects: int = 0
+    dangling_files: int = 0
+    dangling_archives: int = 0
+
+
+async def _iter_rows(
+    session_maker: async_sessionmaker[AsyncSession],
+    repo_class: type[SQLAlchemyRepository],
+    batch_size: int,
+) -> t.AsyncIterator[tuple[UUID, datetime.datetime]]:
+    """Yields IDs and creation times of the repository model's rows in IDs' order."""
+    async with session_maker() as session:
+        repo = repo_class(session)
+        model = repo.DBModel
+        result = await repo.stream_list(
+            SQLAlchemyQueryEssentials(
+                columns=[model.id, model.created_at],
+                orderings=[model.id.asc()],
+                cache_key=("reconcile",),
+            ),
+            batch_size,
+        )
+        async for rows in result.partitions():
+            for row in rows:
+                yield row.id, row.created_at
+
+
+async def _merge(
+    sources: dict[str, t.AsyncGenerator[tuple[UUID, datetime.datetime]]],
+) -> t.AsyncIterator[tuple[UUID, dict[str, datetime.datetime]]]:
+    """
+    Merge-joins iterators, sorted by IDs: yields each ID
+    with it's times in sources, where it's found.
+    """
+    try:
+        heads = {name: await anext(source, None) for name, source in sources.items()}
+        while any(heads.values()):
+            current_id = min(head[0] for head in heads.values() if head)
+            found = {}
+            for name, head in heads.items():
+                if head and head[0] == current_id:
+                    found[name] = head[1]
+                    heads[name] = await anext(sources[name], None)
+            yield current_id, found
+    finally:
+        for source in sources.values():
+            await source.aclose()
+
+
+async def reconcile_file_storage(
+    session_maker: async_sessionmaker[AsyncSession],
+    fs_repo: AbstractFileStorageRepository,
+    modified_before: datetime.datetime,
+    batch_size: int,
+    delete: bool = False,
+) -> ReconciliationReport:
+    """
+    Finds storage's objects and DB rows, modified before `modified_before`,
+    missing on the other side, logs them by batches of `batch_size`.
+    If `delete` is passed, orphaned objects are removed from storage and dangling
+    `files` rows are deleted (their forecasts become failed ones).
+    Dangling archives' manifests are only reported: they describe records,
+    moved out of DB, and have to be restored from backups.
+    """
+    report = ReconciliationReport()
+    orphaned_objects: list[UUID] = []
+    dangling_files: list[UUID] = []
+
+    async def flush() -> None:
+        if orphaned_objects:
+            logger.warning("Orphaned objects in file storage: %s", orphaned_objects)
+            if delete:
+                try:
+                    await fs_repo.delete_many(orphaned_objects)
+                except HTTPException:
+                    logger.warning("Orphaned objects weren't removed from file storage")
+            orphaned_objects.clear()
+        if dangling_files:
+            logger.warning("Files without objects in file storage: %s", dangling_files)
+            if delete:
+                async with session_maker() as session:
+                    file_repo = FileSQLAlchemyRepository(session)
+                    await file_repo.delete(
+                        filters=[
+                            File.id.in_(dangling_files),
+                            File.created_at < modified_before,
+                        ]
+                    )
+                    await file_repo.save()
+            dangling_files.clear()
+
+    sources = {
+        STORAGE: fs_repo.iter_stored(),
+        FILES: _iter_rows(session_maker, FileSQLAlchemyRepository, batch_size),
+        ARCHIVES: _iter_rows(
+            session_maker, ForecastArchiveSQLAlchemyRepository, batch_size
+        ),
+    }
+    async for file_id, found in _merge(sources):
+        if STORAGE in found:
+            if len(found) == 1 and found[STORAGE] < modified_before:
+                orphaned_objects.append(file_id)
+                report.orphaned_objects += 1
+        elif FILES in found and found[FILES] < modified_before:
+            dangling_files.append(file_id)
+            report.dangling_files += 1
+        elif ARCHIVES in found and found[ARCHIVES] < modified_before:
+            logger.error(
+                "Forecasts' archive batch %s isn't found in file storage", file_id
+            )
+            report.dangling_archives += 1
+        if len(orphaned_objects) >= batch_size or len(dangling_files) >= batch_size:
+            await flush()
+    await flush()
+    return report
+
+
+async def reconcile(delete: bool = False) -> ReconciliationReport:
+    """Reconciles file storage with DB, skipping objects and rows younger than the grace period."""
+    modified_before = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        seconds=settings.FILES_RECONCILE_GRACE_SECONDS
+    )
+    async with open_fs_repo() as fs_repo:
+        report = await reconcile_file_storage(
+            async_session,
+            fs_repo,
+            modified_before,
+            settings.FILES_RECONCILE_BATCH_SIZE,
+            delete,
+        )
+    logger.info(
+        "File storage is reconciled%s: %s orphaned objects, %s dangling files, "
+        "%s dangling archives' batches",
+        " (orphans are deleted)" if delete else "",
+        report.orphaned_objects,
+        report.dangling_files,
+        report.dangling_archives,
+    )
+    return report
+
+
+async def main(delete: bool):
+    configure_logging()
+    await init_fs()
+    await reconcile(delete)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--delete", action="store_true", help="Delete found orphans, not only report"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.delete))
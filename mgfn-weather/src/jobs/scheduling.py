@@ -0,0 +1,44 @@
+"""Periodic running of background jobs in off-peak hours."""
+
+import asyncio
+import datetime
+import logging
+import typing as t
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_off_peak(hour: int, start_hour: int, end_hour: int) -> bool:
+    """
+    Checks, whether `hour` is in off-peak hours `[start_hour, end_hour)`.
+    The range can pass midnight (`start_hour > end_hour`),
+    equal hours mean the whole day.
+    """
+    if start_hour == end_hour:
+        return True
+    if start_hour < end_hour:
+        return start_hour <= hour < end_hour
+    return hour >= start_hour or hour < end_hour
+
+
+async def run_periodically(
+    job: t.Callable[[], t.Awaitable[t.Any]],
+    interval: float,
+    start_hour: int,
+    end_hour: int,
+) -> None:
+    """
+    Runs `job` every `interval` seconds in off-peak hours (UTC, see `is_off_peak`)
+    until cancelled. Job's errors are logged, they don't stop next runs.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not is_off_peak(
+            datetime.datetime.now(datetime.UTC).hour, start_hour, end_hour
+        ):
+            continue
+        try:
+            await job()
+        except Exception:
+            logger.exception("ERROR running background job %s", job.__qualname__)
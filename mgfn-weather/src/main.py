@@ -1,13 +1,27 @@
 """Main app's module."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.api.metrics import metrics_router
 from src.api.v1 import v1_api_router
 from src.core.config import settings
 from src.core.logging import configure_logging
-from src.db.file_storages import minio
+from src.db.file_storages.cache import close_files_cache
+from src.db.file_storages.repositories import init_fs
+from src.db.storages.postgres import replicas
+from src.db.storages.postgres.insert_buffer import forecasts_insert_buffer
+from src.db.storages.postgres.instrumentation import (
+    start_request_statements_count,
+    finish_request_statements_count,
+)
+from src.deps.db import get_files_cache
+from src.deps.weather_providers import close_weather_provider_http_client
+from src.jobs import archive, purge
+from src.jobs.scheduling import run_periodically
 
 from src.models.schemas.api_responses import common_responses
 
@@ -15,13 +29,38 @@ from src.models.schemas.api_responses import common_responses
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
-    minio.minio_client = await minio.init_minio(
-        settings.MINIO_ADDRESS,
-        settings.MINIO_ACCESS_KEY,
-        settings.MINIO_SECRET_KEY,
-        settings.MINIO_BUCKET,
+    await init_fs()
+    # disk tier's directory is scanned once, before serving requests
+    await asyncio.to_thread(get_files_cache)
+    await replicas.check_health()
+    replicas_health_checks = asyncio.create_task(
+        replicas.run_health_checks(
+            settings.POSTGRES_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+        )
     )
+    jobs = [
+        asyncio.create_task(
+            run_periodically(
+                job,
+                interval,
+                settings.JOBS_OFF_PEAK_START_HOUR,
+                settings.JOBS_OFF_PEAK_END_HOUR,
+            )
+        )
+        for job, interval in (
+            (purge.purge, settings.FORECASTS_PURGE_INTERVAL_SECONDS),
+            (archive.archive, settings.FORECASTS_ARCHIVE_INTERVAL_SECONDS),
+        )
+    ]
     yield
+    for task in (replicas_health_checks, *jobs):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await forecasts_insert_buffer.close()
+    await close_weather_provider_http_client()
+    close_files_cache()
+    await replicas.dispose()
 
 
 app = FastAPI(
@@ -35,3 +74,45 @@ app = FastAPI(
     lifespan=lifespan,
 )
 app.include_router(v1_api_router)
+app.include_router(metrics_router)
+
+
+class DBStatementsCountMiddleware:
+    """
+    Counts SQL statements, executed during the request, till it's response body is sent,
+    so statements of streamed bodies (`StreamingResponse`) are counted too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = start_request_statements_count()
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            route = scope.get("route")
+            finish_request_statements_count(counter, route.path if route else "unknown")
+
+        async def send_counted(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            # the response isn't sent completely, if the app fails
+            finish()
+
+
+app.add_middleware(DBStatementsCountMiddleware)
@@ -1,4 +1,7 @@
 """Database entities' models."""
 
 from src.models.db_entities.files import *  # noqa
+from src.models.db_entities.locations import *  # noqa
 from src.models.db_entities.forecasts import *  # noqa
+from src.models.db_entities.forecast_stats import *  # noqa
+from src.models.db_entities.forecast_archives import *  # noqa
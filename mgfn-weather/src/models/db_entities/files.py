@@ -11,3 +11,9 @@ class File(IDCreatedAtMixin, Base):
 
     name = Column(String, nullable=False, doc="File's name")
     size = Column(BigInteger, nullable=False, doc="File's size in bytes")
+    etag = Column(
+        String(64),
+        nullable=True,
+        doc="Strong ETag: hex SHA-256 of file's content, set on adding file to system. "
+        "Files are immutable, so it identifies file's content forever.",
+    )
@@ -0,0 +1,33 @@
+"""Forecasts' archive DB models."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer
+
+from src.db.storages.postgres import Base
+from src.models.db_entities.mixins import IDCreatedAtMixin
+
+
+class ForecastArchive(IDCreatedAtMixin, Base):
+    """
+    Manifest of forecast records' archive batch: records, moved out of `forecasts` table
+    to file storage's object (named by batch's ID) as gzipped NDJSON.
+    Each line is the record in `ForecastRecordSchema` format.
+    """
+
+    __tablename__ = "forecast_archives"
+    __table_args__ = (
+        # searching batches overlapping the requested period
+        Index("ix_forecast_archives_records_period", "created_from", "created_to"),
+    )
+
+    created_from = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Creation time of the batch's oldest record",
+    )
+    created_to = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Creation time of the batch's newest record",
+    )
+    records_count = Column(Integer, nullable=False, doc="Number of records in batch")
+    size = Column(BigInteger, nullable=False, doc="Batch file's size in bytes")
@@ -0,0 +1,123 @@
+"""Forecasts' statistics DB models."""
+
+from sqlalchemy import DDL, BigInteger, Column, Date, ForeignKey, Integer, event, select
+from sqlalchemy.orm import column_property
+
+from src.db.storages.postgres import Base
+from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import Location
+
+
+class ForecastDailyStats(Base):
+    """
+    Rollup of forecast requests per location per day (UTC).
+    It's maintained by `forecasts` table's statement level triggers on every insert,
+    update and delete, so don't write to it directly. Statement's rows are aggregated
+    by transition tables and applied by one upsert per location's day (in keys' order,
+    so concurrent statements don't deadlock). Concurrent transactions, changing the same
+    location's day, still wait for each other's stats row lock till commit: it's held
+    once per statement, so batched inserts (see `InsertBuffer`) lower the contention.
+    Soft deleted forecasts are not counted, archived ones are
+    (see `ForecastSQLAlchemyRepository.delete_archived`).
+    """
+
+    __tablename__ = "forecast_daily_stats"
+
+    location_id = Column(
+        Integer, ForeignKey("locations.id"), primary_key=True, doc="Location"
+    )
+    day = Column(Date, primary_key=True, doc="Requests' day (UTC)")
+    requests_count = Column(
+        BigInteger, nullable=False, default=0, doc="Number of forecast requests"
+    )
+    failed_count = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        doc="Number of failed forecast requests (without report's file)",
+    )
+    location = column_property(
+        select(Location.name)
+        .where(Location.id == location_id)
+        .correlate_except(Location)
+        .scalar_subquery(),
+        doc="Location name, read from locations' dictionary",
+    )
+
+
+# The current stats trigger's function (archived records are still counted).
+# Migrations, changing it, freeze it's copy (they must not import models),
+# the test checks the migrated DB's function equals it.
+FORECAST_DAILY_STATS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION forecast_daily_stats_update() RETURNS trigger AS $$
+    DECLARE
+        changes text;
+    BEGIN
+        IF TG_OP = 'DELETE' AND current_setting('forecasts.archiving', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        changes := CASE TG_OP
+            WHEN 'INSERT' THEN
+                'SELECT location_id, created_at, file_id, deleted_at, 1 AS sign FROM new_rows'
+            WHEN 'DELETE' THEN
+                'SELECT location_id, created_at, file_id, deleted_at, -1 AS sign FROM old_rows'
+            ELSE
+                'SELECT location_id, created_at, file_id, deleted_at, 1 AS sign FROM new_rows '
+                || 'UNION ALL '
+                || 'SELECT location_id, created_at, file_id, deleted_at, -1 FROM old_rows'
+        END;
+        EXECUTE $sql$
+            INSERT INTO forecast_daily_stats AS stats
+                (location_id, day, requests_count, failed_count)
+            SELECT
+                location_id,
+                (created_at AT TIME ZONE 'UTC')::date,
+                sum(sign),
+                sum(sign * (file_id IS NULL)::int)
+            FROM ($sql$ || changes || $sql$) AS changes
+            WHERE deleted_at IS NULL
+            GROUP BY 1, 2
+            HAVING sum(sign) <> 0 OR sum(sign * (file_id IS NULL)::int) <> 0
+            ORDER BY 1, 2
+            ON CONFLICT (location_id, day) DO UPDATE
+            SET requests_count = stats.requests_count + EXCLUDED.requests_count,
+                failed_count = stats.failed_count + EXCLUDED.failed_count
+            $sql$;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+forecast_daily_stats_function = DDL(FORECAST_DAILY_STATS_FUNCTION)
+forecast_daily_stats_triggers = [
+    DDL(
+        """
+        CREATE TRIGGER forecasts_daily_stats_insert
+        AFTER INSERT ON forecasts
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    ),
+    DDL(
+        """
+        CREATE TRIGGER forecasts_daily_stats_update
+        AFTER UPDATE ON forecasts
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    ),
+    DDL(
+        """
+        CREATE TRIGGER forecasts_daily_stats_delete
+        AFTER DELETE ON forecasts
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION forecast_daily_stats_update()
+        """
+    ),
+]
+
+# Tables created by `metadata.create_all` (e.g. in tests) get the triggers too,
+# migrations create it explicitly.
+for ddl in (forecast_daily_stats_function, *forecast_daily_stats_triggers):
+    event.listen(
+        Forecast.__table__, "after_create", ddl.execute_if(dialect="postgresql")
+    )
@@ -2,19 +2,86 @@
 
 import uuid
 
-from sqlalchemy import Column, Float, String, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID as pgUUID
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID as pgUUID
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.orm import Mapped, column_property, deferred, relationship
 
 from src.db.storages.postgres import Base
 from src.models.db_entities.files import File
-from src.models.db_entities.mixins import IDCreatedAtMixin
+from src.models.db_entities.locations import Location
+from src.models.db_entities.mixins import IDCreatedAtMixin, SoftDeleteMixin
+from src.utils.geohash import MAX_PRECISION, encode as encode_geohash
 
 
-class Forecast(IDCreatedAtMixin, Base):
+def _get_geohash(context: DefaultExecutionContext) -> str:
+    """Returns inserted forecast's coordinates' geohash."""
+    params = context.get_current_parameters()
+    return encode_geohash(params["lattitude"], params["longitude"])
+
+
+class Forecast(IDCreatedAtMixin, SoftDeleteMixin, Base):
     __tablename__ = "forecasts"
+    __table_args__ = (
+        # ordering and filtering live (not deleted) records by creation time
+        Index(
+            "ix_forecasts_live_created_at",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # failed records are rare, so they are indexed separately
+        Index(
+            "ix_forecasts_failed_created_at",
+            "created_at",
+            postgresql_where=text("file_id IS NULL AND deleted_at IS NULL"),
+        ),
+        # deleted records waiting for purging
+        Index(
+            "ix_forecasts_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        # bounding box filtration
+        Index("ix_forecasts_lattitude_longitude", "lattitude", "longitude"),
+        # geohash prefix search (`LIKE 'prefix%'` and `~>=~`, `~<~` operators)
+        Index(
+            "ix_forecasts_geohash",
+            "geohash",
+            postgresql_ops={"geohash": "text_pattern_ops"},
+        ),
+        # history search by forecasted dates (`data @> '{"forecasts": [{"date": ...}]}'`)
+        Index(
+            "ix_forecasts_data",
+            "data",
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+        ),
+    )
 
-    location = Column(String, nullable=False, doc="Location name")
+    location_id = Column(
+        Integer,
+        ForeignKey("locations.id"),
+        nullable=False,
+        index=True,
+        doc="Location from locations' dictionary",
+    )
+    location = column_property(
+        select(Location.name)
+        .where(Location.id == location_id)
+        .correlate_except(Location)
+        .scalar_subquery(),
+        doc="Location name, read from locations' dictionary. "
+        "It can't be written, pass `location_id` instead.",
+    )
     lattitude = Column(
         Float,
         nullable=False,
@@ -25,10 +92,30 @@ class Forecast(IDCreatedAtMixin, Base):
         nullable=False,
         doc="Longitude coordinate, for which the forecast was requested.",
     )
+    geohash = Column(
+        String(MAX_PRECISION),
+        nullable=False,
+        default=_get_geohash,
+        doc="Coordinates' geohash, it's set automatically on insert.",
+    )
     file_id: Mapped[uuid.UUID | None] = Column(
         pgUUID(as_uuid=True),
         ForeignKey("files.id", ondelete="SET NULL"),
         nullable=True,
         doc="File with generated forecast report. If it's `None`, generating went wrong.",
     )
-    file: Mapped[File] = relationship(lazy="selectin", doc="Forecast report's file")
+    data = deferred(
+        Column(
+            JSONB,
+            nullable=True,
+            doc="Parsed forecast data (`ForecastInfoSchema` without computed fields), "
+            "reports are re-rendered from it without weather provider's calls. "
+            "It's `None`, if generating went wrong. Isn't loaded by default "
+            "(pass `undefer(Forecast.data)` to the query).",
+        )
+    )
+    file: Mapped[File] = relationship(
+        lazy="raise_on_sql",
+        doc="Forecast report's file. Isn't loaded by default, "
+        "pass the loading strategy to the query explicitly (e.g. `joinedload(Forecast.file)`).",
+    )
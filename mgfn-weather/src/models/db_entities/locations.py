@@ -0,0 +1,27 @@
+"""Locations' dictionary DB models."""
+
+from sqlalchemy import Column, Identity, Integer, String
+
+from src.db.storages.postgres import Base
+
+
+def normalize_location_name(name: str) -> str:
+    """Returns location name's search form: lowercased, with `ё` replaced by `е`."""
+    return name.lower().replace("ё", "е")
+
+
+class Location(Base):
+    """
+    Dictionary of geo locations' names.
+    Each distinct name is stored once and referenced by forecasts and their statistics.
+    """
+
+    __tablename__ = "locations"
+
+    id = Column(Integer, Identity(), primary_key=True)
+    name = Column(String, nullable=False, unique=True, doc="Location name")
+    search_name = Column(
+        String,
+        nullable=False,
+        doc="Location name's normalized form for searching (see `normalize_location_name`)",
+    )
@@ -48,3 +48,19 @@ class IDCreatedAtMixin(_IDMixin, _CreatedAtMixin):
     - `id`,
     - `created_at`.
     """
+
+
+class SoftDeleteMixin:
+    """
+    Mixin to mark entity as deleted instead of deleting it's record.
+    Use it with repository's `soft_deletable` flag: such repositories filter
+    deleted records out of all the reads and "delete" them by setting `deleted_at`.
+    Fields to be added:
+    - `deleted_at`.
+    """
+
+    deleted_at: Mapped[datetime | None] = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Date and time of deleting DB entity record. It's `None` for live records",
+    )
@@ -1,10 +1,15 @@
 """Common response models for API's."""
 
+import typing as t
+from pathlib import Path
 from urllib.parse import quote
 
 from fastapi import status, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from src.utils.http_caching import format_etag
+
 
 class HTTPError(BaseModel):
     """Model of HTTP errors' responses for openapi.json."""
@@ -29,10 +34,46 @@ file_responses = {
                 "schema": {"type": "string", "format": "binary"}
             },
         },
-    }
+    },
+    206: {
+        "description": "Requested range of the file (`Range` header)",
+        "content": {
+            "application/octet-stream": {
+                "schema": {"type": "string", "format": "binary"}
+            },
+        },
+    },
+    304: {"description": "File wasn't modified (`If-None-Match` header)"},
+    307: {"description": "Redirect to file's temporary URL in file storage"},
+    416: {"description": "Requested range is outside of the file"},
+}
+
+files_archive_responses = {
+    200: {
+        "description": "ZIP archive with the files",
+        "content": {
+            "application/zip": {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
 }
 
 
+# files are immutable, so they can be cached by clients and proxies forever
+IMMUTABLE_FILE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def get_file_cache_headers(etag: str | None) -> dict[str, str]:
+    """Returns caching headers of immutable file with given ETag."""
+    if not etag:
+        return {}
+    return {"ETag": format_etag(etag), "Cache-Control": IMMUTABLE_FILE_CACHE_CONTROL}
+
+
+def get_content_disposition(file_name: str) -> str:
+    """Returns `Content-Disposition` header's value for file's downloading."""
+    return f'''attachment; filename="{quote(file_name, encoding="utf-8")}"'''
+
+
 def get_file_response(
     file: bytes, file_name: str, status_code: int = status.HTTP_200_OK
 ) -> Response:
@@ -41,7 +82,97 @@ def get_file_response(
         file,
         status_code=status_code,
         media_type="application/octet-stream",
+        headers={"Content-Disposition": get_content_disposition(file_name)},
+    )
+
+
+def get_file_stream_response(
+    chunks: t.AsyncIterator[bytes],
+    file_name: str,
+    size: int,
+    byte_range: tuple[int, int] | None = None,
+    etag: str | None = None,
+) -> StreamingResponse:
+    """
+    Returns API response, streaming file's chunks.
+    Pass `byte_range` (first and last bytes' positions), if `chunks` are only the range
+    of file with `size` bytes: the response will be `206 Partial Content`.
+    Pass file's `etag` to let clients cache it.
+    """
+    headers = {
+        "Content-Disposition": get_content_disposition(file_name),
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(size),
+        **get_file_cache_headers(etag),
+    }
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        first, last = byte_range
+        headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+        headers["Content-Length"] = str(last - first + 1)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    return StreamingResponse(
+        chunks,
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+def get_archive_stream_response(
+    chunks: t.AsyncIterator[bytes], file_name: str
+) -> StreamingResponse:
+    """Returns API response, streaming ZIP archive's chunks."""
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": get_content_disposition(file_name)},
+    )
+
+
+def get_local_file_response(
+    path: Path, file_name: str, etag: str | None = None
+) -> FileResponse:
+    """
+    Returns API response, serving file's local copy by `sendfile`, where the server supports it.
+    Use it for requests without `Range` header: the response handles ranges by itself.
+    """
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": get_content_disposition(file_name),
+            **get_file_cache_headers(etag),
+        },
+    )
+
+
+def get_file_redirect_response(url: str) -> RedirectResponse:
+    """Returns API response, redirecting to file's temporary URL in file storage."""
+    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+
+def get_file_x_accel_response(
+    path: str, file_name: str, etag: str | None = None
+) -> Response:
+    """
+    Returns empty API response with `X-Accel-Redirect` header:
+    nginx serves the file from it's internal location `path` instead of the app.
+    """
+    return Response(
+        status_code=status.HTTP_200_OK,
+        media_type="application/octet-stream",
         headers={
-            "Content-Disposition": f'''attachment; filename="{quote(file_name, encoding="utf-8")}"'''
+            "Content-Disposition": get_content_disposition(file_name),
+            "X-Accel-Redirect": path,
+            **get_file_cache_headers(etag),
         },
     )
+
+
+def get_file_not_modified_response(etag: str) -> Response:
+    """Returns `304 Not Modified` API response for the file, cached by client."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=get_file_cache_headers(etag),
+    )
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from pydantic import Field
 
+from src.core.config import settings
 from src.models.schemas.common import CustomBaseModel
 
 
@@ -19,6 +20,10 @@ class FileCreate(CustomBaseModel):
         You can define the file's size directly here, or it would be set in file_service, when adding the file to system.
         """,
     )
+    etag: str | None = Field(
+        default=None,
+        description="File content's hash, it's set in file_service, when adding the file to system.",
+    )
 
 
 class FileSchema(CustomBaseModel):
@@ -28,3 +33,13 @@ class FileSchema(CustomBaseModel):
     name: str
     size: int = Field(description="File's size in bytes.")
     created_at: datetime
+
+
+class FilesArchiveParams(CustomBaseModel):
+    """Params for downloading files as one ZIP archive."""
+
+    file_ids: list[uuid.UUID] = Field(
+        min_length=1,
+        max_length=settings.FILES_ARCHIVE_MAX_FILES,
+        description="IDs of files in archive's order (repeated ones are skipped)",
+    )
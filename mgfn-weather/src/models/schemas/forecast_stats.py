@@ -0,0 +1,56 @@
+"""Pydantic schemas for forecasts' statistics."""
+
+import datetime
+from enum import StrEnum
+
+from fastapi import Query
+from pydantic import Field, computed_field
+
+from src.models.schemas.common import (
+    CustomBaseModel,
+    PaginatedList,
+    PaginatedListQueryParams,
+)
+
+
+class ForecastStatsOrdering(StrEnum):
+    """Possible orderings for forecasts' daily statistics."""
+
+    DAY_ASC = "day"
+    DAY_DESC = "-day"
+    LOCATION_ASC = "location"
+    LOCATION_DESC = "-location"
+
+
+class ForecastDailyStatsSchema(CustomBaseModel):
+    """Forecast requests' statistics for the location per day."""
+
+    location: str
+    day: datetime.date
+    requests_count: int
+    failed_count: int
+
+    @computed_field
+    @property
+    def failure_rate(self) -> float:
+        """Share of failed requests (without report's file)."""
+        return round(self.failed_count / self.requests_count, 4)
+
+
+class PaginatedForecastDailyStatsList(PaginatedList):
+    """Forecasts' daily statistics paginated list output"""
+
+    content: list[ForecastDailyStatsSchema]
+
+
+class ForecastStatsQueryParams(PaginatedListQueryParams):
+    """Query params for reading forecasts' daily statistics"""
+
+    ordering: ForecastStatsOrdering = Field(Query(ForecastStatsOrdering.DAY_DESC))
+    search: str | None = Field(Query(None, description="Search by `location` field"))
+    day_from: datetime.date | None = Field(
+        Query(None, description="First day of the period (UTC), inclusive")
+    )
+    day_to: datetime.date | None = Field(
+        Query(None, description="Last day of the period (UTC), inclusive")
+    )
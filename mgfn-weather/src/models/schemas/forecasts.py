@@ -1,14 +1,17 @@
 """Pydantic schemas for data related to weather forecasts."""
 
 import datetime
+import typing as t
 import uuid
 from enum import StrEnum
 
 from fastapi import Query
-from pydantic import Field, computed_field
+from pydantic import AfterValidator, Field, computed_field
 
 from src.models.schemas.common import (
     CustomBaseModel,
+    FileFormatEnum,
+    ListQueryParams,
     PaginatedListQueryParams,
     PaginatedList,
 )
@@ -18,7 +21,23 @@ from src.models.schemas.geo.coordinates import (
     LatitudeType,
     LongitudeType,
 )
-from src.models.schemas.weather_providers import DailyForecast
+from src.models.schemas.weather_providers import (
+    FORECAST_MAX_DAYS,
+    DailyForecast,
+    ForecastDayPartEnum,
+)
+
+
+def _set_default_timezone(value: datetime.datetime) -> datetime.datetime:
+    """Sets UTC timezone to naive datetime."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.UTC)
+    return value
+
+
+UTCDefaultDatetime = t.Annotated[
+    datetime.datetime, AfterValidator(_set_default_timezone)
+]
 
 
 class ForecastRequestStatusEnum(StrEnum):
@@ -46,11 +65,53 @@ class ForecastRequestStatusSchema(CustomBaseModel):
         return ForecastRequestStatusEnum.ru_names()[self.code]
 
 
+_day_part_pattern = "|".join(ForecastDayPartEnum)
+
+
 class GenerateForecastParams(CustomBaseModel):
     """Params for generating a new weather forecast."""
 
     lattitude: LatitudeType
     longitude: LongitudeType
+    days: int | None = Field(
+        None,
+        ge=1,
+        le=FORECAST_MAX_DAYS,
+        description="Number of forecast's days, including the current day "
+        "(`WEATHER_PROVIDER_FORECAST_DAYS` by default)",
+    )
+    day_parts: list[ForecastDayPartEnum] | None = Field(
+        None, min_length=1, description="Day parts to show in report (all by default)"
+    )
+
+
+class ForecastHorizonQueryParams(CustomBaseModel):
+    """Query params for selecting forecast's days and day parts"""
+
+    days: int | None = Field(
+        Query(
+            None,
+            ge=1,
+            le=FORECAST_MAX_DAYS,
+            description="Number of forecast's days, including the current day "
+            "(`WEATHER_PROVIDER_FORECAST_DAYS` by default)",
+        )
+    )
+    day_parts: str | None = Field(
+        Query(
+            None,
+            pattern=rf"^({_day_part_pattern})(,({_day_part_pattern}))*$",
+            description="Comma separated day parts to show in report (all by default), "
+            f"for example: `morning,day`. Possible day parts: {', '.join(ForecastDayPartEnum)}",
+        )
+    )
+
+    @property
+    def selected_day_parts(self) -> list[ForecastDayPartEnum] | None:
+        """Requested day parts or `None` if all day parts are required."""
+        if not self.day_parts:
+            return
+        return [ForecastDayPartEnum(part) for part in self.day_parts.split(",")]
 
 
 class ForecastRecordCreate(CustomBaseModel):
@@ -60,6 +121,9 @@ class ForecastRecordCreate(CustomBaseModel):
     lattitude: LatitudeType
     longitude: LongitudeType
     file_id: uuid.UUID | None = Field(None)
+    data: dict[str, t.Any] | None = Field(
+        None, description="Parsed forecast data to re-render reports from"
+    )
 
 
 class ForecastRecordSchema(CustomBaseModel):
@@ -82,6 +146,36 @@ class ForecastRecordSchema(CustomBaseModel):
         return ForecastRequestStatusSchema(code=status)
 
 
+class ForecastArchivedRecordSchema(ForecastRecordSchema):
+    """Schema for storing forecast record in archive's batch."""
+
+    data: dict[str, t.Any] | None = Field(
+        None, description="Parsed forecast data, stored with the record."
+    )
+
+
+class NearbyForecastRecordSchema(ForecastRecordSchema):
+    """Schema for showing forecast record, found near the point."""
+
+    distance_km: float = Field(description="Distance from the point in kilometers.")
+
+
+class NearbyForecastRecordsQueryParams(CustomBaseModel):
+    """Query params for searching forecast records near the point"""
+
+    lattitude: float = Field(Query(..., ge=-90, le=90))
+    longitude: float = Field(Query(..., ge=-180, le=180))
+    radius_km: float = Field(
+        Query(10, gt=0, le=500, description="Search radius in kilometers")
+    )
+    created_from: UTCDefaultDatetime | None = Field(
+        Query(
+            None, description="Records created since this time (UTC if not specified)"
+        )
+    )
+    limit: int = Field(Query(20, ge=1, le=100, description="Max number of records"))
+
+
 generate_forecast_responses = {
     201: {
         "description": "Success",
@@ -108,19 +202,112 @@ class ForecastRecordOrdering(StrEnum):
     CREATED_AT_DESC = "-created_at"
 
 
+class ForecastRecordField(StrEnum):
+    """Forecast record's fields (see `ForecastRecordSchema`), that can be requested separately."""
+
+    ID = "id"
+    LOCATION = "location"
+    LATTITUDE = "lattitude"
+    LONGITUDE = "longitude"
+    CREATED_AT = "created_at"
+    FILE = "file"
+    STATUS = "status"
+
+
+_record_field_pattern = "|".join(ForecastRecordField)
+
+
 class PaginatedForecastRecordsList(PaginatedList):
     """Forecast records' paginated list output"""
 
     content: list[ForecastRecordSchema]
 
 
-class ForecastRecordListQueryParams(PaginatedListQueryParams):
-    """Query params for reading forecast records"""
+class ForecastRecordsExportFormat(StrEnum):
+    """Possible formats of forecast records' export."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def media_types(cls) -> dict["ForecastRecordsExportFormat", str]:
+        return {
+            cls.CSV: "text/csv; charset=utf-8",
+            cls.NDJSON: "application/x-ndjson",
+        }
+
+
+class ForecastRecordQueryParams(ListQueryParams):
+    """Query params for querying forecast records (ordering, search, filters, fields)"""
 
     ordering: ForecastRecordOrdering = Field(
         Query(ForecastRecordOrdering.CREATED_AT_DESC)
     )
     search: str | None = Field(Query(None, description="Search by `location` field"))
+    fields: str | None = Field(
+        Query(
+            None,
+            pattern=rf"^({_record_field_pattern})(,({_record_field_pattern}))*$",
+            description="Comma separated record's fields to return (all by default), "
+            f"for example: `id,location,created_at`. Possible fields: {', '.join(ForecastRecordField)}",
+        )
+    )
+    created_from: UTCDefaultDatetime | None = Field(
+        Query(
+            None, description="Records created since this time (UTC if not specified)"
+        )
+    )
+    created_to: UTCDefaultDatetime | None = Field(
+        Query(
+            None, description="Records created before this time (UTC if not specified)"
+        )
+    )
+    status: ForecastRequestStatusEnum | None = Field(
+        Query(None, description="Records with the status")
+    )
+    min_lattitude: float | None = Field(
+        Query(None, ge=-90, le=90, description="Bounding box's south border")
+    )
+    max_lattitude: float | None = Field(
+        Query(None, ge=-90, le=90, description="Bounding box's north border")
+    )
+    min_longitude: float | None = Field(
+        Query(None, ge=-180, le=180, description="Bounding box's west border")
+    )
+    max_longitude: float | None = Field(
+        Query(None, ge=-180, le=180, description="Bounding box's east border")
+    )
+
+    @property
+    def selected_fields(self) -> list[ForecastRecordField] | None:
+        """Requested record's fields without duplicates or `None` if all fields are required."""
+        if not self.fields:
+            return
+        return list(
+            dict.fromkeys(ForecastRecordField(f) for f in self.fields.split(","))
+        )
+
+
+class ForecastRecordListQueryParams(
+    ForecastRecordQueryParams, PaginatedListQueryParams
+):
+    """Query params for reading forecast records"""
+
+    include_archived: bool = Field(
+        Query(
+            False,
+            description="Include archived records. Specify `created_from` and `created_to` "
+            "to read only the period's archive",
+        )
+    )
+
+
+class ForecastRecordExportQueryParams(ForecastRecordQueryParams):
+    """Query params for exporting forecast records"""
+
+    format: ForecastRecordsExportFormat = Field(
+        Query(ForecastRecordsExportFormat.CSV, description="Export file's format")
+    )
 
 
 class ForecastReportSchema(CustomBaseModel):
@@ -130,8 +317,54 @@ class ForecastReportSchema(CustomBaseModel):
     coordinates: GeoCorrdinates
     dt: datetime.datetime
     forecasts: list[DailyForecast]
+    day_parts: list[ForecastDayPartEnum] = Field(
+        default_factory=lambda: list(ForecastDayPartEnum),
+        description="Day parts to show in report",
+    )
 
     @computed_field
     @property
     def dt_view(self) -> str:
         return self.get_datetime_view(self.dt)
+
+
+class ForecastReportQueryParams(ForecastHorizonQueryParams):
+    """Query params for re-rendering forecast record's report"""
+
+    format: FileFormatEnum = Field(
+        Query(FileFormatEnum.XLSX, description="Report file's format")
+    )
+
+
+class ForecastHistoryQueryParams(PaginatedListQueryParams):
+    """Query params for reading forecasts' history for the location and the date"""
+
+    ordering: ForecastRecordOrdering = Field(
+        Query(ForecastRecordOrdering.CREATED_AT_DESC)
+    )
+    search: str = Field(Query(..., description="Search by `location` field"))
+    date: datetime.date = Field(Query(..., description="Forecasted date"))
+    include_archived: bool = Field(
+        Query(
+            False,
+            description="Include archived records, created within "
+            f"{FORECAST_MAX_DAYS} days before the date.",
+        )
+    )
+
+
+class ForecastHistoryRecordSchema(CustomBaseModel):
+    """Schema for showing the date's forecast, stored with forecast record."""
+
+    id: uuid.UUID = Field(description="Forecast record's ID")
+    location: str
+    lattitude: float
+    longitude: float
+    created_at: datetime.datetime
+    forecast: DailyForecast
+
+
+class PaginatedForecastHistoryList(PaginatedList):
+    """Forecasts' history paginated list output"""
+
+    content: list[ForecastHistoryRecordSchema]
@@ -3,11 +3,33 @@
 import datetime
 from enum import StrEnum
 
-from pydantic import Field, computed_field
+from pydantic import Field, computed_field, field_validator
 
 from src.models.schemas.common import CustomBaseModel, weekdays_ru_aliases
 
 
+# max number of days in forecast, provided by weather provider
+FORECAST_MAX_DAYS = 11
+
+
+class ForecastDayPartEnum(StrEnum):
+    """Forecast's day parts (see `ForecastDayParts`), that can be selected for reports."""
+
+    night = "night"
+    morning = "morning"
+    day = "day"
+    evening = "evening"
+
+    @classmethod
+    def ru_names(cls) -> dict["ForecastDayPartEnum", str]:
+        return {
+            cls.night: "ночь",
+            cls.morning: "утро",
+            cls.day: "день",
+            cls.evening: "вечер",
+        }
+
+
 class WeatherConditionEnum(StrEnum):
     """Possible weather conditions."""
 
@@ -114,6 +136,14 @@ class DailyForecast(CustomBaseModel):
     date: datetime.date
     parts: ForecastDayParts
 
+    @field_validator("parts", mode="before")
+    @classmethod
+    def parse_parts(cls, value):
+        """Yandex sends day parts as list sometimes."""
+        if isinstance(value, list):
+            return {part["part_name"]: part for part in value}
+        return value
+
     @computed_field
     @property
     def date_view(self) -> str:
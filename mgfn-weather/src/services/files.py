@@ -1,17 +1,38 @@
 """Business logic for files and operations with them."""
 
-import io
+import asyncio
+import datetime
+import hashlib
 import typing as t
+import zipfile
+from collections import deque
+from pathlib import PurePosixPath
 from uuid import UUID
 
 from fastapi import status, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam
 
+from src.core.config import FilesDownloadMode, settings
+from src.db.file_storages.cache import LRUCache
 from src.db.file_storages.repositories import AbstractFileStorageRepository
 from src.db.storages.abstract_repository import AbstractRepository
+from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
 from src.models.db_entities.files import File
-from src.models.schemas.api_responses import get_file_response
-from src.models.schemas.files import FileCreate
+from src.models.schemas.api_responses import (
+    get_archive_stream_response,
+    get_content_disposition,
+    get_file_not_modified_response,
+    get_file_redirect_response,
+    get_file_stream_response,
+    get_file_x_accel_response,
+    get_local_file_response,
+)
+from src.models.schemas.files import FileCreate, FilesArchiveParams
 from src.services import BaseService
+from src.utils.http_caching import etag_matches
+from src.utils.http_ranges import RangeNotSatisfiableError, parse_byte_range
+from src.utils.zip_streams import stream_zip
 
 
 class FileService(BaseService[File]):
@@ -20,10 +41,14 @@ class FileService(BaseService[File]):
     not_found_msg = "Файл не найден"
 
     def __init__(
-        self, repo: AbstractRepository, fs_repo: AbstractFileStorageRepository
+        self,
+        repo: AbstractRepository,
+        fs_repo: AbstractFileStorageRepository,
+        metadata_cache: LRUCache[UUID, File] | None = None,
     ):
         self.repo = repo
         self.fs_repo = fs_repo
+        self.metadata_cache = metadata_cache
 
     def _validate_format(
         self, filename: str, available_formats: list[str]
@@ -36,6 +61,89 @@ class FileService(BaseService[File]):
                 f"Допустимые форматы файла: {', '.join(available_formats)}",
             )
 
+    async def api_download_archive(
+        self, params: FilesArchiveParams
+    ) -> StreamingResponse | t.NoReturn:
+        """Handles downloading files as ZIP archive API:
+        `POST: /api/weather/files/archive`
+        The archive is built on the fly and streamed, entries are stored without compression
+        (reports are compressed already). Memory is bounded by the prefetch window
+        (see `_iter_archive_entries`) whatever the archive's size.
+        Raises 404, if any of the files isn't found.
+        """
+        file_ids = list(dict.fromkeys(params.file_ids))
+        essentials = SQLAlchemyQueryEssentials(
+            custom_filters=[File.id.in_(bindparam("file_ids", expanding=True))],
+            params={"file_ids": file_ids},
+            cache_key=("archive",),
+        )
+        files_by_id = {file.id: file for file in await self.repo.get_list(essentials)}
+        missing_ids = [
+            str(file_id) for file_id in file_ids if file_id not in files_by_id
+        ]
+        if missing_ids:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND,
+                f"Файлы не найдены: {', '.join(missing_ids)}",
+            )
+        files = [files_by_id[file_id] for file_id in file_ids]
+        return get_archive_stream_response(
+            stream_zip(self._iter_archive_entries(files)), "files.zip"
+        )
+
+    async def _iter_archive_entries(
+        self, files: list[File]
+    ) -> t.AsyncIterator[tuple[zipfile.ZipInfo, t.AsyncIterator[bytes]]]:
+        """
+        Yields archive's entries: files' infos and their content's chunks.
+        Next `FILES_ARCHIVE_PREFETCH_FILES` files are read from storage concurrently
+        with writing the current one. Files larger than `FILES_ARCHIVE_PREFETCH_MAX_FILE_BYTES`
+        aren't prefetched, they are streamed in turn.
+        """
+        prefetched: deque[asyncio.Task[bytes] | None] = deque()
+        names: set[str] = set()
+        try:
+            for index, file in enumerate(files):
+                for next_file in files[
+                    index + len(prefetched) : index
+                    + settings.FILES_ARCHIVE_PREFETCH_FILES
+                ]:
+                    prefetched.append(
+                        asyncio.create_task(self.fs_repo.get(next_file.id))
+                        if next_file.size
+                        <= settings.FILES_ARCHIVE_PREFETCH_MAX_FILE_BYTES
+                        else None
+                    )
+                task = prefetched.popleft()
+                if task is None:
+                    chunks = await self.fs_repo.stream(file.id)
+                else:
+                    chunks = self._iter_content(await task)
+                yield self._get_zip_info(file, names), chunks
+        finally:
+            tasks = [task for task in prefetched if task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _iter_content(content: bytes) -> t.AsyncIterator[bytes]:
+        yield content
+
+    @staticmethod
+    def _get_zip_info(file: File, names: set[str]) -> zipfile.ZipInfo:
+        """Returns archive entry's info for the file, making it's name unique in `names`."""
+        path = PurePosixPath(file.name.replace("/", "_"))
+        name = path.name
+        copy_number = 1
+        while name in names:
+            copy_number += 1
+            name = f"{path.stem} ({copy_number}){path.suffix}"
+        names.add(name)
+        info = zipfile.ZipInfo(name, file.created_at.timetuple()[:6])
+        info.file_size = file.size
+        return info
+
     async def add_to_system(
         self,
         file: bytes,
@@ -45,15 +153,16 @@ class FileService(BaseService[File]):
         """Validates file and adds it to system:
         - Validates file's format if you pass formats to validate as `available_formats` attribute value;
         - Adds file to system  - creates new db File instance and uploads it to file storage.
+        File's ETag (SHA-256 of it's content) is stored with the instance.
         Returns file's DB instance. Doesn't commit db transaction!
         """
-        file_io_obj = io.BytesIO(file)
         if not file_params.size:
-            file_params.size = file_io_obj.getbuffer().nbytes
+            file_params.size = len(file)
+        file_params.etag = hashlib.sha256(file).hexdigest()
         if available_formats:
             self._validate_format(file_params.name, available_formats)
         new_file: File = await self.repo.create(**file_params.model_dump())
-        await self.fs_repo.upload(file_io_obj, new_file.id)
+        await self.fs_repo.upload(file, new_file.id)
         return new_file
 
     async def drop_from_system(self, file_id: UUID):
@@ -64,12 +173,81 @@ class FileService(BaseService[File]):
         """
         await self.repo.delete(file_id)
         await self.fs_repo.delete(file_id)
+        if self.metadata_cache is not None:
+            self.metadata_cache.pop(file_id)
+
+    async def _get_file_or_404(self, file_id: UUID) -> File | t.NoReturn:
+        """Returns file's DB instance from `metadata_cache` or DB. Raises 404, if it's not found."""
+        if self.metadata_cache is None:
+            return await self.get_or_404(file_id)
+        file = self.metadata_cache.get(file_id)
+        if file is None:
+            file = await self.get_or_404(file_id)
+            self.metadata_cache.put(file_id, file)
+        return file
 
-    async def api_download_file(self, file_id: UUID) -> Response | t.NoReturn:
+    async def api_download_file(
+        self,
+        file_id: UUID,
+        range_header: str | None = None,
+        if_none_match: str | None = None,
+    ) -> Response | t.NoReturn:
         """Handles downloading file API:
         `GET: /api/weather/files/{id}/download`
+        Depending on `FILES_DOWNLOAD_MODE`, file's bytes are either streamed by the app
+        or served by file storage (redirect to presigned URL) or nginx (`X-Accel-Redirect`),
+        so the app only looks the file up in DB. Storages without presigned URLs
+        (local directory) fall back to streaming.
+        Files are immutable: they are served with ETag, and client's cached copy
+        (`If-None-Match`) is confirmed by `304 Not Modified` without requesting storage.
+        Files' DB records are cached by `metadata_cache`, if it's passed.
+        """
+        file = await self._get_file_or_404(file_id)
+        if etag_matches(if_none_match, file.etag):
+            return get_file_not_modified_response(file.etag)
+        match settings.FILES_DOWNLOAD_MODE:
+            case FilesDownloadMode.PRESIGNED:
+                url = await self.fs_repo.get_download_url(
+                    file_id,
+                    get_content_disposition(file.name),
+                    datetime.timedelta(
+                        seconds=settings.FILES_PRESIGNED_URL_EXPIRES_SECONDS
+                    ),
+                )
+                if url is not None:
+                    return get_file_redirect_response(url)
+            case FilesDownloadMode.X_ACCEL:
+                path = settings.FILES_X_ACCEL_LOCATION + self.fs_repo.get_path(file_id)
+                return get_file_x_accel_response(path, file.name, file.etag)
+        return await self._stream_file(file, range_header)
+
+    async def _stream_file(
+        self, file: File, range_header: str | None = None
+    ) -> Response | t.NoReturn:
+        """
+        Streams the file from file storage by chunks, without buffering it in memory.
+        Single byte range (`Range` header) is requested from storage
+        and returned as `206 Partial Content`, so downloads can be resumed.
+        Whole file's local copy (local storage, disk cache) is served by `FileResponse`
+        (`sendfile`, where the server supports it), ranges are read by the repository.
         """
-        file = await self.get_or_404(file_id)
-        file_bytes = await self.fs_repo.get(file_id)
-        file_name = file.name
-        return get_file_response(file_bytes, file_name)
+        if range_header is None:
+            path = await self.fs_repo.get_local_path(file.id)
+            if path is not None:
+                return get_local_file_response(path, file.name, file.etag)
+        try:
+            byte_range = parse_byte_range(range_header, file.size)
+        except RangeNotSatisfiableError:
+            raise HTTPException(
+                status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                "Запрошенный диапазон выходит за пределы файла",
+                headers={"Content-Range": f"bytes */{file.size}"},
+            )
+        if byte_range:
+            first, last = byte_range
+            chunks = await self.fs_repo.stream(file.id, first, last - first + 1)
+        else:
+            chunks = await self.fs_repo.stream(file.id)
+        return get_file_stream_response(
+            chunks, file.name, file.size, byte_range, file.etag
+        )
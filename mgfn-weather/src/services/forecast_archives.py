@@ -0,0 +1,282 @@
+"""Forecasts' archive business logic services."""
+
+import asyncio
+import datetime
+import functools
+import gzip
+import heapq
+import itertools
+import json
+import operator
+import typing as t
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam
+
+from src.core.config import settings
+from src.db.file_storages.repositories import AbstractFileStorageRepository
+from src.db.storages.abstract_repository import AbstractRepository
+from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
+from src.models.db_entities.forecast_archives import ForecastArchive
+from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import normalize_location_name
+from src.models.schemas.forecasts import (
+    ForecastArchivedRecordSchema,
+    ForecastHistoryQueryParams,
+    ForecastRecordQueryParams,
+)
+from src.models.schemas.weather_providers import FORECAST_MAX_DAYS
+from src.services import BaseService
+
+
+class ForecastArchiveService(BaseService[ForecastArchive]):
+    """
+    Interface for moving old forecast records to archive and reading them back.
+    Archive consists of batches: gzipped NDJSON files in file storage
+    (records in `ForecastArchivedRecordSchema` format, with parsed forecast data),
+    described by `ForecastArchive` manifests.
+    """
+
+    not_found_msg = "Архив прогнозов не найден"
+    # (query param, record's field, check), records not passing the check are filtered out
+    records_range_filters = (
+        ("created_from", "created_at", operator.ge),
+        ("created_to", "created_at", operator.lt),
+        ("min_lattitude", "lattitude", operator.ge),
+        ("max_lattitude", "lattitude", operator.le),
+        ("min_longitude", "longitude", operator.ge),
+        ("max_longitude", "longitude", operator.le),
+    )
+
+    def __init__(
+        self,
+        repo: AbstractRepository,
+        forecast_repo: AbstractRepository,
+        fs_repo: AbstractFileStorageRepository,
+    ):
+        self.repo = repo
+        self.forecast_repo = forecast_repo
+        self.fs_repo = fs_repo
+
+    async def archive_batch(
+        self, created_before: datetime.datetime, batch_size: int
+    ) -> int:
+        """
+        Moves up to `batch_size` oldest forecast records, created before `created_before`,
+        to a new archive batch, returns the number of archived records.
+        Batch's records are locked, so concurrent runs archive different batches.
+        Batch's file is uploaded first, then it's manifest is saved and records are deleted
+        in one transaction, so records are never lost (a failed transaction leaves
+        only an orphan file in storage).
+        """
+        forecasts: list[Forecast] = await self.forecast_repo.get_archive_batch(
+            created_before, batch_size
+        )
+        if not forecasts:
+            return 0
+        content = gzip.compress(
+            b"".join(
+                ForecastArchivedRecordSchema.model_validate(forecast)
+                .model_dump_json()
+                .encode()
+                + b"\n"
+                for forecast in forecasts
+            )
+        )
+        archive_id = uuid.uuid4()
+        await self.fs_repo.upload(content, archive_id)
+        await self.repo.create(
+            id=archive_id,
+            created_from=forecasts[0].created_at,
+            created_to=forecasts[-1].created_at,
+            records_count=len(forecasts),
+            size=len(content),
+        )
+        deleted_count = await self.forecast_repo.delete_archived(
+            [forecast.id for forecast in forecasts]
+        )
+        if deleted_count != len(forecasts):
+            # records have been changed concurrently: the batch must not be saved twice
+            await self.repo.rollback()
+            await self.fs_repo.delete(archive_id)
+            raise HTTPException(
+                status.HTTP_409_CONFLICT,
+                "Записи архивируемой партии изменились, повторите архивирование.",
+            )
+        await self.repo.save()
+        return len(forecasts)
+
+    async def get_records(
+        self,
+        query_params: ForecastRecordQueryParams,
+        sort_key: t.Callable[[dict[str, t.Any]], t.Any],
+        limit: int,
+    ) -> tuple[list[dict[str, t.Any]], int] | t.NoReturn:
+        """
+        Returns the first `limit` archived records by `sort_key` (`ForecastRecordSchema`
+        in JSON mode), matching query params' filters and search, and the number
+        of all matching ones, from batches, overlapping the requested creation period.
+        Raises 400, if there are more than `FORECASTS_ARCHIVE_MAX_READ_BATCHES` such batches.
+        """
+        archives = await self._get_batches(
+            query_params.created_from, query_params.created_to
+        )
+        return await self._read_top(
+            archives,
+            functools.partial(self._read_batch, query_params=query_params),
+            sort_key,
+            limit,
+        )
+
+    async def get_history_records(
+        self,
+        query_params: ForecastHistoryQueryParams,
+        sort_key: t.Callable[[dict[str, t.Any]], t.Any],
+        limit: int,
+    ) -> tuple[list[dict[str, t.Any]], int] | t.NoReturn:
+        """
+        Returns the date's forecasts of the first `limit` archived records by `sort_key`
+        (`ForecastHistoryRecordSchema` in JSON mode), matching the search, and the number
+        of all matching ones. Only batches, created within `FORECAST_MAX_DAYS` days
+        before the date, can contain it's forecasts (with a day's margin for providers'
+        time zones).
+        Raises 400, if there are more than `FORECASTS_ARCHIVE_MAX_READ_BATCHES` such batches.
+        """
+        date = datetime.datetime.combine(
+            query_params.date, datetime.time(), datetime.UTC
+        )
+        archives = await self._get_batches(
+            date - datetime.timedelta(days=FORECAST_MAX_DAYS + 1),
+            date + datetime.timedelta(days=2),
+        )
+        return await self._read_top(
+            archives,
+            functools.partial(self._read_history_batch, query_params=query_params),
+            sort_key,
+            limit,
+        )
+
+    async def _get_batches(
+        self,
+        created_from: datetime.datetime | None,
+        created_to: datetime.datetime | None,
+    ) -> list[ForecastArchive] | t.NoReturn:
+        """
+        Returns manifests of batches, overlapping the creation period.
+        Raises 400, if there are more than `FORECASTS_ARCHIVE_MAX_READ_BATCHES` such batches.
+        """
+        custom_filters = []
+        params = {}
+        if created_from:
+            custom_filters.append(
+                ForecastArchive.created_to >= bindparam("created_from")
+            )
+            params["created_from"] = created_from
+        if created_to:
+            custom_filters.append(
+                ForecastArchive.created_from < bindparam("created_to")
+            )
+            params["created_to"] = created_to
+        max_batches = settings.FORECASTS_ARCHIVE_MAX_READ_BATCHES
+        essentials = SQLAlchemyQueryEssentials(
+            orderings=[ForecastArchive.created_from.asc()],
+            custom_filters=custom_filters,
+            params=params,
+            page_number=1,
+            page_size=max_batches + 1,
+            cache_key=("archives", tuple(params)),
+        )
+        archives: list[ForecastArchive] = await self.repo.get_list(essentials)
+        if len(archives) > max_batches:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                "Слишком много архивных записей за период, "
+                "сузьте его параметрами created_from и created_to.",
+            )
+        return archives
+
+    async def _read_top(
+        self,
+        archives: list[ForecastArchive],
+        read_batch: t.Callable[[bytes], list[dict[str, t.Any]]],
+        sort_key: t.Callable[[dict[str, t.Any]], t.Any],
+        limit: int,
+    ) -> tuple[list[dict[str, t.Any]], int]:
+        """
+        Reads batches' files one by one, returns the first `limit` of their records,
+        read by `read_batch`, in `sort_key` order and the number of all read records.
+        Only one batch's file and the current top are kept in memory.
+        """
+        top: list[dict[str, t.Any]] = []
+        count = 0
+        for archive in archives:
+            content = await self.fs_repo.get(archive.id)
+            records = await asyncio.to_thread(read_batch, content)
+            del content
+            count += len(records)
+            top = heapq.nsmallest(limit, itertools.chain(top, records), key=sort_key)
+        return top, count
+
+    @staticmethod
+    def _iter_batch(content: bytes, search: str | None) -> t.Iterator[dict[str, t.Any]]:
+        """Decompresses batch's file and yields it's records, matching the search."""
+        search_words = [
+            normalize_location_name(word) for word in (search or "").split()
+        ]
+        for line in gzip.decompress(content).splitlines():
+            record = json.loads(line)
+            if search_words and not any(
+                word in normalize_location_name(record["location"])
+                for word in search_words
+            ):
+                continue
+            yield record
+
+    def _read_batch(
+        self, content: bytes, query_params: ForecastRecordQueryParams
+    ) -> list[dict[str, t.Any]]:
+        """Returns batch's records without forecast data, matching query params."""
+        filters = [
+            (field, check, getattr(query_params, param))
+            for param, field, check in self.records_range_filters
+            if getattr(query_params, param) is not None
+        ]
+        records = []
+        for record in self._iter_batch(content, query_params.search):
+            record.pop("data", None)
+            values = record | {
+                "created_at": datetime.datetime.fromisoformat(record["created_at"])
+            }
+            if not all(check(values[field], value) for field, check, value in filters):
+                continue
+            if query_params.status and record["status"]["code"] != query_params.status:
+                continue
+            records.append(record)
+        return records
+
+    def _read_history_batch(
+        self, content: bytes, query_params: ForecastHistoryQueryParams
+    ) -> list[dict[str, t.Any]]:
+        """
+        Returns the date's forecasts of batch's records, matching the search.
+        Records without forecast data (failed ones) are skipped.
+        """
+        date = query_params.date.isoformat()
+        records = []
+        for record in self._iter_batch(content, query_params.search):
+            forecasts = (record.get("data") or {}).get("forecasts", [])
+            forecast = next((day for day in forecasts if day["date"] == date), None)
+            if forecast is None:
+                continue
+            records.append(
+                {
+                    "id": record["id"],
+                    "location": record["location"],
+                    "lattitude": record["lattitude"],
+                    "longitude": record["longitude"],
+                    "created_at": record["created_at"],
+                    "forecast": forecast,
+                }
+            )
+        return records
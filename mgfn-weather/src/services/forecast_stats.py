@@ -0,0 +1,91 @@
+"""Forecasts' statistics business logic services."""
+
+import typing as t
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam
+
+from src.db.storages.abstract_repository import AbstractRepository
+from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
+from src.models.db_entities.forecast_stats import ForecastDailyStats
+from src.models.db_entities.locations import Location
+from src.models.schemas.forecast_stats import (
+    ForecastStatsOrdering,
+    ForecastStatsQueryParams,
+    PaginatedForecastDailyStatsList,
+)
+from src.services import BaseService
+
+
+class ForecastStatsService(BaseService[ForecastDailyStats]):
+    """Interface for reading forecasts' statistics."""
+
+    order_expressions = {
+        ForecastStatsOrdering.DAY_ASC: [
+            ForecastDailyStats.day.asc(),
+            Location.name.asc(),
+        ],
+        ForecastStatsOrdering.DAY_DESC: [
+            ForecastDailyStats.day.desc(),
+            Location.name.asc(),
+        ],
+        ForecastStatsOrdering.LOCATION_ASC: [
+            Location.name.asc(),
+            ForecastDailyStats.day.desc(),
+        ],
+        ForecastStatsOrdering.LOCATION_DESC: [
+            Location.name.desc(),
+            ForecastDailyStats.day.desc(),
+        ],
+    }
+
+    def __init__(self, repo: AbstractRepository):
+        self.repo = repo
+
+    async def api_read_forecast_stats(
+        self,
+        query_params: ForecastStatsQueryParams,
+    ) -> PaginatedForecastDailyStatsList | t.NoReturn:
+        """
+        Handles reading forecasts' daily statistics API:
+        `GET: /api/weather/forecasts/stats`
+        Statistics are read from the rollup table, maintained by DB trigger,
+        so the query doesn't depend on the number of forecast records.
+        """
+        if (
+            query_params.day_from
+            and query_params.day_to
+            and query_params.day_from > query_params.day_to
+        ):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                "Начало периода не может быть позже его окончания.",
+            )
+        custom_filters = [ForecastDailyStats.requests_count > 0]
+        params = {}
+        if query_params.day_from:
+            custom_filters.append(ForecastDailyStats.day >= bindparam("day_from"))
+            params["day_from"] = query_params.day_from
+        if query_params.day_to:
+            custom_filters.append(ForecastDailyStats.day <= bindparam("day_to"))
+            params["day_to"] = query_params.day_to
+        essentials = SQLAlchemyQueryEssentials(
+            ordering=query_params.ordering,
+            order_expressions=self.order_expressions,
+            search=query_params.search,
+            search_attrs=[Location.search_name],
+            outer_joins=[(Location, ForecastDailyStats.location_id == Location.id)],
+            custom_filters=custom_filters,
+            params=params,
+            cache_key=("daily_stats", tuple(params)),
+            page_number=query_params.page_number,
+            page_size=query_params.page_size,
+        )
+        content, total_pages, total_items = await self.repo.get_paginated_list(
+            essentials
+        )
+        return PaginatedForecastDailyStatsList(
+            content=content,
+            total_pages=total_pages,
+            total_items=total_items,
+        )
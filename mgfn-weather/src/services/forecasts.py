@@ -1,30 +1,79 @@
 """Forecasts' business logic services."""
 
+import csv
+import datetime
+import functools
+import io
+import json
 import logging
+import math
 import typing as t
 import uuid
 
 from fastapi import Response, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Float,
+    Text,
+    and_,
+    bindparam,
+    case,
+    cast,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncResult
+from sqlalchemy.orm import joinedload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.elements import ColumnElement
 
+from src.core.config import settings
 from src.db.storages.abstract_repository import AbstractRepository
+from src.db.storages.postgres.insert_buffer import InsertBuffer
 from src.db.storages.postgres.query_models import SQLAlchemyQueryEssentials
 from src.http.communicators.geodecoders import GeoDecoderHTTPCommunicator
+from src.models.db_entities.files import File
 from src.models.db_entities.forecasts import Forecast
+from src.models.db_entities.locations import Location
 from src.models.schemas.api_responses import get_file_response
-from src.models.schemas.common import FileFormatEnum
-from src.models.schemas.files import FileCreate
+from src.models.schemas.common import FileFormatEnum, PaginatedList
+from src.models.schemas.files import FileCreate, FileSchema
 from src.models.schemas.forecasts import (
+    ForecastHistoryQueryParams,
+    ForecastHistoryRecordSchema,
+    ForecastHorizonQueryParams,
     ForecastRecordCreate,
+    ForecastReportQueryParams,
     GenerateForecastParams,
+    PaginatedForecastHistoryList,
     ForecastRecordOrdering,
     PaginatedForecastRecordsList,
     ForecastRecordListQueryParams,
+    ForecastRecordExportQueryParams,
+    ForecastRecordQueryParams,
+    ForecastRecordsExportFormat,
     ForecastReportSchema,
+    ForecastRequestStatusEnum,
+    ForecastRequestStatusSchema,
+    ForecastRecordField,
+    ForecastRecordSchema,
+    NearbyForecastRecordSchema,
+    NearbyForecastRecordsQueryParams,
 )
 from src.models.schemas.geo.coordinates import GeoCorrdinates
+from src.models.schemas.weather_providers import (
+    ForecastDayPartEnum,
+    ForecastInfoSchema,
+)
 from src.models.schemas.geo.cities import CityEnum
 from src.services import BaseService
 from src.services.files import FileService
+from src.services.forecast_archives import ForecastArchiveService
+from src.utils import geohash
 from src.utils.file_generators.forecasts import generators_by_format
 from src.utils.weather_providers import AbstractWeatherProvider
 
@@ -32,10 +81,144 @@ from src.utils.weather_providers import AbstractWeatherProvider
 logger = logging.getLogger(__name__)
 
 
+def _json_datetime(column: ColumnElement) -> ColumnElement:
+    """Renders DB datetime column the same way as pydantic does in JSON (UTC, ISO 8601)."""
+    return func.to_char(func.timezone("UTC", column), 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')
+
+
+def _json_object(**fields: ColumnElement) -> ColumnElement:
+    """Returns DB `json_build_object` expression with given keys and values."""
+    args = []
+    for key, value in fields.items():
+        args.extend((literal_column(f"'{key}'"), value))
+    return func.json_build_object(*args)
+
+
+def _status_json(code: ForecastRequestStatusEnum) -> ColumnElement:
+    """Returns DB JSON expression of constant status, equal to `ForecastRequestStatusSchema`."""
+    name = ForecastRequestStatusEnum.ru_names()[code]
+    return _json_object(
+        code=literal_column(f"'{code}'"), name=literal_column(f"'{name}'")
+    )
+
+
+def _haversine_km(
+    lattitude1: ColumnElement,
+    longitude1: ColumnElement,
+    lattitude2: ColumnElement,
+    longitude2: ColumnElement,
+) -> ColumnElement:
+    """Returns DB expression of great-circle distance between two points in kilometers."""
+    lat1, lon1, lat2, lon2 = (
+        func.radians(value)
+        for value in (lattitude1, longitude1, lattitude2, longitude2)
+    )
+    haversine = func.power(func.sin((lat2 - lat1) / 2), 2) + func.cos(lat1) * func.cos(
+        lat2
+    ) * func.power(func.sin((lon2 - lon1) / 2), 2)
+    return (
+        2 * geohash.EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(haversine)))
+    )
+
+
 class ForecastService(BaseService[Forecast]):
     """Interface for handling business opertions with forecasts."""
 
     not_found_msg = "Прогноз не найден"
+    # records of one transaction have equal `created_at`: ID is the unique tiebreaker,
+    # so pages of offset pagination never overlap or skip records
+    records_order_expressions = {
+        ForecastRecordOrdering.LOCATION_ASC: [
+            Location.name.asc(),
+            Forecast.created_at.desc(),
+            Forecast.id.desc(),
+        ],
+        ForecastRecordOrdering.LOCATION_DESC: [
+            Location.name.desc(),
+            Forecast.created_at.desc(),
+            Forecast.id.desc(),
+        ],
+        ForecastRecordOrdering.CREATED_AT_ASC: [
+            Forecast.created_at.asc(),
+            Forecast.id.asc(),
+        ],
+        ForecastRecordOrdering.CREATED_AT_DESC: [
+            Forecast.created_at.desc(),
+            Forecast.id.desc(),
+        ],
+    }
+    # orderings of records, merged with archived ones: location names are compared
+    # by code points (`COLLATE "C"`), as `records_sort_keys` sorts strings, so pages,
+    # cut by DB and by merging, agree whatever DB's default collation is
+    merged_records_order_expressions = records_order_expressions | {
+        ForecastRecordOrdering.LOCATION_ASC: [
+            Location.name.collate("C").asc(),
+            Forecast.created_at.desc(),
+            Forecast.id.desc(),
+        ],
+        ForecastRecordOrdering.LOCATION_DESC: [
+            Location.name.collate("C").desc(),
+            Forecast.created_at.desc(),
+            Forecast.id.desc(),
+        ],
+    }
+    records_range_filters = {
+        "created_from": Forecast.created_at >= bindparam("created_from"),
+        "created_to": Forecast.created_at < bindparam("created_to"),
+        "min_lattitude": Forecast.lattitude >= bindparam("min_lattitude"),
+        "max_lattitude": Forecast.lattitude <= bindparam("max_lattitude"),
+        "min_longitude": Forecast.longitude >= bindparam("min_longitude"),
+        "max_longitude": Forecast.longitude <= bindparam("max_longitude"),
+    }
+    records_status_filters = {
+        ForecastRequestStatusEnum.SUCCESS: Forecast.file_id.is_not(None),
+        ForecastRequestStatusEnum.FAILED: Forecast.file_id.is_(None),
+    }
+    nearby_distance_km = _haversine_km(
+        Forecast.lattitude,
+        Forecast.longitude,
+        bindparam("lattitude", type_=Float),
+        bindparam("longitude", type_=Float),
+    )
+    # geohash cells' prefix filters: `cell <= geohash < cell + "~"`
+    nearby_cells_filters = [
+        and_(
+            Forecast.geohash.op("~>=~")(bindparam(f"cell_{index}")),
+            Forecast.geohash.op("~<~")(bindparam(f"cell_{index}_end")),
+        )
+        for index in range(9)
+    ]
+    # the date's forecast from stored data
+    history_forecast = func.jsonb_path_query_first(
+        Forecast.data,
+        literal_column("'$.forecasts[*] ? (@.date == $date)'"),
+        func.jsonb_build_object(
+            literal_column("'date'"), bindparam("history_date", type_=Text)
+        ),
+        type_=JSONB,
+    )
+    # sorting of records' JSON objects: (field, reverse) pairs, the first one is the main,
+    # equal to `merged_records_order_expressions` (IDs' strings are ordered as DB's UUIDs)
+    records_sort_keys = {
+        ForecastRecordOrdering.LOCATION_ASC: [
+            (ForecastRecordField.LOCATION, False),
+            (ForecastRecordField.CREATED_AT, True),
+            (ForecastRecordField.ID, True),
+        ],
+        ForecastRecordOrdering.LOCATION_DESC: [
+            (ForecastRecordField.LOCATION, True),
+            (ForecastRecordField.CREATED_AT, True),
+            (ForecastRecordField.ID, True),
+        ],
+        ForecastRecordOrdering.CREATED_AT_ASC: [
+            (ForecastRecordField.CREATED_AT, False),
+            (ForecastRecordField.ID, False),
+        ],
+        ForecastRecordOrdering.CREATED_AT_DESC: [
+            (ForecastRecordField.CREATED_AT, True),
+            (ForecastRecordField.ID, True),
+        ],
+    }
 
     def __init__(
         self,
@@ -43,21 +226,31 @@ class ForecastService(BaseService[Forecast]):
         weather_provider: AbstractWeatherProvider,
         geodecoder: GeoDecoderHTTPCommunicator,
         file_service: FileService,
+        archive_service: ForecastArchiveService | None = None,
+        insert_buffer: InsertBuffer[Forecast] | None = None,
     ):
         self.repo = repo
         self.weather_provider = weather_provider
         self.geodecoder = geodecoder
         self.file_service = file_service
+        self.archive_service = archive_service
+        self.insert_buffer = insert_buffer
 
     async def generate(
         self,
         coordinates: GeoCorrdinates,
+        days: int | None = None,
+        day_parts: list[ForecastDayPartEnum] | None = None,
     ) -> Response | Forecast | t.NoReturn:
         """
         Generates a new forecast for given coordinates:
         - decodes coordinates to geo location's name;
-        - generates a file with parsed forecast data and saves it to file storage and DB;
-        - saves request params to DB as `Forecast` instance.
+        - requests forecast for `days` days (provider's default if it isn't passed);
+        - generates a file with parsed forecast data (only `day_parts`, if they're passed)
+        and saves it to file storage and DB;
+        - stores parsed forecast data with the record to re-render the report later;
+        - saves request params to DB as `Forecast` instance by a single insert,
+        through `insert_buffer` if it's passed.
         """
         location = await self.geodecoder.get_location_name(coordinates)
         if not location:
@@ -65,39 +258,75 @@ class ForecastService(BaseService[Forecast]):
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "Невозможно распознать географический объект. Повторите запрос позже.",
             )
-        forecast_rec_params = ForecastRecordCreate(
-            location=location,
-            lattitude=coordinates.lattitude,
-            longitude=coordinates.longitude,
-        )
-        forecast_rec: Forecast = await self.repo.create(
-            **forecast_rec_params.model_dump()
-        )
-        response = forecast_rec
-        forecast_info = await self.weather_provider.get_forecast(coordinates)
+        response = None
+        file_instance = None
+        forecast_data = None
+        forecast_info = await self.weather_provider.get_forecast(coordinates, days)
         if forecast_info:
+            forecast_info = self._limit_days(forecast_info, days)
             forecast_report_data = ForecastReportSchema(
                 location=location,
                 coordinates=coordinates,
                 dt=forecast_info.now_dt,
                 forecasts=forecast_info.forecasts,
+                day_parts=day_parts or list(ForecastDayPartEnum),
+            )
+            file, filename = await self._render_report(
+                forecast_report_data, FileFormatEnum.XLSX
             )
-            file_format = FileFormatEnum.XLSX
-            FileGenerator = generators_by_format[file_format]
-            with FileGenerator() as generator:
-                file = await generator.generate(forecast_report_data)
-
-            filename_ending = FileFormatEnum.filename_endings()[file_format]
-            filename = f"Прогноз_{forecast_report_data.location}_{forecast_report_data.dt_view}{filename_ending}"
-
             file_instance = await self.file_service.add_to_system(
                 file, FileCreate(name=filename)
             )
-            forecast_rec.file_id = file_instance.id
-
             response = get_file_response(file, filename, status.HTTP_201_CREATED)
-        await self.repo.save()
-        return response
+            forecast_data = forecast_info.model_dump(
+                mode="json", by_alias=True, exclude_computed_fields=True
+            )
+        forecast_rec_params = ForecastRecordCreate(
+            location=location,
+            lattitude=coordinates.lattitude,
+            longitude=coordinates.longitude,
+            file_id=file_instance.id if file_instance else None,
+            data=forecast_data,
+        )
+        if self.insert_buffer is None:
+            forecast_rec: Forecast = await self.repo.create(
+                **forecast_rec_params.model_dump()
+            )
+            await self.repo.save()
+        else:
+            if file_instance:
+                # the record is inserted in the buffer's transaction, it must see the file
+                await self.repo.save()
+            forecast_rec = await self.insert_buffer.insert(
+                **forecast_rec_params.model_dump()
+            )
+        set_committed_value(forecast_rec, "file", file_instance)
+        return response or forecast_rec
+
+    @staticmethod
+    def _limit_days(
+        forecast_info: ForecastInfoSchema, days: int | None
+    ) -> ForecastInfoSchema:
+        """Returns forecast info with the first `days` days only (all if `days` isn't passed)."""
+        if not days or len(forecast_info.forecasts) <= days:
+            return forecast_info
+        return forecast_info.model_copy(
+            update={"forecasts": forecast_info.forecasts[:days]}
+        )
+
+    @staticmethod
+    async def _render_report(
+        report_data: ForecastReportSchema, file_format: FileFormatEnum
+    ) -> tuple[bytes, str]:
+        """Generates forecast report's file of given format, returns it with file's name."""
+        FileGenerator = generators_by_format[file_format]
+        with FileGenerator() as generator:
+            file = await generator.generate(report_data)
+        filename_ending = FileFormatEnum.filename_endings()[file_format]
+        filename = (
+            f"Прогноз_{report_data.location}_{report_data.dt_view}{filename_ending}"
+        )
+        return file, filename
 
     async def api_generate_forecast(
         self,
@@ -108,50 +337,255 @@ class ForecastService(BaseService[Forecast]):
         `POST: /api/weather/forecasts`
         """
         coordinates = GeoCorrdinates.model_validate(params)
-        return await self.generate(coordinates)
+        return await self.generate(coordinates, params.days, params.day_parts)
 
     async def api_generate_forecast_by_city(
         self,
         city: CityEnum,
+        query_params: ForecastHorizonQueryParams,
     ) -> Response | Forecast | t.NoReturn:
         """
         Handles API on generating a new weather forecast by the specific city:
         `POST: /api/weather/forecasts/by-city/{city}`
         """
         coordinates = CityEnum.coordinates()[city]
-        return await self.generate(coordinates)
+        return await self.generate(
+            coordinates, query_params.days, query_params.selected_day_parts
+        )
+
+    @staticmethod
+    @functools.cache
+    def _get_record_json(fields: tuple[ForecastRecordField, ...]) -> ColumnElement:
+        """
+        Returns DB JSON expression of forecast record with given fields,
+        equal to `ForecastRecordSchema`.
+        Requires `files` table to be outer joined, if `file` field is requested.
+        """
+        values = {
+            ForecastRecordField.ID: Forecast.id,
+            ForecastRecordField.LOCATION: Forecast.location,
+            ForecastRecordField.LATTITUDE: Forecast.lattitude,
+            ForecastRecordField.LONGITUDE: Forecast.longitude,
+            ForecastRecordField.CREATED_AT: _json_datetime(Forecast.created_at),
+            ForecastRecordField.FILE: case(
+                (File.id.is_(None), null()),
+                else_=_json_object(
+                    id=File.id,
+                    name=File.name,
+                    size=File.size,
+                    created_at=_json_datetime(File.created_at),
+                ),
+            ),
+            ForecastRecordField.STATUS: case(
+                (
+                    Forecast.file_id.is_(None),
+                    _status_json(ForecastRequestStatusEnum.FAILED),
+                ),
+                else_=_status_json(ForecastRequestStatusEnum.SUCCESS),
+            ),
+        }
+        return _json_object(**{field: values[field] for field in fields})
+
+    @staticmethod
+    @functools.cache
+    def _get_record_columns(
+        fields: tuple[ForecastRecordField, ...],
+    ) -> list[ColumnElement]:
+        """
+        Returns list query's columns for forecast record's given fields.
+        Requires `files` table to be outer joined, if `file` field is requested.
+        """
+        columns = {
+            ForecastRecordField.ID: [Forecast.id.label("id")],
+            ForecastRecordField.LOCATION: [Forecast.location.label("location")],
+            ForecastRecordField.LATTITUDE: [Forecast.lattitude.label("lattitude")],
+            ForecastRecordField.LONGITUDE: [Forecast.longitude.label("longitude")],
+            ForecastRecordField.CREATED_AT: [Forecast.created_at.label("created_at")],
+            ForecastRecordField.FILE: [
+                File.id.label("file_id"),
+                File.name.label("file_name"),
+                File.size.label("file_size"),
+                File.created_at.label("file_created_at"),
+            ],
+            ForecastRecordField.STATUS: [Forecast.file_id.label("status_file_id")],
+        }
+        return [column for field in fields for column in columns[field]]
+
+    @staticmethod
+    @functools.cache
+    def _get_record_csv_columns(
+        fields: tuple[ForecastRecordField, ...],
+    ) -> list[ColumnElement]:
+        """
+        Returns export query's columns for forecast record's given fields,
+        file's fields are flattened, status is rendered to it's code.
+        Requires `files` table to be outer joined, if `file` field is requested.
+        """
+        columns = []
+        for field in fields:
+            if field == ForecastRecordField.STATUS:
+                columns.append(
+                    case(
+                        (
+                            Forecast.file_id.is_(None),
+                            literal(ForecastRequestStatusEnum.FAILED.value),
+                        ),
+                        else_=literal(ForecastRequestStatusEnum.SUCCESS.value),
+                    ).label("status")
+                )
+            else:
+                columns.extend(ForecastService._get_record_columns((field,)))
+        return columns
+
+    @staticmethod
+    async def _render_csv(result: AsyncResult) -> t.AsyncIterator[bytes]:
+        """Renders exported rows to CSV with header, by batches."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(result.keys())
+        try:
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        finally:
+            await result.close()
+
+    @staticmethod
+    async def _render_ndjson(result: AsyncResult) -> t.AsyncIterator[bytes]:
+        """Joins exported records, rendered to JSON by DB, to NDJSON, by batches."""
+        try:
+            async for rows in result.partitions():
+                yield "".join(f"{record}\n" for (record,) in rows).encode()
+        finally:
+            await result.close()
+
+    @staticmethod
+    def _get_partial_record(
+        row: dict[str, t.Any], fields: tuple[ForecastRecordField, ...]
+    ) -> dict[str, t.Any]:
+        """Converts the row, queried by `_get_record_columns` columns, to record's output."""
+        record = {}
+        for field in fields:
+            if field == ForecastRecordField.FILE:
+                record[field] = None
+                if row["file_id"] is not None:
+                    record[field] = FileSchema(
+                        id=row["file_id"],
+                        name=row["file_name"],
+                        size=row["file_size"],
+                        created_at=row["file_created_at"],
+                    )
+            elif field == ForecastRecordField.STATUS:
+                code = ForecastRequestStatusEnum.FAILED
+                if row["status_file_id"] is not None:
+                    code = ForecastRequestStatusEnum.SUCCESS
+                record[field] = ForecastRequestStatusSchema(code=code)
+            else:
+                record[field] = row[field]
+        return record
+
+    def _get_records_essentials(
+        self,
+        query_params: ForecastRecordQueryParams,
+        fields: tuple[ForecastRecordField, ...],
+        shape: t.Hashable,
+    ) -> SQLAlchemyQueryEssentials | t.NoReturn:
+        """
+        Returns essentials for querying forecast records with given fields
+        by query params' ordering, search and filters.
+        Records are searched and sorted by location in locations' dictionary.
+        Filters' values are bound as parameters, so the statement is cached by
+        the list's `shape`, `fields` and the set of applied filters.
+        """
+        for lower_bound, upper_bound in (
+            ("created_from", "created_to"),
+            ("min_lattitude", "max_lattitude"),
+            ("min_longitude", "max_longitude"),
+        ):
+            lower_value = getattr(query_params, lower_bound)
+            upper_value = getattr(query_params, upper_bound)
+            if None not in (lower_value, upper_value) and lower_value > upper_value:
+                raise HTTPException(
+                    status.HTTP_400_BAD_REQUEST,
+                    f"Значение {lower_bound} не может быть больше {upper_bound}.",
+                )
+        params = {
+            name: getattr(query_params, name)
+            for name in self.records_range_filters
+            if getattr(query_params, name) is not None
+        }
+        custom_filters = [self.records_range_filters[name] for name in params]
+        if query_params.status:
+            custom_filters.append(self.records_status_filters[query_params.status])
+        essentials = SQLAlchemyQueryEssentials(
+            ordering=query_params.ordering,
+            order_expressions=self.records_order_expressions,
+            search=query_params.search,
+            search_attrs=[Location.search_name],
+            custom_filters=custom_filters,
+            params=params,
+            outer_joins=[],
+            cache_key=(shape, fields, tuple(params), query_params.status),
+        )
+        if query_params.ordering in (
+            ForecastRecordOrdering.LOCATION_ASC,
+            ForecastRecordOrdering.LOCATION_DESC,
+        ):
+            essentials.outer_joins.append(
+                (Location, Forecast.location_id == Location.id)
+            )
+        if ForecastRecordField.FILE in fields:
+            essentials.outer_joins.append((File, Forecast.file_id == File.id))
+        return essentials
 
     async def api_read_forecast_records(
         self,
         query_params: ForecastRecordListQueryParams,
-    ) -> PaginatedForecastRecordsList | t.NoReturn:
+    ) -> PaginatedForecastRecordsList | Response | t.NoReturn:
         """
         Handles reading list of forecast records API:
         `GET: /api/weather/forecasts`
+        If `FORECASTS_LIST_DB_RENDERING` setting is on,
+        the list is rendered to JSON by DB and returned as is.
+        Only requested fields are queried, `files` table is joined only for `file` field.
+        Statements are cached by the list's shape (rendering mode, fields and filters).
+        Archived records are included on request (`include_archived`).
         """
-
-        content, total_pages, total_items = await self.repo.get_paginated_list(
-            SQLAlchemyQueryEssentials(
-                ordering=query_params.ordering,
-                order_expressions={
-                    ForecastRecordOrdering.LOCATION_ASC: [
-                        Forecast.location.asc(),
-                        Forecast.created_at.desc(),
-                    ],
-                    ForecastRecordOrdering.LOCATION_DESC: [
-                        Forecast.location.desc(),
-                        Forecast.created_at.desc(),
-                    ],
-                    ForecastRecordOrdering.CREATED_AT_ASC: [Forecast.created_at.asc()],
-                    ForecastRecordOrdering.CREATED_AT_DESC: [
-                        Forecast.created_at.desc()
-                    ],
-                },
-                search=query_params.search,
-                search_attrs=[Forecast.location],
-                page_number=query_params.page_number,
-                page_size=query_params.page_size,
+        if query_params.include_archived:
+            return await self._read_records_with_archived(query_params)
+        fields = tuple(query_params.selected_fields or ())
+        shape = "records_columns" if fields else "records"
+        if settings.FORECASTS_LIST_DB_RENDERING:
+            fields = fields or tuple(ForecastRecordField)
+            shape = "records_json"
+        essentials = self._get_records_essentials(query_params, fields, shape)
+        essentials.page_number = query_params.page_number
+        essentials.page_size = query_params.page_size
+        if settings.FORECASTS_LIST_DB_RENDERING:
+            payload = await self.repo.get_paginated_list_json(
+                essentials, self._get_record_json(fields)
+            )
+            return Response(payload, media_type="application/json")
+        if fields:
+            essentials.columns = self._get_record_columns(fields)
+            content, total_pages, total_items = await self.repo.get_paginated_list(
+                essentials
+            )
+            paginated_list = PaginatedList(
+                content=[self._get_partial_record(row, fields) for row in content],
+                total_pages=total_pages,
+                total_items=total_items,
             )
+            return Response(
+                paginated_list.model_dump_json(), media_type="application/json"
+            )
+        essentials.load_options = [joinedload(Forecast.file)]
+        content, total_pages, total_items = await self.repo.get_paginated_list(
+            essentials
         )
         return PaginatedForecastRecordsList(
             content=content,
@@ -159,14 +593,292 @@ class ForecastService(BaseService[Forecast]):
             total_items=total_items,
         )
 
+    async def _read_records_with_archived(
+        self,
+        query_params: ForecastRecordListQueryParams,
+    ) -> Response | t.NoReturn:
+        """
+        Returns forecast records' page from both `forecasts` table and archive:
+        the first `page_number * page_size` records, rendered to JSON by DB,
+        are merged with the first as many matching archived records, sorted the same way.
+        """
+        all_fields = tuple(ForecastRecordField)
+        essentials = self._get_records_essentials(
+            query_params, all_fields, "records_with_archived"
+        )
+        essentials.columns = [
+            cast(self._get_record_json(all_fields), Text).label("record")
+        ]
+        essentials.order_expressions = self.merged_records_order_expressions
+        essentials.page_number = 1
+        essentials.page_size = query_params.page_number * query_params.page_size
+        live_count = await self.repo.count(essentials)
+        rows = await self.repo.get_list(essentials)
+        sort_key = self._get_sort_key(query_params.ordering)
+        archived_records, archived_count = await self.archive_service.get_records(
+            query_params, sort_key, essentials.page_size
+        )
+
+        records = sorted(
+            [json.loads(row["record"]) for row in rows] + archived_records,
+            key=sort_key,
+        )
+        offset = (query_params.page_number - 1) * query_params.page_size
+        fields = query_params.selected_fields or all_fields
+        total_items = live_count + archived_count
+        paginated_list = PaginatedList(
+            content=[
+                {field: record[field] for field in fields}
+                for record in records[offset : offset + query_params.page_size]
+            ],
+            total_items=total_items,
+            total_pages=math.ceil(total_items / query_params.page_size),
+        )
+        return Response(paginated_list.model_dump_json(), media_type="application/json")
+
+    def _get_sort_key(
+        self, ordering: ForecastRecordOrdering
+    ) -> t.Callable[[dict[str, t.Any]], t.Any]:
+        """Returns key for sorting records' JSON objects, as DB orders records by `ordering`."""
+        sort_keys = self.records_sort_keys[ordering]
+
+        def get_value(record: dict[str, t.Any], field: ForecastRecordField) -> t.Any:
+            if field == ForecastRecordField.CREATED_AT:
+                return datetime.datetime.fromisoformat(record[field])
+            return record[field]
+
+        def compare(record1: dict[str, t.Any], record2: dict[str, t.Any]) -> int:
+            for field, reverse in sort_keys:
+                value1, value2 = get_value(record1, field), get_value(record2, field)
+                if value1 != value2:
+                    return (-1 if value1 < value2 else 1) * (-1 if reverse else 1)
+            return 0
+
+        return functools.cmp_to_key(compare)
+
+    async def api_export_forecast_records(
+        self,
+        query_params: ForecastRecordExportQueryParams,
+    ) -> StreamingResponse | t.NoReturn:
+        """
+        Handles forecast records' export API:
+        `GET: /api/weather/forecasts/export`
+        Records are read from DB cursor by `FORECASTS_EXPORT_BATCH_SIZE` batches and streamed
+        to client one by one, so memory usage doesn't depend on the number of records.
+        NDJSON records are rendered by DB.
+        """
+        fields = tuple(query_params.selected_fields or ForecastRecordField)
+        export_format = query_params.format
+        essentials = self._get_records_essentials(
+            query_params, fields, ("records_export", export_format)
+        )
+        if export_format == ForecastRecordsExportFormat.NDJSON:
+            essentials.columns = [
+                cast(self._get_record_json(fields), Text).label("record")
+            ]
+            render = self._render_ndjson
+        else:
+            essentials.columns = self._get_record_csv_columns(fields)
+            render = self._render_csv
+        result = await self.repo.stream_list(
+            essentials, settings.FORECASTS_EXPORT_BATCH_SIZE
+        )
+        return StreamingResponse(
+            render(result),
+            media_type=ForecastRecordsExportFormat.media_types()[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="forecasts.{export_format}"'
+            },
+        )
+
+    async def api_read_nearby_forecast_records(
+        self,
+        query_params: NearbyForecastRecordsQueryParams,
+    ) -> list[NearbyForecastRecordSchema] | t.NoReturn:
+        """
+        Handles reading forecast records near the point API:
+        `GET: /api/weather/forecasts/nearby`
+        Records are prefiltered by geohash index: the point's cell and it's neighbours,
+        covering the search circle, are scanned, then refined by haversine distance.
+        """
+        try:
+            cells = geohash.get_nearby_cells(
+                query_params.lattitude, query_params.longitude, query_params.radius_km
+            )
+        except ValueError:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST, "Слишком большой радиус поиска."
+            )
+        params = {
+            "lattitude": query_params.lattitude,
+            "longitude": query_params.longitude,
+            "radius_km": query_params.radius_km,
+        }
+        for index, cell in enumerate(cells):
+            params[f"cell_{index}"] = cell
+            params[f"cell_{index}_end"] = f"{cell}~"
+        custom_filters = [
+            or_(*self.nearby_cells_filters[: len(cells)]),
+            self.nearby_distance_km <= bindparam("radius_km", type_=Float),
+        ]
+        if query_params.created_from:
+            custom_filters.append(self.records_range_filters["created_from"])
+            params["created_from"] = query_params.created_from
+        distance_km = self.nearby_distance_km.label("distance_km")
+        essentials = SQLAlchemyQueryEssentials(
+            columns=[Forecast, distance_km],
+            orderings=[
+                distance_km.asc(),
+                Forecast.created_at.desc(),
+                Forecast.id.desc(),
+            ],
+            load_options=[joinedload(Forecast.file)],
+            custom_filters=custom_filters,
+            params=params,
+            cache_key=("nearby", len(cells), query_params.created_from is not None),
+            page_number=1,
+            page_size=query_params.limit,
+        )
+        rows = await self.repo.get_list(essentials)
+        return [
+            NearbyForecastRecordSchema(
+                **dict(ForecastRecordSchema.model_validate(row["Forecast"])),
+                distance_km=row["distance_km"],
+            )
+            for row in rows
+        ]
+
+    async def api_render_forecast_report(
+        self,
+        forecast_id: uuid.UUID,
+        query_params: ForecastReportQueryParams,
+    ) -> Response | t.NoReturn:
+        """
+        Handles forecast report's re-rendering API:
+        `GET: /api/weather/forecasts/{forecast_id}/report`
+        The report is generated from the record's stored forecast data
+        without weather provider's calls, it isn't saved to file storage.
+        Archived records aren't addressed by IDs (it would require scanning
+        archive's batches), so only live records' reports are re-rendered.
+        """
+        forecast: Forecast | None = await self.repo.get(
+            forecast_id, load_options=[undefer(Forecast.data)]
+        )
+        if not forecast:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, self.not_found_msg)
+        if forecast.data is None:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, "Данные прогноза не сохранены"
+            )
+        forecast_info = self._limit_days(
+            ForecastInfoSchema.model_validate(forecast.data), query_params.days
+        )
+        report_data = ForecastReportSchema(
+            location=forecast.location,
+            coordinates=GeoCorrdinates(
+                lattitude=forecast.lattitude, longitude=forecast.longitude
+            ),
+            dt=forecast_info.now_dt,
+            forecasts=forecast_info.forecasts,
+            day_parts=query_params.selected_day_parts or list(ForecastDayPartEnum),
+        )
+        file, filename = await self._render_report(report_data, query_params.format)
+        return get_file_response(file, filename)
+
+    async def api_read_forecast_history(
+        self,
+        query_params: ForecastHistoryQueryParams,
+    ) -> PaginatedForecastHistoryList | t.NoReturn:
+        """
+        Handles reading forecasts' history API:
+        `GET: /api/weather/forecasts/history`
+        Returns the date's forecasts, stored with the location's records.
+        Records are prefiltered by forecasted dates' GIN index (`data @> ...`),
+        then the date's forecast is extracted from stored data by DB.
+        Archived records are included on request (`include_archived`): the first
+        `page_number * page_size` live and archived records are merged, sorted the same way.
+        """
+        date = query_params.date.isoformat()
+        essentials = SQLAlchemyQueryEssentials(
+            columns=[
+                Forecast.id.label("id"),
+                Forecast.location.label("location"),
+                Forecast.lattitude.label("lattitude"),
+                Forecast.longitude.label("longitude"),
+                Forecast.created_at.label("created_at"),
+                self.history_forecast.label("forecast"),
+            ],
+            ordering=query_params.ordering,
+            order_expressions=self.records_order_expressions,
+            search=query_params.search,
+            search_attrs=[Location.search_name],
+            custom_filters=[
+                Forecast.data.contains(bindparam("history_data", type_=JSONB))
+            ],
+            params={
+                "history_data": {"forecasts": [{"date": date}]},
+                "history_date": date,
+            },
+            outer_joins=[],
+            page_number=query_params.page_number,
+            page_size=query_params.page_size,
+            cache_key="history",
+        )
+        if query_params.ordering in (
+            ForecastRecordOrdering.LOCATION_ASC,
+            ForecastRecordOrdering.LOCATION_DESC,
+        ):
+            essentials.outer_joins.append(
+                (Location, Forecast.location_id == Location.id)
+            )
+        if query_params.include_archived:
+            essentials.order_expressions = self.merged_records_order_expressions
+            essentials.cache_key = "history_with_archived"
+            essentials.page_number = 1
+            essentials.page_size = query_params.page_number * query_params.page_size
+            live_count = await self.repo.count(essentials)
+            rows = await self.repo.get_list(essentials)
+            sort_key = self._get_sort_key(query_params.ordering)
+            (
+                archived_records,
+                archived_count,
+            ) = await self.archive_service.get_history_records(
+                query_params, sort_key, essentials.page_size
+            )
+            records = sorted(
+                [
+                    ForecastHistoryRecordSchema.model_validate(row).model_dump(
+                        mode="json"
+                    )
+                    for row in rows
+                ]
+                + archived_records,
+                key=sort_key,
+            )
+            offset = (query_params.page_number - 1) * query_params.page_size
+            total_items = live_count + archived_count
+            return PaginatedForecastHistoryList(
+                content=records[offset : offset + query_params.page_size],
+                total_pages=math.ceil(total_items / query_params.page_size),
+                total_items=total_items,
+            )
+        content, total_pages, total_items = await self.repo.get_paginated_list(
+            essentials
+        )
+        return PaginatedForecastHistoryList(
+            content=content,
+            total_pages=total_pages,
+            total_items=total_items,
+        )
+
     async def api_delete_forecast_record(self, forecast_id: uuid.UUID):
         """
         Handles forecast record's deletion API:
         `DELETE: /api/weather/forecasts/{forecast_id}`
+        The record is only marked as deleted by a single UPDATE, it's report's file
+        is removed later with the record itself by the purging job (`src.jobs.purge`).
         """
-        forecast = await self.get_or_404(forecast_id)
-        file_id = forecast.file_id
-        await self.repo.delete(forecast_id)
-        if file_id:
-            await self.file_service.drop_from_system(file_id)
+        deleted_count = await self.repo.delete(forecast_id)
+        if not deleted_count:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, self.not_found_msg)
         await self.repo.save()
@@ -10,8 +10,13 @@ from sqlalchemy.ext.asyncio import (
 )
 
 import backend_pre_start
-from src.db.file_storages import minio
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    init_fs,
+    open_fs_repo,
+)
 from src.db.storages.postgres import Base
+from src.db.storages.postgres.instrumentation import instrument_engine
 from src.deps.db import get_db
 from src.deps.http import get_geodecoder_http_communicator
 from src.deps.weather_providers import get_weather_provider
@@ -35,6 +40,7 @@ async def db_engine():
     Drops all tables after tests have been finished.
     """
     engine = create_async_engine(settings.DATABASE_URL.unicode_string())
+    instrument_engine(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
@@ -43,7 +49,7 @@ async def db_engine():
 
 
 class MockWeatherProvider(AbstractWeatherProvider):
-    async def get_forecast(self, coordinates):
+    async def get_forecast(self, coordinates, days=None):
         return ForecastInfoSchema(
             now_dt=datetime.datetime.now(),
             forecasts=[
@@ -161,12 +167,7 @@ async def client(db_engine: AsyncEngine):
 
     await backend_pre_start.main()
 
-    minio.minio_client = await minio.init_minio(
-        settings.MINIO_ADDRESS,
-        settings.MINIO_ACCESS_KEY,
-        settings.MINIO_SECRET_KEY,
-        settings.MINIO_BUCKET,
-    )
+    await init_fs()
     app.dependency_overrides[get_db] = get_db_test
     app.dependency_overrides[get_weather_provider] = get_weather_provider_mock
     app.dependency_overrides[get_geodecoder_http_communicator] = (
@@ -177,3 +178,10 @@ async def client(db_engine: AsyncEngine):
         transport=ASGITransport(app), base_url="http://0.0.0.0:5000/api/weather"
     ) as client:
         yield client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def fs_repo(client: AsyncClient) -> AbstractFileStorageRepository:
+    """Fixture to get file storage repository for using outside of the app's requests."""
+    async with open_fs_repo() as fs_repo:
+        yield fs_repo
@@ -0,0 +1,33 @@
+"""Helpers for checking SQL queries, executed during tests."""
+
+import typing as t
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@contextmanager
+def assert_max_queries(
+    engine: AsyncEngine, max_queries: int
+) -> t.Generator[list[str], None, None]:
+    """
+    Asserts, that no more than `max_queries` SQL statements
+    are executed through `engine` inside the block.
+    Yields the list of executed statements.
+    Use it to catch N+1 queries and unexpected relationships' loading.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert len(statements) <= max_queries, (
+        f"{len(statements)} queries were executed, expected at most {max_queries}:\n"
+        + "\n".join(statements)
+    )
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import pytest
+
+from src.db.storages.postgres.instrumentation import request_statements
+from src.main import DBStatementsCountMiddleware
+
+
+class TestMetricsAPI:
+    @pytest.mark.asyncio(scope="session")
+    async def test_get_metrics(self, client: AsyncClient):
+        await client.get("/v1/forecasts")
+        response = await client.get("/metrics")
+        assert response.status_code == HTTPStatus.OK
+        assert (
+            'db_statement_duration_seconds_count{repository="ForecastSQLAlchemyRepository"'
+            in response.text
+        )
+        assert 'http_request_db_statements_count{path="/v1/forecasts"}' in response.text
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_count_streamed_response_statements(self, db_engine: AsyncEngine):
+        streaming_app = FastAPI()
+        streaming_app.add_middleware(DBStatementsCountMiddleware)
+
+        async def stream_rows():
+            for number in range(3):
+                async with db_engine.connect() as conn:
+                    yield f"{await conn.scalar(select(number))}\n"
+
+        @streaming_app.get("/streamed")
+        async def streamed():
+            return StreamingResponse(stream_rows())
+
+        transport = ASGITransport(app=streaming_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/streamed")
+        assert response.text == "0\n1\n2\n"
+        assert request_statements.get_count(path="/streamed") == 1
+        assert request_statements.get_sum(path="/streamed") == 3
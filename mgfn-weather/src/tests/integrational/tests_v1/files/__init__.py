@@ -0,0 +1 @@
+"""Tests for files endpoints."""
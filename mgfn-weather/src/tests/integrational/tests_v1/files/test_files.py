@@ -0,0 +1,436 @@
+import datetime
+import hashlib
+import io
+import os
+import tracemalloc
+import uuid
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.core.config import FilesDownloadMode, FilesStorageBackend, settings
+from src.db.file_storages.cache import (
+    CachedFileStorageRepository,
+    FilesCache,
+    files_cache_evictions,
+    files_cache_lookups,
+)
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    LocalFSRepository,
+)
+from src.db.storages.postgres.repositories import FileSQLAlchemyRepository
+from src.deps.db import get_fs_repo
+from src.jobs.reconcile import ReconciliationReport, reconcile_file_storage
+from src.main import app
+from src.models.db_entities.files import File
+from src.models.db_entities.forecast_archives import ForecastArchive
+from src.models.schemas.api_responses import get_file_response
+from src.models.schemas.files import FileCreate
+from src.models.schemas.geo.cities import CityEnum
+from src.services.files import FileService
+from src.tests.integrational.queries import assert_max_queries
+
+
+class TestV1FilesAPI:
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file(self, client: AsyncClient):
+        response = await client.post(
+            f"/v1/forecasts/by-city/{CityEnum.MOSCOW.value}",
+        )
+        content = response.content
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 1}
+        )
+        file = response.json()["content"][0]["file"]
+        url = f"/v1/files/{file['id']}/download"
+
+        response = await client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-length"] == str(file["size"])
+        assert response.content == content
+
+        response = await client.get(f"/v1/files/{uuid.uuid4()}/download")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file_range(self, client: AsyncClient):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 1}
+        )
+        file = response.json()["content"][0]["file"]
+        url = f"/v1/files/{file['id']}/download"
+        content = (await client.get(url)).content
+        size = len(content)
+
+        for range_header, first, last in (
+            ("bytes=10-19", 10, 19),
+            ("bytes=100-", 100, size - 1),
+            ("bytes=-30", size - 30, size - 1),
+            (f"bytes=5-{size + 100}", 5, size - 1),
+        ):
+            response = await client.get(url, headers={"Range": range_header})
+            assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+            assert response.headers["content-range"] == f"bytes {first}-{last}/{size}"
+            assert response.headers["content-length"] == str(last - first + 1)
+            assert response.content == content[first : last + 1]
+
+        # several ranges aren't supported, the whole file is returned
+        response = await client.get(url, headers={"Range": "bytes=0-1,5-6"})
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == content
+
+        response = await client.get(url, headers={"Range": f"bytes={size}-"})
+        assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response.headers["content-range"] == f"bytes */{size}"
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file_offloaded(
+        self,
+        client: AsyncClient,
+        fs_repo: AbstractFileStorageRepository,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 1}
+        )
+        file_id = uuid.UUID(response.json()["content"][0]["file"]["id"])
+        url = f"/v1/files/{file_id}/download"
+
+        monkeypatch.setattr(
+            settings, "FILES_DOWNLOAD_MODE", FilesDownloadMode.PRESIGNED
+        )
+        response = await client.get(url)
+        if settings.FILES_STORAGE_BACKEND == FilesStorageBackend.LOCAL:
+            # local storage has no presigned URLs, the file is served by the app
+            assert response.status_code == HTTPStatus.OK
+            assert response.content
+        else:
+            assert response.status_code == HTTPStatus.TEMPORARY_REDIRECT
+            assert file_id.hex in response.headers["location"]
+
+        monkeypatch.setattr(settings, "FILES_DOWNLOAD_MODE", FilesDownloadMode.X_ACCEL)
+        response = await client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["x-accel-redirect"] == (
+            f"{settings.FILES_X_ACCEL_LOCATION}{fs_repo.get_path(file_id)}"
+        )
+        assert response.headers["content-disposition"].startswith("attachment")
+        assert not response.content
+
+        response = await client.get(f"/v1/files/{uuid.uuid4()}/download")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file_not_modified(self, client: AsyncClient):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 1}
+        )
+        file_id = response.json()["content"][0]["file"]["id"]
+        url = f"/v1/files/{file_id}/download"
+        response = await client.get(url)
+        etag = response.headers["etag"]
+        assert etag == f'"{hashlib.sha256(response.content).hexdigest()}"'
+        assert "immutable" in response.headers["cache-control"]
+
+        class UnavailableFileStorage:
+            def __getattr__(self, name):
+                raise AssertionError("File storage must not be requested")
+
+        # cached copy is confirmed by DB row only
+        fs_repo_override = app.dependency_overrides.get(get_fs_repo)
+        app.dependency_overrides[get_fs_repo] = UnavailableFileStorage
+        try:
+            for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+                response = await client.get(
+                    url, headers={"If-None-Match": if_none_match}
+                )
+                assert response.status_code == HTTPStatus.NOT_MODIFIED
+                assert response.headers["etag"] == etag
+                assert not response.content
+        finally:
+            if fs_repo_override:
+                app.dependency_overrides[get_fs_repo] = fs_repo_override
+            else:
+                del app.dependency_overrides[get_fs_repo]
+
+        response = await client.get(url, headers={"If-None-Match": '"other"'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file_cached(
+        self,
+        client: AsyncClient,
+        db_engine: AsyncEngine,
+        fs_repo: AbstractFileStorageRepository,
+        tmp_path: Path,
+    ):
+        await client.post(f"/v1/forecasts/by-city/{CityEnum.MOSCOW.value}")
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 2}
+        )
+        file_ids = [
+            uuid.UUID(record["file"]["id"]) for record in response.json()["content"]
+        ]
+        urls = [f"/v1/files/{file_id}/download" for file_id in file_ids]
+        contents = [(await client.get(url)).content for url in urls]
+        max_size = max(map(len, contents))
+
+        # foreign files and other processes' slots are left as is
+        (tmp_path / "0").mkdir()
+        (tmp_path / "0" / "foreign.txt").write_bytes(b"foreign")
+        other_process_cache = FilesCache(0, 0, tmp_path, max_size)
+        assert other_process_cache.disk.directory == tmp_path / "0"
+
+        # each tier fits one file only
+        cache = FilesCache(max_size, max_size, tmp_path, max_size)
+        assert cache.disk.directory == tmp_path / "1"
+        other_process_cache.close()
+        cache_dir = cache.disk.directory
+        fs_repo_override = app.dependency_overrides.get(get_fs_repo)
+        app.dependency_overrides[get_fs_repo] = lambda: CachedFileStorageRepository(
+            fs_repo, cache
+        )
+        try:
+            response = await client.get(urls[0])
+            assert response.content == contents[0]
+            assert (cache_dir / file_ids[0].hex).read_bytes() == contents[0]
+
+            # memory tier, file's DB record is cached too
+            hits = files_cache_lookups.get(tier="memory", result="hit")
+            with assert_max_queries(db_engine, 0):
+                response = await client.get(urls[0], headers={"Range": "bytes=10-19"})
+            assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+            assert response.content == contents[0][10:20]
+            assert files_cache_lookups.get(tier="memory", result="hit") == hits + 1
+
+            # missing file's disk lookup is counted once
+            evictions = files_cache_evictions.get(tier="disk")
+            misses = files_cache_lookups.get(tier="disk", result="miss")
+            response = await client.get(urls[1])
+            assert response.content == contents[1]
+            assert files_cache_evictions.get(tier="disk") == evictions + 1
+            assert files_cache_lookups.get(tier="disk", result="miss") == misses + 1
+            assert not (cache_dir / file_ids[0].hex).exists()
+
+            # disk tier is served as local file
+            cache.memory.pop(file_ids[1])
+            hits = files_cache_lookups.get(tier="disk", result="hit")
+            response = await client.get(urls[1])
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == contents[1]
+            assert files_cache_lookups.get(tier="disk", result="hit") == hits + 1
+            response = await client.get(urls[1], headers={"Range": "bytes=5-9"})
+            assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+            assert response.headers["content-range"] == (
+                f"bytes 5-9/{len(contents[1])}"
+            )
+            assert response.content == contents[1][5:10]
+        finally:
+            cache.close()
+            if fs_repo_override:
+                app.dependency_overrides[get_fs_repo] = fs_repo_override
+            else:
+                del app.dependency_overrides[get_fs_repo]
+
+        # slots are reused after processes' restarts, their indexes are restored
+        other_process_cache = FilesCache(0, 0, tmp_path, max_size)
+        cache = FilesCache(0, max_size, tmp_path, max_size)
+        assert cache.disk.directory == cache_dir
+        assert cache.disk.get_path(file_ids[1]) == cache_dir / file_ids[1].hex
+        assert (tmp_path / "0" / "foreign.txt").exists()
+        cache.close()
+        other_process_cache.close()
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_local_fs_repository(self, client: AsyncClient, tmp_path: Path):
+        local_fs_repo = LocalFSRepository(tmp_path)
+        file_id = uuid.uuid4()
+        content = bytes(range(256)) * 1000
+        await local_fs_repo.upload(content, file_id)
+
+        path = tmp_path / file_id.hex[:2] / file_id.hex[2:4] / file_id.hex
+        assert await local_fs_repo.get_local_path(file_id) == path
+        assert list(tmp_path.rglob("*.tmp")) == []
+        assert await local_fs_repo.get(file_id) == content
+        chunks = [chunk async for chunk in await local_fs_repo.stream(file_id)]
+        assert len(chunks) > 1
+        assert b"".join(chunks) == content
+        chunks = await local_fs_repo.stream(file_id, 1000, 100_000)
+        assert b"".join([chunk async for chunk in chunks]) == content[1000:101_000]
+
+        await local_fs_repo.delete(file_id)
+        assert await local_fs_repo.get_local_path(file_id) is None
+        for missing in (local_fs_repo.get(file_id), local_fs_repo.stream(file_id)):
+            with pytest.raises(HTTPException) as error:
+                await missing
+            assert error.value.status_code == HTTPStatus.NOT_FOUND
+        await local_fs_repo.delete(file_id)
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_file_local(
+        self,
+        client: AsyncClient,
+        fs_repo: AbstractFileStorageRepository,
+        tmp_path: Path,
+    ):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 1}
+        )
+        file_id = uuid.UUID(response.json()["content"][0]["file"]["id"])
+        url = f"/v1/files/{file_id}/download"
+        content = await fs_repo.get(file_id)
+        local_fs_repo = LocalFSRepository(tmp_path)
+        await local_fs_repo.upload(content, file_id)
+
+        fs_repo_override = app.dependency_overrides.get(get_fs_repo)
+        app.dependency_overrides[get_fs_repo] = lambda: local_fs_repo
+        try:
+            response = await client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == content
+            assert response.headers["etag"] == (
+                f'"{hashlib.sha256(content).hexdigest()}"'
+            )
+            response = await client.get(url, headers={"Range": "bytes=-20"})
+            assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+            assert response.content == content[-20:]
+        finally:
+            if fs_repo_override:
+                app.dependency_overrides[get_fs_repo] = fs_repo_override
+            else:
+                del app.dependency_overrides[get_fs_repo]
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_add_file_to_system_without_copies(
+        self, client: AsyncClient, db_engine: AsyncEngine, tmp_path: Path
+    ):
+        content = os.urandom(4 * 1024 * 1024)
+        async with async_sessionmaker(db_engine)() as session:
+            file_service = FileService(
+                FileSQLAlchemyRepository(session), LocalFSRepository(tmp_path)
+            )
+            tracemalloc.start()
+            try:
+                file = await file_service.add_to_system(
+                    content, FileCreate(name="report.xlsx")
+                )
+                response = get_file_response(content, file.name)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            # the record isn't committed
+        # the report's buffer is passed from generator to storage and response as is
+        assert peak < len(content) // 4
+        assert response.body is content
+        assert file.size == len(content)
+        assert (
+            tmp_path / LocalFSRepository(tmp_path).get_path(file.id)
+        ).read_bytes() == (content)
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_download_files_archive(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "file", "page_size": 3}
+        )
+        files = [record["file"] for record in response.json()["content"]]
+        contents = [
+            (await client.get(f"/v1/files/{file['id']}/download")).content
+            for file in files
+        ]
+        file_ids = [file["id"] for file in files]
+
+        for prefetch_files, prefetch_max_file_bytes in ((8, 1024 * 1024), (1, 0)):
+            monkeypatch.setattr(
+                settings, "FILES_ARCHIVE_PREFETCH_FILES", prefetch_files
+            )
+            monkeypatch.setattr(
+                settings,
+                "FILES_ARCHIVE_PREFETCH_MAX_FILE_BYTES",
+                prefetch_max_file_bytes,
+            )
+            response = await client.post(
+                "/v1/files/archive", json={"file_ids": [*file_ids, file_ids[0]]}
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response.headers["content-type"] == "application/zip"
+            assert response.headers["content-disposition"].startswith("attachment")
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                assert archive.testzip() is None
+                infos = archive.infolist()
+                assert len(infos) == len(files)
+                for info, file, content in zip(infos, files, contents):
+                    assert info.compress_type == zipfile.ZIP_STORED
+                    assert info.filename.endswith(".xlsx")
+                    assert archive.read(info) == content
+                # repeated files are skipped, the same names are numbered
+                assert len({info.filename for info in infos}) == len(files)
+
+        response = await client.post(
+            "/v1/files/archive", json={"file_ids": [file_ids[0], str(uuid.uuid4())]}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = await client.post("/v1/files/archive", json={"file_ids": []})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_reconcile_file_storage(
+        self, client: AsyncClient, db_engine: AsyncEngine, tmp_path: Path
+    ):
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+        local_fs_repo = LocalFSRepository(tmp_path)
+        async with session_maker() as session:
+            stored_ids = (await session.scalars(select(File.id))).all()
+            stored_ids += (await session.scalars(select(ForecastArchive.id))).all()
+        for stored_id in stored_ids:
+            await local_fs_repo.upload(b"", stored_id)
+        orphan_id = uuid.uuid4()
+        await local_fs_repo.upload(b"orphan", orphan_id)
+        async with session_maker() as session:
+            file_repo = FileSQLAlchemyRepository(session)
+            dangling_file = await file_repo.create(name="report.xlsx", size=1)
+            await file_repo.save()
+
+        # nothing is deleted without `delete`
+        modified_before = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
+            minutes=1
+        )
+        report = await reconcile_file_storage(
+            session_maker, local_fs_repo, modified_before, batch_size=2
+        )
+        assert report == ReconciliationReport(orphaned_objects=1, dangling_files=1)
+        assert await local_fs_repo.get(orphan_id) == b"orphan"
+
+        # recent orphans are skipped
+        report = await reconcile_file_storage(
+            session_maker,
+            local_fs_repo,
+            datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=1),
+            batch_size=2,
+            delete=True,
+        )
+        assert report == ReconciliationReport()
+
+        report = await reconcile_file_storage(
+            session_maker, local_fs_repo, modified_before, batch_size=2, delete=True
+        )
+        assert report == ReconciliationReport(orphaned_objects=1, dangling_files=1)
+        assert await local_fs_repo.get_local_path(orphan_id) is None
+        async with session_maker() as session:
+            assert await session.get(File, dangling_file.id) is None
+        for stored_id in stored_ids:
+            assert await local_fs_repo.get_local_path(stored_id) is not None
+        report = await reconcile_file_storage(
+            session_maker, local_fs_repo, modified_before, batch_size=2, delete=True
+        )
+        assert report == ReconciliationReport()
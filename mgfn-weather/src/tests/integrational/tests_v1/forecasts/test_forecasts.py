@@ -1,9 +1,60 @@
+import asyncio
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+import uuid
+import zipfile
+from pathlib import Path
+
 import pytest
 from http import HTTPStatus
-from httpx import AsyncClient
+from fastapi import HTTPException
+from httpx import AsyncClient, MockTransport, Request, Response
+from sqlalchemy import NullPool, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
+from src.core.config import settings
+from src.db.file_storages.repositories import (
+    AbstractFileStorageRepository,
+    LocalFSRepository,
+)
+from src.db.storages.postgres.insert_buffer import InsertBuffer
+from src.db.storages.postgres.repositories import (
+    ForecastArchiveSQLAlchemyRepository,
+    ForecastSQLAlchemyRepository,
+)
+from src.deps.db import get_forecasts_insert_buffer
+from src.deps.weather_providers import get_weather_provider
+from src.jobs.archive import archive_forecasts
+from src.jobs.purge import purge_deleted_forecasts
+from src.main import app
+from src.models.db_entities.forecast_archives import ForecastArchive
+from src.models.db_entities.forecast_stats import FORECAST_DAILY_STATS_FUNCTION
+from src.models.db_entities.forecasts import Forecast
+from src.models.schemas.forecast_stats import PaginatedForecastDailyStatsList
 from src.models.schemas.geo.cities import CityEnum
-from src.models.schemas.forecasts import GenerateForecastParams
+from src.models.schemas.geo.coordinates import GeoCorrdinates
+from src.models.schemas.weather_providers import (
+    ForecastDayPartEnum,
+    WeatherConditionEnum,
+)
+from src.services.forecast_archives import ForecastArchiveService
+from src.tests.integrational.queries import assert_max_queries
+from src.utils import geohash
+from src.utils.weather_providers import AbstractWeatherProvider
+from src.utils.weather_providers.yandex import (
+    YandexNativeWeatherProvider,
+    YandexWeatherProvider,
+)
+from src.models.schemas.forecasts import (
+    ForecastRequestStatusEnum,
+    GenerateForecastParams,
+    NearbyForecastRecordSchema,
+    PaginatedForecastRecordsList,
+)
 
 
 class TestV1ForecastsAPI:
@@ -24,3 +75,706 @@ class TestV1ForecastsAPI:
             ).model_dump(),
         )
         assert response.status_code == HTTPStatus.CREATED
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_generate_forecast_days_and_day_parts(self, client: AsyncClient):
+        def get_report_strings(content: bytes) -> str:
+            with zipfile.ZipFile(io.BytesIO(content)) as report:
+                return report.read("xl/sharedStrings.xml").decode()
+
+        # mocked provider forecasts today and tomorrow
+        today, tomorrow = (
+            (datetime.date.today() + datetime.timedelta(days=day)).strftime("%d.%m.%Y")
+            for day in range(2)
+        )
+        response = await client.post(
+            "/v1/forecasts",
+            json=GenerateForecastParams(
+                lattitude=50.0331,
+                longitude=30.7632,
+                days=1,
+                day_parts=[ForecastDayPartEnum.day, ForecastDayPartEnum.night],
+            ).model_dump(),
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        strings = get_report_strings(response.content)
+        assert today in strings and tomorrow not in strings
+        assert "<t>ночь</t>" in strings and "<t>день</t>" in strings
+        assert "<t>утро</t>" not in strings and "<t>вечер</t>" not in strings
+
+        # only requested days are stored
+        response = await client.get("/v1/forecasts", params={"page_size": 1})
+        forecast_id = response.json()["content"][0]["id"]
+        response = await client.get(f"/v1/forecasts/{forecast_id}/report")
+        strings = get_report_strings(response.content)
+        assert tomorrow not in strings
+        assert "<t>утро</t>" in strings
+
+        response = await client.post(
+            f"/v1/forecasts/by-city/{CityEnum.SAINT_PETERSBURG.value}",
+            params={"days": 2, "day_parts": "evening,morning"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        strings = get_report_strings(response.content)
+        assert today in strings and tomorrow in strings
+        assert "<t>утро</t>" in strings and "<t>ночь</t>" not in strings
+
+        # the report is re-rendered with any of stored days and day parts
+        response = await client.get("/v1/forecasts", params={"page_size": 1})
+        forecast_id = response.json()["content"][0]["id"]
+        response = await client.get(
+            f"/v1/forecasts/{forecast_id}/report",
+            params={"days": 1, "day_parts": "night"},
+        )
+        strings = get_report_strings(response.content)
+        assert today in strings and tomorrow not in strings
+        assert "<t>ночь</t>" in strings and "<t>утро</t>" not in strings
+
+        for params in ({"days": 0}, {"days": 12}, {"day_parts": "noon"}):
+            response = await client.post(
+                f"/v1/forecasts/by-city/{CityEnum.SAINT_PETERSBURG.value}",
+                params=params,
+            )
+            assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        response = await client.post(
+            "/v1/forecasts",
+            json={"lattitude": 50.0331, "longitude": 30.7632, "day_parts": []},
+        )
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_yandex_native_weather_provider(self):
+        def part(temp_avg: float) -> dict:
+            return {
+                "temp_avg": temp_avg,
+                "feels_like": temp_avg - 3,
+                "condition": "light-snow",
+                "pressure_mm": 745,
+                "humidity": 81,
+                "wind_speed": 3.4,
+                "icon": "ovc_-sn",
+            }
+
+        parts_names = ("night", "morning", "day", "evening")
+        payload = {
+            "now": 1_700_000_000,
+            "now_dt": "2025-11-20T10:00:00.000Z",
+            "fact": part(-1),
+            "forecasts": [
+                {
+                    "date": "2025-11-20",
+                    "sunrise": "08:31",
+                    "parts": {name: part(i) for i, name in enumerate(parts_names)}
+                    | {"day_short": part(0)},
+                },
+                # day parts are sent as list sometimes
+                {
+                    "date": "2025-11-21",
+                    "parts": [
+                        part(i) | {"part_name": name}
+                        for i, name in enumerate(parts_names)
+                    ],
+                },
+            ],
+        }
+        requests: list[Request] = []
+        responses = [
+            Response(HTTPStatus.OK, json=payload),
+            Response(HTTPStatus.FORBIDDEN, text="Forbidden"),
+            Response(HTTPStatus.OK, json={"now_dt": "2025-11-20T10:00:00.000Z"}),
+        ]
+
+        def handler(request: Request) -> Response:
+            requests.append(request)
+            return responses[len(requests) - 1]
+
+        async with AsyncClient(transport=MockTransport(handler)) as http_client:
+            provider = YandexNativeWeatherProvider(http_client, "api-key")
+            coordinates = GeoCorrdinates(lattitude=55.75, longitude=37.61)
+            forecast_info = await provider.get_forecast(coordinates)
+            # failed requests and invalid responses aren't converted
+            assert await provider.get_forecast(coordinates) is None
+            assert await provider.get_forecast(coordinates) is None
+
+        assert requests[0].headers["X-Yandex-API-Key"] == "api-key"
+        assert dict(requests[0].url.params) == {
+            "lat": "55.75",
+            "lon": "37.61",
+            "limit": str(settings.WEATHER_PROVIDER_FORECAST_DAYS),
+            "hours": "false",
+            "extra": "false",
+        }
+        assert [forecast.date for forecast in forecast_info.forecasts] == [
+            datetime.date(2025, 11, 20),
+            datetime.date(2025, 11, 21),
+        ]
+        for forecast in forecast_info.forecasts:
+            assert forecast.parts.evening.temp_avg == 3
+            assert forecast.parts.night.feels_like == -3
+            assert forecast.parts.day.condition.code == WeatherConditionEnum.light_snow
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_yandex_weather_provider_request(self):
+        requests_params = []
+
+        class YaWeatherClient:
+            async def forecast(self, coordinates, **params):
+                requests_params.append(params)
+
+        provider = YandexWeatherProvider(YaWeatherClient())
+        coordinates = GeoCorrdinates(lattitude=55.75, longitude=37.61)
+        assert await provider.get_forecast(coordinates) is None
+        assert await provider.get_forecast(coordinates, 3) is None
+        # library's defaults are kept, only requested number of days is passed
+        assert requests_params == [{"limit": None}, {"limit": 3}]
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_generate_forecasts_with_insert_buffer(
+        self, client: AsyncClient, db_engine: AsyncEngine
+    ):
+        response = await client.get("/v1/forecasts", params={"fields": "id"})
+        total_items = response.json()["total_items"]
+        # 2 records are flushed by size, the 3rd one - by delay
+        insert_buffer = InsertBuffer(
+            async_sessionmaker(db_engine, expire_on_commit=False),
+            ForecastSQLAlchemyRepository,
+            max_size=2,
+            max_delay=0.05,
+        )
+        app.dependency_overrides[get_forecasts_insert_buffer] = lambda: insert_buffer
+        try:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/v1/forecasts",
+                        json=GenerateForecastParams(
+                            lattitude=50.0331,
+                            longitude=30.7632,
+                        ).model_dump(),
+                    )
+                    for _ in range(3)
+                )
+            )
+        finally:
+            del app.dependency_overrides[get_forecasts_insert_buffer]
+        for response in responses:
+            assert response.status_code == HTTPStatus.CREATED
+        response = await client.get("/v1/forecasts", params={"fields": "id"})
+        assert response.json()["total_items"] == total_items + 3
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_forecast_records(
+        self, client: AsyncClient, db_engine: AsyncEngine
+    ):
+        with assert_max_queries(db_engine, 2):
+            response = await client.get("/v1/forecasts", params={"page_size": 1})
+        assert response.status_code == HTTPStatus.OK
+        records = PaginatedForecastRecordsList.model_validate_json(response.content)
+        assert len(records.content) == 1
+        assert records.total_pages == records.total_items
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_forecast_records_fields(self, client: AsyncClient):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "id,location,created_at"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for record in response.json()["content"]:
+            assert record.keys() == {"id", "location", "created_at"}
+
+        response = await client.get("/v1/forecasts", params={"fields": "id,password"})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_search_forecast_records(self, client: AsyncClient):
+        response = await client.get("/v1/forecasts", params={"fields": "location"})
+        location = response.json()["content"][0]["location"]
+        word = location.split()[0][1:].lower()  # without capital first letter
+        # queries of the same shape reuse cached statement with new search words
+        for search, found in ((word, True), ("несуществующий_город", False)):
+            response = await client.get(
+                "/v1/forecasts", params={"fields": "location", "search": search}
+            )
+            assert response.status_code == HTTPStatus.OK
+            records = response.json()["content"]
+            assert bool(records) == found
+            for record in records:
+                assert search in record["location"].lower()
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_forecast_records_with_archived_by_location(
+        self, client: AsyncClient, db_engine: AsyncEngine
+    ):
+        # names, ordered differently by code points and by locales' collations
+        locations = ["Ёлкино", "еланка", "Абрамово", "Жуки", "жуки-2", "яблоновка"]
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+        async with session_maker() as session:
+            repo = ForecastSQLAlchemyRepository(session)
+            forecast_ids = [
+                (
+                    await repo.create(location=location, lattitude=10.0, longitude=10.0)
+                ).id
+                for location in locations
+            ]
+            await repo.save()
+        try:
+            for ordering in ("location", "-location"):
+                read_ids = []
+                page_number = 1
+                while True:
+                    response = await client.get(
+                        "/v1/forecasts",
+                        params={
+                            "include_archived": True,
+                            "ordering": ordering,
+                            "fields": "id",
+                            "page_size": 2,
+                            "page_number": page_number,
+                        },
+                    )
+                    content = response.json()["content"]
+                    if not content:
+                        break
+                    read_ids.extend(record["id"] for record in content)
+                    page_number += 1
+                # pages are cut by DB and by merging in the same order
+                assert len(read_ids) == len(set(read_ids))
+                assert len(read_ids) == response.json()["total_items"]
+        finally:
+            async with session_maker() as session:
+                await session.execute(
+                    delete(Forecast).where(Forecast.id.in_(forecast_ids))
+                )
+                await session.commit()
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_filter_forecast_records(self, client: AsyncClient):
+        for status_code in ForecastRequestStatusEnum:
+            response = await client.get(
+                "/v1/forecasts", params={"fields": "status", "status": status_code}
+            )
+            assert response.status_code == HTTPStatus.OK
+            for record in response.json()["content"]:
+                assert record["status"]["code"] == status_code
+
+        # bounding box around the forecast's coordinates
+        response = await client.get(
+            "/v1/forecasts",
+            params={
+                "min_lattitude": 50,
+                "max_lattitude": 50.1,
+                "min_longitude": 30.7,
+                "max_longitude": 30.8,
+                "created_from": "2000-01-01T00:00:00",
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        records = response.json()["content"]
+        assert records
+        for record in records:
+            assert 50 <= record["lattitude"] <= 50.1
+            assert 30.7 <= record["longitude"] <= 30.8
+
+        future = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=1)
+        response = await client.get(
+            "/v1/forecasts", params={"created_from": future.isoformat()}
+        )
+        assert response.json()["total_items"] == 0
+
+        response = await client.get(
+            "/v1/forecasts", params={"min_lattitude": 10, "max_lattitude": 0}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_nearby_forecast_records(self, client: AsyncClient):
+        # ~3 km from the forecast's coordinates
+        params = {"lattitude": 50.06, "longitude": 30.77, "radius_km": 5}
+        response = await client.get("/v1/forecasts/nearby", params=params)
+        assert response.status_code == HTTPStatus.OK
+        records = [
+            NearbyForecastRecordSchema.model_validate(record)
+            for record in response.json()
+        ]
+        assert records
+        for record in records:
+            assert (record.lattitude, record.longitude) == (50.0331, 30.7632)
+            assert 2 < record.distance_km < 4
+            # DB's distance is the same haversine
+            assert record.distance_km == pytest.approx(
+                geohash.get_distance_km(
+                    params["lattitude"],
+                    params["longitude"],
+                    record.lattitude,
+                    record.longitude,
+                )
+            )
+
+        response = await client.get(
+            "/v1/forecasts/nearby", params=params | {"radius_km": 2}
+        )
+        assert response.json() == []
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_export_forecast_records(self, client: AsyncClient):
+        response = await client.get("/v1/forecasts", params={"page_size": 1})
+        total_items = response.json()["total_items"]
+
+        response = await client.get(
+            "/v1/forecasts/export", params={"fields": "id,file,status"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"].startswith("text/csv")
+        header, *rows = list(csv.reader(response.text.splitlines()))
+        assert header == [
+            "id",
+            "file_id",
+            "file_name",
+            "file_size",
+            "file_created_at",
+            "status",
+        ]
+        assert len(rows) == total_items
+
+        response = await client.get(
+            "/v1/forecasts/export",
+            params={"format": "ndjson", "ordering": "location"},
+        )
+        assert response.status_code == HTTPStatus.OK
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert len(records) == total_items
+        PaginatedForecastRecordsList(
+            content=records, total_items=total_items, total_pages=1
+        )
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_render_forecast_report(self, client: AsyncClient):
+        response = await client.get("/v1/forecasts", params={"fields": "id,status"})
+        records = response.json()["content"]
+        successful_id = next(
+            r["id"]
+            for r in records
+            if r["status"]["code"] == ForecastRequestStatusEnum.SUCCESS
+        )
+        failed_ids = [
+            r["id"]
+            for r in records
+            if r["status"]["code"] == ForecastRequestStatusEnum.FAILED
+        ]
+
+        class UnavailableWeatherProvider(AbstractWeatherProvider):
+            async def get_forecast(self, coordinates, days=None):
+                raise AssertionError("Weather provider must not be requested")
+
+        # the report is rendered from stored data only
+        app.dependency_overrides[get_weather_provider] = UnavailableWeatherProvider
+        try:
+            response = await client.get(
+                f"/v1/forecasts/{successful_id}/report", params={"format": "XLSX"}
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response.headers["content-disposition"].endswith('.xlsx"')
+            assert response.content.startswith(b"PK")  # xlsx is a zip archive
+
+            for forecast_id in [*failed_ids[:1], uuid.uuid4()]:
+                response = await client.get(f"/v1/forecasts/{forecast_id}/report")
+                assert response.status_code == HTTPStatus.NOT_FOUND
+        finally:
+            del app.dependency_overrides[get_weather_provider]
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_forecasts_history(self, client: AsyncClient):
+        response = await client.get(
+            "/v1/forecasts",
+            params={"status": ForecastRequestStatusEnum.SUCCESS, "fields": "id"},
+        )
+        successful_count = response.json()["total_items"]
+        today = datetime.date.today()
+
+        response = await client.get(
+            "/v1/forecasts/history", params={"search": "", "date": today.isoformat()}
+        )
+        assert response.status_code == HTTPStatus.OK
+        history = response.json()
+        assert history["total_items"] == successful_count
+        location = history["content"][0]["location"]
+        for record in history["content"]:
+            assert record["forecast"]["date"] == today.isoformat()
+            assert record["forecast"]["parts"]["day"]["temp_avg_view"]
+
+        response = await client.get(
+            "/v1/forecasts/history",
+            params={"search": location, "date": today.isoformat()},
+        )
+        records = response.json()["content"]
+        assert records
+        assert location in {record["location"] for record in records}
+
+        response = await client.get(
+            "/v1/forecasts/history",
+            params={
+                "search": location,
+                "date": (today + datetime.timedelta(days=30)).isoformat(),
+            },
+        )
+        assert response.json()["total_items"] == 0
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_read_forecast_stats(self, client: AsyncClient):
+        response = await client.get(
+            "/v1/forecasts", params={"fields": "status", "page_size": 100}
+        )
+        records = response.json()["content"]
+        failed_count = sum(
+            record["status"]["code"] == ForecastRequestStatusEnum.FAILED
+            for record in records
+        )
+
+        today = datetime.datetime.now(datetime.UTC).date()
+        response = await client.get(
+            "/v1/forecasts/stats", params={"day_from": str(today)}
+        )
+        assert response.status_code == HTTPStatus.OK
+        stats = PaginatedForecastDailyStatsList.model_validate_json(response.content)
+        assert sum(item.requests_count for item in stats.content) == len(records)
+        assert sum(item.failed_count for item in stats.content) == failed_count
+
+        response = await client.get(
+            "/v1/forecasts/stats",
+            params={
+                "day_from": str(today),
+                "day_to": str(today - datetime.timedelta(1)),
+            },
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_stats_triggers_match_migrations(self, db_engine: AsyncEngine):
+        """
+        Model's stats function and triggers (tables in tests are created by models)
+        equal migrated ones.
+        """
+        function_query = text(
+            "SELECT prosrc FROM pg_proc WHERE proname = 'forecast_daily_stats_update'"
+        )
+        triggers_query = text(
+            "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+            "WHERE tgrelid = 'forecasts'::regclass AND NOT tgisinternal ORDER BY tgname"
+        )
+        database = f"{settings.POSTGRES_DB}_migrations"
+        admin_engine = db_engine.execution_options(isolation_level="AUTOCOMMIT")
+        async with admin_engine.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+            await conn.execute(text(f'CREATE DATABASE "{database}"'))
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "alembic",
+                "upgrade",
+                "head",
+                cwd=Path(__file__).parents[5],
+                env=os.environ | {"POSTGRES_DB": database},
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+            assert process.returncode == 0, stderr.decode()
+            migrated_engine = create_async_engine(
+                db_engine.url.set(database=database), poolclass=NullPool
+            )
+            async with migrated_engine.connect() as conn:
+                migrated_function = await conn.scalar(function_query)
+                migrated_triggers = (await conn.scalars(triggers_query)).all()
+            await migrated_engine.dispose()
+        finally:
+            async with admin_engine.connect() as conn:
+                await conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+        model_function = FORECAST_DAILY_STATS_FUNCTION.split("$$")[1]
+        assert migrated_function.split() == model_function.split()
+        async with db_engine.connect() as conn:
+            assert (await conn.scalars(triggers_query)).all() == migrated_triggers
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_delete_forecast_record(
+        self,
+        client: AsyncClient,
+        db_engine: AsyncEngine,
+        fs_repo: AbstractFileStorageRepository,
+    ):
+        response = await client.get("/v1/forecasts", params={"fields": "id,status"})
+        forecast_id = next(
+            record["id"]
+            for record in response.json()["content"]
+            if record["status"]["code"] == ForecastRequestStatusEnum.SUCCESS
+        )
+        today = datetime.datetime.now(datetime.UTC).date()
+        response = await client.get(
+            "/v1/forecasts/stats", params={"day_from": str(today)}
+        )
+        requests_count = sum(
+            item["requests_count"] for item in response.json()["content"]
+        )
+
+        # the record is only marked as deleted by single UPDATE
+        with assert_max_queries(db_engine, 1):
+            response = await client.delete(f"/v1/forecasts/{forecast_id}")
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = await client.delete(f"/v1/forecasts/{forecast_id}")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = await client.get("/v1/forecasts", params={"fields": "id"})
+        assert forecast_id not in {
+            record["id"] for record in response.json()["content"]
+        }
+        response = await client.get(
+            "/v1/forecasts/stats", params={"day_from": str(today)}
+        )
+        assert (
+            sum(item["requests_count"] for item in response.json()["content"])
+            == requests_count - 1
+        )
+
+        # deleted record is purged with it's file
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+        purged_count = await purge_deleted_forecasts(
+            session_maker,
+            fs_repo,
+            datetime.datetime.now(datetime.UTC),
+            batch_size=1,
+        )
+        assert purged_count == 1
+        async with session_maker() as session:
+            assert await session.get(Forecast, uuid.UUID(forecast_id)) is None
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_archive_batch_concurrently(
+        self,
+        client: AsyncClient,
+        db_engine: AsyncEngine,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        session_maker = async_sessionmaker(db_engine, expire_on_commit=False)
+        now = datetime.datetime.now(datetime.UTC)
+        # concurrent runs take different batches
+        async with session_maker() as session, session_maker() as concurrent_session:
+            batch = await ForecastSQLAlchemyRepository(session).get_archive_batch(
+                now, 2
+            )
+            concurrent_batch = await ForecastSQLAlchemyRepository(
+                concurrent_session
+            ).get_archive_batch(now, 2)
+            assert len(batch) == len(concurrent_batch) == 2
+            assert not {forecast.id for forecast in batch} & {
+                forecast.id for forecast in concurrent_batch
+            }
+
+        # the batch, which records weren't all deleted, is discarded with it's file
+        async def delete_archived(self, forecast_ids):
+            return 0
+
+        monkeypatch.setattr(
+            ForecastSQLAlchemyRepository, "delete_archived", delete_archived
+        )
+        async with session_maker() as session:
+            archive_service = ForecastArchiveService(
+                ForecastArchiveSQLAlchemyRepository(session),
+                ForecastSQLAlchemyRepository(session),
+                LocalFSRepository(tmp_path),
+            )
+            with pytest.raises(HTTPException) as error:
+                await archive_service.archive_batch(now, 2)
+            assert error.value.status_code == HTTPStatus.CONFLICT
+        async with session_maker() as session:
+            assert await session.scalar(select(func.count(ForecastArchive.id))) == 0
+        assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+    @pytest.mark.asyncio(scope="session")
+    async def test_archive_forecast_records(
+        self,
+        client: AsyncClient,
+        db_engine: AsyncEngine,
+        fs_repo: AbstractFileStorageRepository,
+    ):
+        response = await client.get("/v1/forecasts", params={"page_size": 100})
+        records = PaginatedForecastRecordsList.model_validate_json(response.content)
+        today = datetime.datetime.now(datetime.UTC).date()
+        response = await client.get(
+            "/v1/forecasts/stats", params={"day_from": str(today)}
+        )
+        stats = response.json()
+        history_params = {
+            "search": "",
+            "date": datetime.date.today().isoformat(),
+            "page_size": 100,
+        }
+        response = await client.get("/v1/forecasts/history", params=history_params)
+        history = response.json()
+        assert history["total_items"]
+
+        # all the records are archived by batches
+        archived_count = await archive_forecasts(
+            async_sessionmaker(db_engine, expire_on_commit=False),
+            fs_repo,
+            datetime.datetime.now(datetime.UTC),
+            batch_size=2,
+        )
+        assert archived_count == records.total_items
+        response = await client.get("/v1/forecasts")
+        assert response.json()["total_items"] == 0
+        # archiving doesn't change statistics
+        response = await client.get(
+            "/v1/forecasts/stats", params={"day_from": str(today)}
+        )
+        assert response.json() == stats
+
+        response = await client.get(
+            "/v1/forecasts", params={"include_archived": True, "page_size": 100}
+        )
+        assert response.status_code == HTTPStatus.OK
+        archived_records = PaginatedForecastRecordsList.model_validate_json(
+            response.content
+        )
+        assert archived_records == records
+
+        # archived records keep forecast data for history, but aren't re-rendered
+        response = await client.get("/v1/forecasts/history", params=history_params)
+        assert response.json()["total_items"] == 0
+        response = await client.get(
+            "/v1/forecasts/history",
+            params=history_params | {"include_archived": True},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == history
+        response = await client.get(
+            f"/v1/forecasts/{history['content'][0]['id']}/report"
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = await client.get(
+            "/v1/forecasts",
+            params={
+                "include_archived": True,
+                "fields": "id,status",
+                "status": ForecastRequestStatusEnum.SUCCESS.value,
+                "ordering": "created_at",
+                "page_size": 1,
+            },
+        )
+        successful_records = sorted(
+            (
+                record
+                for record in records.content
+                if record.status.code == ForecastRequestStatusEnum.SUCCESS
+            ),
+            key=lambda record: record.created_at,
+        )
+        assert response.json() == {
+            "content": [
+                {
+                    "id": str(successful_records[0].id),
+                    "status": successful_records[0].status.model_dump(),
+                }
+            ],
+            "total_items": len(successful_records),
+            "total_pages": len(successful_records),
+        }
@@ -5,7 +5,7 @@ import asyncio
 from xlsxwriter.worksheet import Worksheet
 
 from src.models.schemas.forecasts import ForecastReportSchema
-from src.models.schemas.weather_providers import ForecastData
+from src.models.schemas.weather_providers import ForecastData, ForecastDayPartEnum
 from src.utils.file_generators.forecasts.abc import ForecastFileGenerator
 from src.utils.file_generators.xlsx import AbstractXLSXFileGenerator
 
@@ -34,6 +34,8 @@ class ForecastXLSXFileGenerator(AbstractXLSXFileGenerator, ForecastFileGenerator
     def _generate(self, data: ForecastReportSchema) -> bytes:
         worksheet = self.workbook.add_worksheet("Прогноз погоды")
         self._set_headers(worksheet, data)
+        # selected day parts in day's order
+        day_parts = [part for part in ForecastDayPartEnum if part in data.day_parts]
         i = 3
         for daily_forecast in data.forecasts:
             worksheet.merge_range(
@@ -62,13 +64,9 @@ class ForecastXLSXFileGenerator(AbstractXLSXFileGenerator, ForecastFileGenerator
             worksheet.write(i, 5, "влажность", self.horizontal_header_format)
             worksheet.write(i, 6, "магнитное\nполе", self.horizontal_header_format)
 
-            day_parts: dict[str, ForecastData] = {
-                "ночь": daily_forecast.parts.night,
-                "утро": daily_forecast.parts.morning,
-                "день": daily_forecast.parts.day,
-                "вечер": daily_forecast.parts.evening,
-            }
-            for day_part_name, day_part_data in day_parts.items():
+            for day_part in day_parts:
+                day_part_name = ForecastDayPartEnum.ru_names()[day_part]
+                day_part_data: ForecastData = getattr(daily_forecast.parts, day_part)
                 i += 1
                 worksheet.write(i, 0, day_part_name, self.horizontal_row_format)
                 worksheet.write(
@@ -95,6 +93,7 @@ class ForecastXLSXFileGenerator(AbstractXLSXFileGenerator, ForecastFileGenerator
             i += 2
         self._format_worksheet_for_print(worksheet)
         self.workbook.close()
+        # `BytesIO` hands over it's buffer, if it isn't exported: the report isn't copied
         return self.output.getvalue()
 
     async def generate(self, data):
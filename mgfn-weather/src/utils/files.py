@@ -0,0 +1,50 @@
+"""Helpers for handling files in local file system."""
+
+import asyncio
+import os
+import tempfile
+import typing as t
+from pathlib import Path
+
+
+def write_file_atomically(path: Path, content: bytes, fsync: bool = False) -> None:
+    """
+    Writes the file to temporary one in the same directory and renames it to `path`,
+    so readers never see partially written file.
+    Pass `fsync`, if the file must survive power loss once it's written.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=".", suffix=".tmp", delete=False
+    ) as tmp_file:
+        try:
+            tmp_file.write(content)
+            if fsync:
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    os.replace(tmp_file.name, path)
+
+
+async def iter_file_chunks(
+    file_obj: t.BinaryIO, chunk_size: int, offset: int = 0, length: int = 0
+) -> t.AsyncIterator[bytes]:
+    """
+    Yields chunks of opened file from `offset` (`length` bytes or till the end),
+    reading them in threads, closes the file at the end.
+    """
+    try:
+        await asyncio.to_thread(file_obj.seek, offset)
+        remaining = length or None
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = await asyncio.to_thread(file_obj.read, size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        file_obj.close()
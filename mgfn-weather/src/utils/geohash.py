@@ -0,0 +1,97 @@
+"""
+Geohash encoding of coordinates and searching of cells around the point.
+Geohash is a string cell ID: each next char splits the cell into 32 smaller ones,
+so all points of the cell have geohashes starting with the cell's one.
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode(lattitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    """Returns geohash of the point with `precision` chars."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bits_count = 0
+    is_lon_bit = True
+    while len(chars) < precision:
+        value, value_range = (
+            (longitude, lon_range) if is_lon_bit else (lattitude, lat_range)
+        )
+        middle = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        is_lon_bit = not is_lon_bit
+        bits_count += 1
+        if bits_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bits_count = 0
+    return "".join(chars)
+
+
+def get_cell_size(precision: int) -> tuple[float, float]:
+    """Returns cell's (height, width) in degrees for geohash `precision`."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lon_bits
+    return 180 / 2**lat_bits, 360 / 2**lon_bits
+
+
+def get_precision(lattitude: float, radius_km: float) -> int:
+    """
+    Returns max geohash precision, which cells at `lattitude` are not smaller
+    than `radius_km` in both dimensions, so the circle is covered by the cell
+    and it's neighbours. Returns `0`, if even the largest cells are too small.
+    """
+    # cells are the narrowest at the circle's lattitude, farthest from equator
+    max_lattitude = min(abs(lattitude) + radius_km / _KM_PER_DEGREE, 90)
+    lat_cos = max(math.cos(math.radians(max_lattitude)), 0.01)
+    for precision in range(MAX_PRECISION, 0, -1):
+        height, width = get_cell_size(precision)
+        if min(height, width * lat_cos) * _KM_PER_DEGREE >= radius_km:
+            return precision
+    return 0
+
+
+def get_nearby_cells(lattitude: float, longitude: float, radius_km: float) -> list[str]:
+    """
+    Returns geohashes of the point's cell and it's 8 neighbours,
+    covering the circle of `radius_km` around the point.
+    """
+    precision = get_precision(lattitude, radius_km)
+    if not precision:
+        raise ValueError(f"Radius {radius_km} km is too large")
+    height, width = get_cell_size(precision)
+    cells = []
+    for lat_shift in (-1, 0, 1):
+        cell_lattitude = lattitude + lat_shift * height
+        if not -90 <= cell_lattitude <= 90:
+            continue
+        for lon_shift in (-1, 0, 1):
+            cell_longitude = (longitude + lon_shift * width + 180) % 360 - 180
+            cells.append(encode(cell_lattitude, cell_longitude, precision))
+    return list(dict.fromkeys(cells))
+
+
+def get_distance_km(
+    lattitude1: float, longitude1: float, lattitude2: float, longitude2: float
+) -> float:
+    """Returns great-circle distance between two points (haversine formula)."""
+    lat1, lon1, lat2, lon2 = map(
+        math.radians, (lattitude1, longitude1, lattitude2, longitude2)
+    )
+    haversine = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(haversine)))
@@ -0,0 +1,22 @@
+"""HTTP conditional requests' helpers (RFC 9110, section 13)."""
+
+
+def format_etag(etag: str) -> str:
+    """Returns strong ETag's header value (quoted ETag)."""
+    return f'"{etag}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Checks, whether `If-None-Match` header's value matches the ETag,
+    so the client's cached content can be used (`304 Not Modified`).
+    Weak comparison is used, as the RFC requires for `If-None-Match`.
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == format_etag(etag)
+        for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,44 @@
+"""
+Parsing of HTTP `Range` request header (RFC 9110, section 14).
+Only single byte ranges are supported: for others the whole content is served,
+which is allowed by the RFC.
+"""
+
+import re
+
+
+_BYTE_RANGE_RE = re.compile(r"^bytes=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Requested range is outside of the content."""
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Returns (first byte, last byte) positions of the content with `size` bytes,
+    requested by `Range` header's value, or `None`, if the whole content is requested
+    (there is no header, it's malformed or requests several ranges).
+    Raises `RangeNotSatisfiableError`, if the range starts after the content's end.
+    """
+    if not header:
+        return
+    match = _BYTE_RANGE_RE.match(header)
+    if not match:
+        return
+    first, last = match.groups()
+    if not first:
+        # suffix range: the last `last` bytes
+        if not last:
+            return
+        suffix_length = int(last)
+        if not suffix_length or not size:
+            raise RangeNotSatisfiableError(header)
+        return max(size - suffix_length, 0), size - 1
+    first = int(first)
+    if first >= size:
+        raise RangeNotSatisfiableError(header)
+    last = min(int(last), size - 1) if last else size - 1
+    if last < first:
+        return
+    return first, last
@@ -14,11 +14,12 @@ class AbstractWeatherProvider(abc.ABC):
 
     @abc.abstractmethod
     async def get_forecast(
-        self, coordinates: GeoCorrdinates
+        self, coordinates: GeoCorrdinates, days: int | None = None
     ) -> ForecastInfoSchema | None:
         """
         ! Keep in mind, that calling this method might affect your requests' limit set by specific weather provider !
-        Requests the forecast by given coordinates and returns it in system suitable format.
+        Requests the forecast by given coordinates for `days` days, including the current day
+        (provider's default, if it isn't passed), and returns it in system suitable format.
         Returns `None` in case something goes wrong during request,
         because it's neccessary to save the results of forecast request to DB anyway.
         """
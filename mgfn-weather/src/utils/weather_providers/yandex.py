@@ -2,9 +2,12 @@
 
 import logging
 
+from fastapi import status
+from httpx import AsyncClient, HTTPError
 from pydantic_core import ValidationError
 from yaweather import YaWeatherAsync, ResponseForecast, YaWeatherAPIError
 
+from src.core.config import settings
 from src.models.schemas.weather_providers import ForecastInfoSchema
 from src.models.schemas.geo.coordinates import GeoCorrdinates
 from src.utils.weather_providers import AbstractWeatherProvider
@@ -34,6 +37,7 @@ class YandexWeatherProvider(AbstractWeatherProvider):
     async def _get_forecast(
         self,
         coordinates: GeoCorrdinates,
+        days: int | None = None,
     ) -> ResponseForecast | None:
         """
         Makes forecast request to provider.
@@ -43,7 +47,7 @@ class YandexWeatherProvider(AbstractWeatherProvider):
         forecast_response = None
         try:
             forecast_response = await self.client.forecast(
-                (coordinates.lattitude, coordinates.longitude)
+                (coordinates.lattitude, coordinates.longitude), limit=days
             )
         except YaWeatherAPIError as e:
             logger.error(
@@ -54,8 +58,78 @@ class YandexWeatherProvider(AbstractWeatherProvider):
             )
         return forecast_response
 
-    async def get_forecast(self, coordinates):
-        forecast_response = await self._get_forecast(coordinates)
+    async def get_forecast(self, coordinates, days=None):
+        forecast_response = await self._get_forecast(coordinates, days)
         if not forecast_response:
             return
         return self._convert_forecast(forecast_response)
+
+
+class YandexNativeWeatherProvider(AbstractWeatherProvider):
+    """
+    Yandex weather provider, requesting the API through shared httpx client:
+    only used days are requested without hourly forecasts, the response's JSON
+    is parsed to system's schema directly, unused fields are skipped by the parser.
+    """
+
+    service_url = "https://api.weather.yandex.ru/v2"
+
+    def __init__(self, http_client: AsyncClient, api_key: str):
+        self.http_client = http_client
+        self.api_key = api_key
+
+    def _convert_forecast(self, content: bytes) -> ForecastInfoSchema | None:
+        """Parses Yandex weather response's JSON with forecast to system suitable format."""
+        converted_forecast = None
+        try:
+            converted_forecast = ForecastInfoSchema.model_validate_json(content)
+        except ValidationError as ve:
+            logger.error(
+                "An error occured during converting the weather forecast response to system format: %s",
+                ve,
+            )
+        return converted_forecast
+
+    async def _get_forecast(
+        self, coordinates: GeoCorrdinates, days: int | None = None
+    ) -> bytes | None:
+        """
+        Makes forecast request to provider.
+        Returns it's response's content or None if something goes wrong during the request.
+        """
+        try:
+            response = await self.http_client.get(
+                f"{self.service_url}/forecast",
+                params={
+                    "lat": coordinates.lattitude,
+                    "lon": coordinates.longitude,
+                    "limit": days or settings.WEATHER_PROVIDER_FORECAST_DAYS,
+                    "hours": "false",
+                    "extra": "false",
+                },
+                headers={"X-Yandex-API-Key": self.api_key},
+            )
+        except HTTPError as e:
+            logger.error(
+                "An error occured during the weather request for coordinates (lat: %s, long: %s): %s",
+                coordinates.lattitude,
+                coordinates.longitude,
+                e,
+            )
+            return
+        if response.status_code != status.HTTP_200_OK:
+            logger.error(
+                "An error occured during the weather request for coordinates (lat: %s, long: %s): %s - %s",
+                coordinates.lattitude,
+                coordinates.longitude,
+                response.status_code,
+                response.text,
+            )
+            return
+        return response.content
+
+    async def get_forecast(self, coordinates, days=None):
+        content = await self._get_forecast(coordinates, days)
+        if not content:
+            return
+        return self._convert_forecast(content)
@@ -0,0 +1,46 @@
+"""
+Streaming of ZIP archives, built on the fly: entries are written by `zipfile`
+to write-only buffer (sizes and CRCs go to data descriptors after entries' data),
+which is drained after each write, so only the current chunk is kept in memory.
+"""
+
+import typing as t
+import zipfile
+
+
+class _ChunksBuffer:
+    """Write-only file object, collecting written chunks until they are drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Returns written bytes and clears the buffer."""
+        chunks, self._chunks = self._chunks, []
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+async def stream_zip(
+    entries: t.AsyncIterator[tuple[zipfile.ZipInfo, t.AsyncIterator[bytes]]],
+) -> t.AsyncIterator[bytes]:
+    """
+    Yields ZIP archive's bytes with given entries: (entry's info, it's data chunks).
+    Set entry's `file_size` to it's expected size: ZIP64 extensions are used for large ones.
+    Entries' data is written as is, set `compress_type` of their infos for compression.
+    """
+    buffer = _ChunksBuffer()
+    with zipfile.ZipFile(buffer, mode="w") as archive:
+        async for info, chunks in entries:
+            with archive.open(info, mode="w") as entry:
+                async for chunk in chunks:
+                    entry.write(chunk)
+                    yield buffer.drain()
+            yield buffer.drain()
+    yield buffer.drain()